@@ -3,21 +3,54 @@
 Ce module gère les tests de l'API flask donné dans le fichier app.py
 """
 import contextlib
+import gzip
+import json
 import os
+import pstats
+import struct
 import sys
+import threading
 from unittest.mock import patch
 
 import pytest
 
+import triangulation
+from errors import (
+    InvalidIdError,
+    InvalidPointSetError,
+    PointSetManagerUnavailableError,
+    PointSetNotFoundError,
+    QueueFullError,
+)
+from triangulation import decodeVarints
+
+SQUARE = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 1, 1, 0, 1)
+
 sys.path.append(os.getcwd())
 
 with contextlib.suppress(ImportError):
-    from app import app
+    from app import (
+        ADJACENCY_MEDIA_TYPE,
+        app,
+        batch_executor,
+        content_cache,
+        errors_total,
+        in_flight,
+        locator_cache,
+        neighbours_cache,
+        profile_sampler,
+        profile_store,
+        result_cache,
+    )
 
 @pytest.fixture
 def client():
     """Génération de la configuration de test pour le client."""
     app.config['TESTING'] = True
+    result_cache.clear()
+    content_cache.clear()
+    locator_cache.clear()
+    neighbours_cache.clear()
     with app.test_client() as client:
         yield client
 
@@ -27,18 +60,171 @@ def test_api_triangulation_success(client):
     with patch("triangulation.recupPointSet") as mock_recup, \
          patch("triangulation.parsePointSet") as mock_parse_pts, \
          patch("triangulation.triangulation") as mock_algo, \
-         patch("triangulation.parseTriangle") as mock_parse_tri:
+         patch("triangulation.streamTriangle") as mock_stream_tri:
         
         mock_recup.return_value = b"FAKE_DATA"
         mock_parse_pts.return_value = [(0,0), (1,1), (0,1)] # Des points valides
-        mock_algo.return_value = [((0,0), (1,1), (0,1))]    # Un triangle valide
-        mock_parse_tri.return_value = b"RESULT_BINARY"
+        mock_algo.return_value = ([0, 1, 2], None)          # Un triangle valide
+        mock_stream_tri.return_value = (13, iter([b"RESULT_", b"BINARY"]))
 
         response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
         
         assert response.status_code == 200
         assert response.data == b"RESULT_BINARY"
 
+def test_api_triangulation_pipeline(client):
+    """Test la chaîne complète (seule la récupération est mockée)."""
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+
+    assert response.status_code == 200
+    assert response.content_length == len(response.data)
+    assert response.data[:len(SQUARE)] == SQUARE
+    num_triangles = struct.unpack_from('<I', response.data, len(SQUARE))[0]
+    assert num_triangles == 2
+    assert len(response.data) == len(SQUARE) + 4 + 12 * num_triangles
+
+def test_api_triangulation_cached(client):
+    """Test qu'un même PointSet n'est récupéré et calculé qu'une fois."""
+    with patch("triangulation.recupPointSet", return_value=SQUARE) as mock_recup:
+        first = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+        second = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+
+    assert mock_recup.call_count == 1
+    assert first.data == second.data
+    assert result_cache.stats()["hits"] == 1
+    assert result_cache.stats()["misses"] == 1
+
+def test_api_triangulation_deduplicated(client):
+    """Test qu'une même géométrie sous deux ids n'est triangulée qu'une fois."""
+    with patch("triangulation.recupPointSet",
+               side_effect=lambda *a, **k: bytes(SQUARE)), \
+         patch("triangulation.triangulation",
+               wraps=triangulation.triangulation) as mock_algo:
+        first = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+        second = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174001")
+
+    assert mock_algo.call_count == 1
+    assert first.data == second.data
+    assert content_cache.stats()["hits"] == 1
+    assert content_cache.stats()["hit_rate"] == 0.5
+    assert result_cache.stats()["entries"] == 2
+
+def test_api_triangulation_coalesced(client):
+    """Test que des requêtes simultanées sur un même id partagent un calcul."""
+    release = threading.Event()
+    responses = []
+
+    def slow_recup(*args, **kwargs):
+        release.wait(5)
+        return SQUARE
+
+    def request():
+        with app.test_client() as other:
+            responses.append(
+                other.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+            )
+
+    with patch("triangulation.recupPointSet", side_effect=slow_recup) as mock_recup:
+        shared_before = in_flight.shared
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        while in_flight.shared - shared_before < 4:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert mock_recup.call_count == 1
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({r.data for r in responses}) == 1
+
+def _read_batch(data):
+    """Découpe la réponse du lot en une liste de (code HTTP, contenu)."""
+    count = struct.unpack_from('<I', data, 0)[0]
+    offset = 4
+    entries = []
+    for _ in range(count):
+        status, size = struct.unpack_from('<II', data, offset)
+        offset += 8
+        entries.append((status, data[offset:offset + size]))
+        offset += size
+    assert offset == len(data)
+    return entries
+
+def test_api_batch(client):
+    """Test le comportement de l'endpoint par lot, succès et erreurs mêlés."""
+    line = struct.pack('<Iffffff', 3, 0, 0, 1, 1, 2, 2)
+    found = "123e4567-e89b-12d3-a456-426614174000"
+    colinear = "123e4567-e89b-12d3-a456-426614174001"
+    missing = "123e4567-e89b-12d3-a456-426614174002"
+
+    def recup(pointSetId, validators=None):
+        if pointSetId == "not-a-uuid":
+            raise InvalidIdError()
+        if pointSetId == missing:
+            raise PointSetNotFoundError()
+        return SQUARE if pointSetId == found else line
+
+    with patch("triangulation.recupPointSet", side_effect=recup):
+        response = client.post("/triangulation/batch", json={
+            "pointSetIds": [found, "not-a-uuid", colinear, missing, found]
+        })
+        # La réponse est produite en flux : on la lit sous le mock
+        entries = _read_batch(response.data)
+
+    assert response.status_code == 200
+    assert [status for status, _ in entries] == [200, 400, 400, 404, 200]
+    assert entries[0][1][:len(SQUARE)] == SQUARE
+    assert entries[0][1] == entries[4][1]
+    assert json.loads(entries[1][1])["code"] == "INVALID_ID_FORMAT"
+    assert json.loads(entries[2][1])["code"] == "INVALID_REQUEST"
+    assert json.loads(entries[3][1])["code"] == "POINTSET_NOT_FOUND"
+
+def test_api_batch_bounded_window(client):
+    """Test que le lot ne soumet qu'une fenêtre bornée d'entrées d'avance."""
+    ids = [f"123e4567-e89b-12d3-a456-4266141740{i:02d}" for i in range(10)]
+    with patch("triangulation.recupPointSet", return_value=SQUARE), \
+         patch("app.BATCH_WINDOW", 3), \
+         patch.object(batch_executor, "submit",
+                      wraps=batch_executor.submit) as mock_submit:
+        response = client.post("/triangulation/batch",
+                               json={"pointSetIds": ids}, buffered=False)
+        chunks = iter(response.response)
+        assert mock_submit.call_count == 0
+        next(chunks)                                  # Nombre d'entrées
+        next(chunks)                                  # Première entrée
+        assert mock_submit.call_count == 3
+        rest = b"".join(chunks)
+        response.close()
+    assert mock_submit.call_count == 10
+    assert rest.count(SQUARE) == 10
+
+def test_api_batch_empty(client):
+    """Test l'endpoint par lot avec une liste vide."""
+    response = client.post("/triangulation/batch", json={"pointSetIds": []})
+    assert response.status_code == 200
+    assert response.data == struct.pack('<I', 0)
+
+def test_api_batch_invalid_body(client):
+    """Test le retour 400 quand le corps de la requête par lot est invalide."""
+    for body in ({}, {"pointSetIds": "abc"}, {"pointSetIds": [1, 2]}, [1]):
+        response = client.post("/triangulation/batch", json=body)
+        assert response.status_code == 400
+        assert response.json['code'] == 'INVALID_REQUEST'
+
+    response = client.post("/triangulation/batch", data=b"not json")
+    assert response.status_code == 400
+
+def test_api_batch_too_large(client):
+    """Test le retour 400 quand le lot dépasse la taille maximale."""
+    with patch("app.BATCH_MAX_SIZE", 2):
+        response = client.post("/triangulation/batch", json={
+            "pointSetIds": ["a", "b", "c"]
+        })
+    assert response.status_code == 400
+
 def test_api_invalid_uuid(client):
     """Test le retour 400 quand l'uuid rentré est mauvais."""
     response = client.get("/triangulation/not-a-uuid")
@@ -49,7 +235,7 @@ def test_api_pointset_not_found(client):
     # On simule que recupPointSet lève l'exception NO_POINTSET_FOUND
     with patch(
         "triangulation.recupPointSet", 
-        side_effect=Exception("NO_POINTSET_FOUND")
+        side_effect=PointSetNotFoundError()
         ):
         response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
         assert response.status_code == 404
@@ -59,7 +245,7 @@ def test_api_service_unavailable(client):
     """Teste le retour 503 quand le manager ne répond pas."""
     with patch(
         "triangulation.recupPointSet", 
-        side_effect=Exception("NO_RESPONSE_SERVEUR")
+        side_effect=PointSetManagerUnavailableError()
         ):
         response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
         assert response.status_code == 503
@@ -75,12 +261,304 @@ def test_api_internal_error(client):
         assert response.status_code == 500
         assert response.json['code'] == 'INTERNAL_ERROR'
 
+def test_api_pointset_not_copied(client):
+    """Test que le binaire lu est décodé sans copie supplémentaire."""
+    body = bytearray(SQUARE)
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("triangulation.recupPointSet", return_value=body), \
+         patch("triangulation.triangulation",
+               wraps=triangulation.triangulation) as mock_algo:
+        response = client.get(url)
+    assert response.status_code == 200
+    points = mock_algo.call_args.args[0]
+    assert points.data is body
+    assert result_cache.get("123e4567-e89b-12d3-a456-426614174000")[0] is body
+
+def test_api_queue_full(client):
+    """Teste le retour 503 quand la file du pool de calcul est pleine."""
+    with patch("triangulation.recupPointSet", return_value=SQUARE), \
+         patch("app.triangulation_pool") as mock_pool:
+        mock_pool.run.side_effect = QueueFullError()
+        response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+    assert response.status_code == 503
+    assert response.json['code'] == 'SERVICE_UNAVAILABLE'
+
+def test_api_process_pool(client):
+    """Test que le calcul passe par le pool de processus s'il est configuré."""
+    with patch("triangulation.recupPointSet", return_value=SQUARE), \
+         patch("app.triangulation_pool") as mock_pool:
+        mock_pool.run.return_value = ([0, 1, 2, 0, 2, 3], None)
+        response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
+    mock_pool.run.assert_called_once_with(SQUARE, halfedges=True)
+    assert response.status_code == 200
+    assert response.data[len(SQUARE):] == struct.pack('<I6I', 2, 0, 1, 2, 0, 2, 3)
+
 def test_api_invalid_request(client):
     """Test le retour 400 dans le cas où le pointset est invalide."""
     with patch(
         "triangulation.recupPointSet", 
-        side_effect=Exception("INVALID_POINTSET")
+        side_effect=InvalidPointSetError()
         ):
         response = client.get("/triangulation/123e4567-e89b-12d3-a456-426614174000")
         assert response.status_code == 400
-        assert response.json['code'] == 'INVALID_REQUEST'
\ No newline at end of file
+        assert response.json['code'] == 'INVALID_REQUEST'
+
+
+def test_api_locate(client):
+    """Test la localisation d'un lot de points dans une triangulation."""
+    probes = struct.pack('<Iffffff', 3, 0.9, 0.1, 0.1, 0.9, 5, 5)
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("triangulation.recupPointSet", return_value=SQUARE) as mock_recup:
+        triangles = client.get(url).data[len(SQUARE) + 4:]
+        response = client.post(f"{url}/locate", data=probes)
+        again = client.post(f"{url}/locate", data=probes)
+
+    assert response.status_code == 200
+    count, first, second, outside = struct.unpack('<Iiii', response.data)
+    assert count == 3
+    assert outside == -1
+    # (0.9, 0.1) est dans le triangle contenant le sommet (1, 0), indice 1
+    assert 1 in struct.unpack_from('<3I', triangles, 12 * first)
+    assert 3 in struct.unpack_from('<3I', triangles, 12 * second)
+    assert again.data == response.data
+    mock_recup.assert_called_once()
+
+
+def test_api_locate_invalid_probes(client):
+    """Test le retour 400 quand le lot de points est mal formé."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000/locate"
+    nan = struct.pack('<Iff', 1, float('nan'), 0)
+    for body in (b"", b"\x02\x00\x00\x00", nan):
+        response = client.post(url, data=body)
+        assert response.status_code == 400
+        assert response.json['code'] == 'INVALID_REQUEST'
+
+
+def test_api_adjacency(client):
+    """Test le bloc des voisins, demandé par paramètre ou par Accept."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        plain = client.get(url)
+        by_param = client.get(f"{url}?adjacency=1")
+        by_accept = client.get(url, headers={"Accept": ADJACENCY_MEDIA_TYPE})
+        by_wildcard = client.get(url, headers={"Accept": "*/*"})
+
+    assert plain.mimetype == 'application/octet-stream'
+    assert by_wildcard.data == plain.data
+    assert by_param.mimetype == ADJACENCY_MEDIA_TYPE
+    assert by_accept.data == by_param.data
+    assert by_param.data[:len(plain.data)] == plain.data
+    # Deux triangles voisins par leur diagonale, chacun bordé par l'enveloppe
+    neighbours = struct.unpack('<6i', by_param.data[len(plain.data):])
+    assert sorted(neighbours) == [-1, -1, -1, -1, 0, 1]
+    assert neighbours[:3].count(1) == 1
+
+
+def test_api_adjacency_from_halfedges(client):
+    """Test que les voisins sont lus dans les demi-arêtes du calcul."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000?adjacency=1"
+    with patch("triangulation.recupPointSet", return_value=SQUARE), \
+         patch("triangulation._buildHalfedges") as mock_build:
+        response = client.get(url)
+    mock_build.assert_not_called()
+    assert response.status_code == 200
+    neighbours = struct.unpack('<6i', response.data[-24:])
+    assert sorted(neighbours) == [-1, -1, -1, -1, 0, 1]
+
+
+def test_api_revalidation_not_modified(client):
+    """Test qu'un 304 du PointSetManager conserve la triangulation en cache."""
+    sent = []
+
+    def recup(pointSetId, validators=None):
+        sent.append(dict(validators))
+        if len(sent) > 1:
+            return None
+        validators.update(etag='"v1"', last_modified=None)
+        return SQUARE
+
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("app.CACHE_REVALIDATE_AFTER", 0), \
+         patch("triangulation.recupPointSet", side_effect=recup), \
+         patch("triangulation.triangulation",
+               wraps=triangulation.triangulation) as mock_algo, \
+         patch.object(result_cache, "_save") as mock_save:
+        first = client.get(url)
+        second = client.get(url)
+
+    assert mock_algo.call_count == 1
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert sent[1]["etag"] == '"v1"'
+    # Entrée confirmée : métadonnées remplacées, sans réécriture sur disque
+    assert mock_save.call_count == 1
+
+
+def test_api_revalidation_unavailable(client):
+    """Test qu'un PointSetManager indisponible repousse la revalidation."""
+    pointSetId = "123e4567-e89b-12d3-a456-426614174000"
+    url = f"/triangulation/{pointSetId}"
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        first = client.get(url)
+    entry = result_cache.get(pointSetId)
+    meta = result_cache.meta(pointSetId, entry)
+    assert result_cache.touch(pointSetId, entry, {**meta, "checked": float("-inf")})
+
+    with patch("triangulation.recupPointSet",
+               side_effect=PointSetManagerUnavailableError()) as mock_recup:
+        stale = client.get(url)
+        again = client.get(url)
+
+    assert mock_recup.call_count == 1
+    assert stale.status_code == again.status_code == 200
+    assert again.data == first.data
+    assert result_cache.meta(pointSetId)["tag"] == meta["tag"]
+
+
+def test_api_revalidation_replaced(client):
+    """Test qu'un PointSet modifié remplace l'entrée et ses voisins."""
+    pentagon = struct.pack('<I10f', 5, 0, 0, 2, 0, 3, 1, 1, 3, -1, 1)
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000?adjacency=1"
+
+    def check(response, point_set):
+        assert response.data[:len(point_set)] == point_set
+        count = struct.unpack_from('<I', response.data, len(point_set))[0]
+        assert len(response.data) == len(point_set) + 4 + 24 * count
+
+    with patch("app.CACHE_REVALIDATE_AFTER", 0):
+        with patch("triangulation.recupPointSet", return_value=SQUARE):
+            check(client.get(url), SQUARE)
+        with patch("triangulation.recupPointSet", return_value=pentagon):
+            check(client.get(url), pentagon)
+
+    # Entrée évincée puis recalculée : les voisins suivent la nouvelle entrée
+    result_cache.clear()
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        check(client.get(url), SQUARE)
+
+
+def test_api_etag(client):
+    """Test l'ETag des réponses et le 304 sur If-None-Match."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        first = client.get(url)
+        etag = first.headers["ETag"]
+        cached = client.get(url, headers={"If-None-Match": etag})
+        other = client.get(f"{url}?vertices=0", headers={"If-None-Match": etag})
+        stale = client.get(url, headers={"If-None-Match": 'W/"stale"'})
+
+    assert etag.startswith('W/"')
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    assert other.status_code == 200
+    assert other.headers["ETag"] != etag
+    assert stale.status_code == 200
+    assert stale.data == first.data
+
+
+def test_api_response_encodings(client):
+    """Test la compression, l'omission des sommets et le codage delta."""
+    coords = [float(v) for i in range(100) for v in (i % 10, i // 10 + 0.1 * i)]
+    point_set = struct.pack(f'<I{len(coords)}f', 100, *coords)
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    with patch("triangulation.recupPointSet", return_value=point_set):
+        plain = client.get(url)
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+        refused = client.get(url, headers={"Accept-Encoding": "gzip;q=0"})
+        short = client.get(f"{url}?vertices=0")
+        delta = client.get(f"{url}?vertices=0&indices=delta&adjacency=1")
+
+    assert "Accept-Encoding" in plain.vary
+    assert plain.content_encoding is None
+    assert compressed.content_encoding == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data)
+    assert refused.data == plain.data
+
+    assert short.mimetype_params == {"vertices": "omitted"}
+    assert short.content_length == len(plain.data) - len(point_set)
+    assert short.data == plain.data[len(point_set):]
+
+    assert delta.mimetype == ADJACENCY_MEDIA_TYPE
+    assert delta.mimetype_params == {"vertices": "omitted", "indices": "delta"}
+    count = struct.unpack_from('<I', delta.data)[0]
+    triangles, offset = decodeVarints(delta.data, 3 * count, 4)
+    neighbours, offset = decodeVarints(delta.data, 3 * count, offset, 'i')
+    assert offset == len(delta.data)
+    assert triangles.tobytes() == short.data[4:]
+    assert min(neighbours) == -1 and max(neighbours) == count - 1
+
+
+def test_api_metrics(client):
+    """Test les mesures par étape, l'en-tête Server-Timing et /metrics."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    missing = errors_total.value(stage="recup", code="NO_POINTSET_FOUND")
+    with patch("triangulation.recupPointSet", return_value=SQUARE):
+        response = client.get(url)
+        response.get_data()
+    with patch("triangulation.recupPointSet",
+               side_effect=PointSetNotFoundError()):
+        client.get("/triangulation/123e4567-e89b-12d3-a456-426614174001")
+
+    timing = response.headers["Server-Timing"]
+    stages = [part.split(";")[0] for part in timing.split(", ")]
+    assert stages == ["cache", "recup", "dedupe", "parse", "triangulate", "encode"]
+    assert errors_total.value(stage="recup", code="NO_POINTSET_FOUND") == missing + 1
+
+    exposition = client.get("/metrics")
+    assert exposition.status_code == 200
+    assert exposition.mimetype == "text/plain"
+    text = exposition.get_data(as_text=True)
+    assert 'triangulator_stage_seconds_count{stage="stream"}' in text
+    assert 'triangulator_pointset_points_bucket{le="10"}' in text
+    assert ('triangulator_requests_total{endpoint="get_triangulation",status="404"}'
+            in text)
+    assert 'triangulator_requests_in_flight{endpoint="get_metrics"} 1' in text
+
+
+def test_api_profile(client, tmp_path):
+    """Test le profilage demandé par l'en-tête d'administration."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    admin = {"X-Triangulator-Profile": "secret"}
+    with patch("app.PROFILE_ADMIN_TOKEN", "secret"), \
+            patch("triangulation.recupPointSet", return_value=SQUARE):
+        plain = client.get(url, headers={"X-Triangulator-Profile": "wrong"})
+        profiled = client.get(url, headers=admin)
+        assert profiled.data == plain.data
+        profiled.close()
+        assert "X-Triangulator-Profile-Id" not in plain.headers
+        profile_id = profiled.headers["X-Triangulator-Profile-Id"]
+
+        assert client.get(f"/profiles/{profile_id}").status_code == 403
+        assert profile_id in client.get("/profiles", headers=admin).json["profiles"]
+        download = client.get(f"/profiles/{profile_id}", headers=admin)
+        text = client.get(f"/profiles/{profile_id}?format=text", headers=admin)
+        missing = client.get("/profiles/unknown", headers=admin)
+
+    assert download.status_code == 200
+    path = tmp_path / "profile.prof"
+    path.write_bytes(download.data)
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert {"parsePointSet", "_delaunay", "streamTriangle"} <= functions
+    assert "recupPointSet" not in functions
+    assert "_delaunay" in text.get_data(as_text=True)
+    assert missing.status_code == 404
+
+
+def test_api_profiles_without_token(client):
+    """Test que les profils ne sont pas exposés sans jeton configuré."""
+    url = "/triangulation/123e4567-e89b-12d3-a456-426614174000"
+    # Profil déclenché par échantillonnage seul
+    with patch.object(profile_sampler, "rate", 1.0), \
+         patch.object(profile_sampler, "min_interval", 0.0), \
+         patch("triangulation.recupPointSet", return_value=SQUARE):
+        response = client.get(url)
+        response.close()
+    profile_id = response.headers["X-Triangulator-Profile-Id"]
+    assert profile_id in profile_store.ids()
+
+    assert client.get("/profiles").status_code == 403
+    assert client.get(f"/profiles/{profile_id}").status_code == 403
+    headers = {"X-Triangulator-Profile": ""}
+    assert client.get("/profiles", headers=headers).status_code == 403
@@ -0,0 +1,219 @@
+"""Module de test pour le serveur ASGI.
+
+Ce module gère les tests de l'application asynchrone donnée dans asgi.py
+"""
+import asyncio
+import http.server
+import json
+import os
+import struct
+import subprocess
+import sys
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import asgi
+import triangulation
+
+VALID_UUID = "123e4567-e89b-12d3-a456-426614174000"
+POINT_SET = struct.pack('<I', 4) + struct.pack('<8f', 0, 0, 1, 0, 0, 1, 1, 1)
+
+
+def _call(path, method="GET"):
+    """Exécute une requête HTTP sur l'application ASGI.
+
+    Args:
+        path (str): chemin demandé.
+        method (str): méthode HTTP.
+
+    Returns:
+        tuple: (code HTTP, en-têtes, corps).
+
+    """
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    asyncio.run(asgi.application(scope, receive, send))
+    start, *bodies = messages
+    return (start["status"], dict(start["headers"]),
+            b"".join(m["body"] for m in bodies))
+
+
+class _StubPointSetManager(http.server.BaseHTTPRequestHandler):
+    """Faux PointSetManager local comptant les connexions ouvertes."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        """Compte chaque nouvelle connexion."""
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self, head=False):  # noqa: N802
+        """Répond au GET /pointset/{id} (404 pour un id inconnu).
+
+        Les chemins /204 et /304 renvoient ces codes sans Content-Length,
+        la connexion restant ouverte.
+        """
+        if self.path.endswith(("/204", "/304")):
+            self.send_response(int(self.path[-3:]))
+            self.end_headers()
+            return
+        body = POINT_SET if self.path.endswith(VALID_UUID) else b"{}"
+        self.send_response(200 if body is POINT_SET else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def do_HEAD(self):  # noqa: N802
+        """Répond au HEAD : en-têtes du GET, sans corps."""
+        self.do_GET(head=True)
+
+    def log_message(self, *args):
+        """Désactive les logs du serveur."""
+
+
+@pytest.fixture
+def stub_url():
+    """Démarre un PointSetManager local et renvoie son URL."""
+    _StubPointSetManager.connections = 0
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubPointSetManager)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/pointset"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_asgi_triangulation_success(stub_url):
+    """Test le pipeline complet avec un PointSetManager local."""
+    with patch("triangulation.POINT_SET_MANAGER_URL", stub_url), \
+         patch("asgi.client", asgi.AsyncPointSetClient()):
+        status, headers, body = _call(f"/triangulation/{VALID_UUID}")
+
+    assert status == 200
+    assert headers[b"content-length"] == str(len(body)).encode()
+    vertices, triangles = triangulation.decodeTriangles(body)
+    assert vertices == POINT_SET
+    assert len(triangles) == 6
+
+
+def test_asgi_head(stub_url):
+    """Test qu'une requête HEAD renvoie les en-têtes du GET, sans corps."""
+    url = f"/triangulation/{VALID_UUID}"
+    with patch("triangulation.POINT_SET_MANAGER_URL", stub_url):
+        # Un client par boucle d'événements (une par appel)
+        with patch("asgi.client", asgi.AsyncPointSetClient()):
+            _, get_headers, get_body = _call(url)
+        with patch("asgi.client", asgi.AsyncPointSetClient()):
+            status, headers, body = _call(url, method="HEAD")
+    error = _call("/triangulation/not-a-uuid", method="HEAD")
+
+    assert status == 200
+    assert body == b""
+    assert headers == get_headers
+    assert headers[b"content-length"] == str(len(get_body)).encode()
+    assert error[0] == 400
+    assert error[2] == b""
+
+
+def test_asgi_triangulation_not_found(stub_url):
+    """Test la traduction du 404 du PointSetManager."""
+    with patch("triangulation.POINT_SET_MANAGER_URL", stub_url), \
+         patch("asgi.client", asgi.AsyncPointSetClient()):
+        status, _, body = _call(f"/triangulation/{VALID_UUID[:-1]}1")
+
+    assert status == 404
+    assert json.loads(body)["code"] == "POINTSET_NOT_FOUND"
+
+
+def test_asgi_invalid_id():
+    """Test le rejet d'un id invalide sans appel au PointSetManager."""
+    status, _, body = _call("/triangulation/not-a-uuid")
+    assert status == 400
+    assert json.loads(body)["code"] == "INVALID_ID_FORMAT"
+
+
+def test_asgi_unavailable():
+    """Test la traduction d'une erreur de connexion au PointSetManager."""
+    with patch("triangulation.POINT_SET_MANAGER_URL", "http://127.0.0.1:9/p"):
+        status, _, body = _call(f"/triangulation/{VALID_UUID}")
+    assert status == 503
+    assert json.loads(body)["code"] == "SERVICE_UNAVAILABLE"
+
+
+def test_asgi_without_flask_app():
+    """Test que le serveur ASGI se charge sans construire l'application Flask."""
+    code = "import asgi, sys; assert 'app' not in sys.modules, 'app'"
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=os.path.dirname(asgi.__file__) or ".")
+
+
+def test_asgi_unknown_route():
+    """Test les routes et méthodes non gérées."""
+    assert _call("/other")[0] == 404
+    assert _call(f"/triangulation/{VALID_UUID}", method="POST")[0] == 405
+
+
+def test_asgi_client_keep_alive(stub_url):
+    """Test la réutilisation des connexions pour des requêtes concurrentes."""
+    async def run():
+        client = asgi.AsyncPointSetClient(pool_size=4)
+        bodies = await asyncio.gather(*(
+            asgi.recupPointSetAsync(client, VALID_UUID) for _ in range(50)
+        ))
+        await client.close()
+        return client, bodies
+
+    with patch("triangulation.POINT_SET_MANAGER_URL", stub_url):
+        client, bodies = asyncio.run(run())
+
+    assert all(body == POINT_SET for body in bodies)
+    assert client.connections_opened <= 4
+    assert _StubPointSetManager.connections <= 4
+
+
+def test_asgi_client_no_body(stub_url):
+    """Test les réponses sans corps lues sans attendre la fin du flux."""
+    async def run():
+        client = asgi.AsyncPointSetClient(pool_size=1, timeout=5)
+        responses = [
+            await client.get(f"{stub_url}/304"),
+            await client.get(f"{stub_url}/204"),
+            await client.request("HEAD", f"{stub_url}/{VALID_UUID}"),
+            await client.get(f"{stub_url}/{VALID_UUID}"),
+        ]
+        await client.close()
+        return client, responses
+
+    client, responses = asyncio.run(run())
+    assert responses == [(304, b""), (204, b""), (200, b""), (200, POINT_SET)]
+    # Connexion conservée d'une réponse à l'autre
+    assert client.connections_opened == 1
+
+
+def test_asgi_lifespan():
+    """Test le protocole lifespan (démarrage puis arrêt)."""
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+    sent = []
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(asgi.application({"type": "lifespan"}, receive, send))
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
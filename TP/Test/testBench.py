@@ -0,0 +1,91 @@
+"""Module de test pour le banc de mesure.
+
+Ce module gère les tests des fonctions définies dans bench/harness.py
+"""
+import json
+import struct
+
+import pytest
+
+from bench import harness
+from triangulation import parsePointSet
+
+
+def test_generatePoints_distributions():
+    """Test que chaque distribution produit un PointSet valide."""
+    for distribution in harness.DISTRIBUTIONS:
+        data = harness.generatePoints(distribution, 50)
+        assert struct.unpack_from('<I', data)[0] == 50
+        assert len(parsePointSet(data)) == 50
+        assert data == harness.generatePoints(distribution, 50)
+
+    with pytest.raises(ValueError):
+        harness.generatePoints("unknown", 10)
+
+
+def test_percentile():
+    """Test l'interpolation des percentiles."""
+    samples = [4.0, 1.0, 3.0, 2.0]
+    assert harness.percentile(samples, 0) == 1.0
+    assert harness.percentile(samples, 50) == 2.5
+    assert harness.percentile(samples, 100) == 4.0
+    assert harness.percentile([7.0], 99) == 7.0
+
+
+def test_measure_warmup_and_repeat():
+    """Test le nombre d'exécutions et le résumé produit."""
+    calls = []
+    stats = harness.measure(lambda: calls.append(1), warmup=2, repeat=5)
+    assert len(calls) == 7
+    assert stats["runs"] == 5
+    assert stats["min"] <= stats["p50"] <= stats["p90"] <= stats["max"]
+
+
+def test_measure_propagates_errors():
+    """Test qu'une étape en échec n'est pas mesurée silencieusement."""
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        harness.measure(fail, warmup=0, repeat=1)
+
+
+def test_compare():
+    """Test la détection des régressions."""
+    baseline = {"a": {"p50": 1.0}, "b": {"p50": 1.0}, "c": {"p50": 1e-5}}
+    results = {
+        "a": {"p50": 1.1},   # dans le seuil
+        "b": {"p50": 2.0},   # régression
+        "c": {"p50": 5e-5},  # bruit : écart absolu négligeable
+        "d": {"p50": 9.0},   # absent de la référence
+    }
+    assert harness.compare(results, baseline, threshold=0.25) == [("b", 1.0, 2.0)]
+
+
+def test_workers_cases():
+    """Test la déclinaison de l'étape triangulate par nombre de processus."""
+    assert harness.caseKey("encode", "grid", 10) == "encode/grid/10"
+    assert harness.caseKey("triangulate", "grid", 10, 4) == "triangulate@4/grid/10"
+    assert harness._cases(("parse", "triangulate"), (1, 2)) == [
+        ("parse", 1), ("triangulate", 1), ("triangulate", 2)
+    ]
+
+
+def test_main_flags_regression(tmp_path, capsys, monkeypatch):
+    """Test le lancement complet, l'écriture JSON et la comparaison."""
+    baseline = tmp_path / "baseline.json"
+    output = tmp_path / "results.json"
+    args = ["--sizes", "10", "--distributions", "uniform", "--repeat", "3",
+            "--baseline", str(baseline), "--output", str(output)]
+
+    assert harness.main([*args, "--save-baseline"]) == 0
+    saved = json.loads(baseline.read_text())["results"]
+    assert set(saved) == {f"{s}/uniform/10" for s in harness.STAGES}
+
+    for stats in saved.values():
+        stats["p50"] = 0.0
+    monkeypatch.setattr(harness, "NOISE_FLOOR", 0.0)
+    baseline.write_text(json.dumps({"results": saved}))
+    assert harness.main([*args, "--stages", "triangulate"]) == 1
+    assert "REGRESSION triangulate/uniform/10" in capsys.readouterr().out
+    assert set(json.loads(output.read_text())["results"]) == {"triangulate/uniform/10"}
@@ -0,0 +1,258 @@
+"""Module de test pour le cache des triangulations.
+
+Ce module gère les tests des classes ResultCache, ContentCache, DerivedCache
+et SingleFlight définies dans cache.py
+"""
+import os
+import struct
+import threading
+import zlib
+from array import array
+from unittest.mock import patch
+
+import pytest
+
+from cache import ContentCache, DerivedCache, ResultCache, SingleFlight, contentKey
+
+POINTSET = struct.pack('<Iffffff', 3, 0, 0, 1, 0, 0, 1)
+TRIANGLES = array('I', [0, 1, 2])
+# Taille d'une entrée : 28 octets de pointset + 12 octets d'indices
+ENTRY_SIZE = 40
+
+
+def test_cache_miss_then_hit():
+    """Test le comportement du cache lors d'un échec puis d'un succès."""
+    cache = ResultCache(1000)
+    assert cache.get("a") is None
+    cache.put("a", POINTSET, TRIANGLES)
+    assert cache.get("a") == (POINTSET, TRIANGLES, None)
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == ENTRY_SIZE
+
+
+def test_cache_lru_eviction():
+    """Test l'éviction de l'entrée la moins récemment utilisée."""
+    cache = ResultCache(2 * ENTRY_SIZE)
+    cache.put("a", POINTSET, TRIANGLES)
+    cache.put("b", POINTSET, TRIANGLES)
+    # "a" devient la plus récente, "b" sera évincée
+    assert cache.get("a") is not None
+    cache.put("c", POINTSET, TRIANGLES)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 2 * ENTRY_SIZE
+
+
+def test_cache_replace_entry():
+    """Test le remplacement d'une entrée existante sans double comptage."""
+    cache = ResultCache(1000)
+    cache.put("a", POINTSET, TRIANGLES)
+    cache.put("a", POINTSET, TRIANGLES)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == ENTRY_SIZE
+
+
+def test_cache_entry_too_large():
+    """Test qu'une entrée plus grosse que le cache n'est pas conservée."""
+    cache = ResultCache(ENTRY_SIZE - 1)
+    cache.put("a", POINTSET, TRIANGLES)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_clear():
+    """Test la remise à zéro du cache."""
+    cache = ResultCache(1000)
+    cache.put("a", POINTSET, TRIANGLES)
+    cache.get("a")
+    cache.clear()
+    assert cache.stats() == {
+        "entries": 0, "bytes": 0, "max_bytes": 1000,
+        "hits": 0, "misses": 0, "evictions": 0, "disk_hits": 0,
+    }
+
+
+def test_cache_disk_tier(tmp_path):
+    """Test que le niveau disque survit à la recréation du cache."""
+    ResultCache(1000, str(tmp_path)).put("a", POINTSET, TRIANGLES)
+
+    cache = ResultCache(1000, str(tmp_path))
+    point_set_bytes, triangles, halfedges = cache.get("a")
+    assert point_set_bytes == POINTSET
+    assert triangles == TRIANGLES
+    # Les demi-arêtes ne sont pas écrites sur disque
+    assert halfedges is None
+    assert cache.stats()["disk_hits"] == 1
+    # L'entrée est remontée en mémoire
+    assert cache.stats()["entries"] == 1
+
+
+def test_cache_disk_tier_safe_filename(tmp_path):
+    """Test que la clé ne permet pas d'écrire hors du dossier du cache."""
+    cache = ResultCache(1000, str(tmp_path))
+    cache.put("../evil", POINTSET, TRIANGLES)
+    assert os.listdir(tmp_path) == [b"../evil".hex() + ".tri"]
+
+
+def test_cache_disk_tier_corrupted(tmp_path):
+    """Test qu'un fichier illisible est traité comme une absence."""
+    cache = ResultCache(1000, str(tmp_path))
+    with open(cache._path("a"), "wb") as f:
+        f.write(b"\x01\x02")
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_content_cache_shared_geometry():
+    """Test qu'un binaire identique retrouve l'entrée, quel que soit l'objet."""
+    cache = ContentCache(1000)
+    assert cache.lookup(POINTSET) is None
+    cache.add(POINTSET, TRIANGLES)
+    point_set_bytes, triangles, _ = cache.lookup(bytearray(POINTSET))
+    assert point_set_bytes is POINTSET
+    assert triangles == TRIANGLES
+    assert cache.lookup(POINTSET[:-4] + struct.pack('<f', 2)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["collisions"]) == (1, 2, 0)
+    assert stats["hit_rate"] == pytest.approx(1 / 3)
+    assert contentKey(POINTSET) == f"{zlib.crc32(POINTSET):08x}-28"
+
+
+def test_content_cache_collision():
+    """Test qu'une collision d'empreintes est traitée comme une absence."""
+    cache = ContentCache(1000)
+    other = struct.pack('<Iffffff', 3, 0, 0, 2, 0, 0, 2)
+    with patch("cache.contentKey", return_value="00000000-28"):
+        cache.add(POINTSET, TRIANGLES)
+        assert cache.lookup(other) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["collisions"]) == (0, 1, 1)
+    cache.clear()
+    assert cache.stats()["collisions"] == 0
+
+
+def test_cache_meta():
+    """Test les métadonnées, liées à l'entrée en mémoire qu'elles accompagnent."""
+    cache = ResultCache(ENTRY_SIZE)
+    entry = cache.put("a", POINTSET, TRIANGLES, meta={"etag": '"v1"'})
+    assert cache.meta("a") == {"etag": '"v1"'}
+    assert cache.meta("a", entry) == {"etag": '"v1"'}
+    assert cache.meta("a", (POINTSET, TRIANGLES, None)) is None
+
+    cache.put("a", POINTSET, TRIANGLES)
+    assert cache.meta("a") is None
+    cache.put("b", POINTSET, TRIANGLES, meta={"etag": '"v2"'})
+    assert cache.meta("b") is not None
+    # Entrée évincée : ses métadonnées aussi
+    cache.put("c", POINTSET, TRIANGLES)
+    assert cache.meta("b") is None
+
+
+def test_cache_touch(tmp_path):
+    """Test le remplacement des métadonnées sans réécriture sur disque."""
+    cache = ResultCache(1000, str(tmp_path))
+    entry = cache.put("a", POINTSET, TRIANGLES, meta={"etag": '"v1"'})
+    mtime = os.stat(cache._path("a")).st_mtime_ns
+    with patch.object(cache, "_save") as mock_save:
+        assert cache.touch("a", entry, {"etag": '"v2"'})
+        assert not cache.touch("a", (POINTSET, TRIANGLES, None), {})
+        assert not cache.touch("b", entry, {})
+    mock_save.assert_not_called()
+    assert cache.meta("a") == {"etag": '"v2"'}
+    assert cache.meta("b") is None
+    assert os.stat(cache._path("a")).st_mtime_ns == mtime
+
+
+def test_derived_cache():
+    """Test qu'une valeur dérivée n'est réutilisée que pour son entrée."""
+    derived = DerivedCache(2)
+    builds = []
+
+    def build(entry):
+        builds.append(entry)
+        return len(builds)
+
+    first = (POINTSET, TRIANGLES)
+    assert derived.get("a", first, build) == 1
+    assert derived.get("a", first, build) == 1
+    # Entrée remplacée (même contenu, autre objet) : valeur reconstruite
+    assert derived.get("a", (POINTSET, TRIANGLES), build) == 2
+    derived.get("b", first, build)
+    derived.get("c", first, build)
+    assert derived.get("a", first, build) == 5
+    derived.clear()
+    assert derived.get("a", first, build) == 6
+
+
+def _concurrent_calls(flight, fn, count):
+    """Lance count appels simultanés de flight.do et renvoie leurs résultats."""
+    results = [None] * count
+
+    def worker(i):
+        try:
+            results[i] = flight.do("a", fn)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_singleflight_shares_result():
+    """Test que des appels simultanés partagent un unique calcul."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "résultat"
+
+    threads, results = _concurrent_calls(flight, compute, 8)
+    # On attend que tous les suiveurs soient en attente du calcul en cours
+    while flight.shared < 7:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["résultat"] * 8
+
+
+def test_singleflight_shares_error():
+    """Test que l'erreur du calcul est transmise à tous les appelants."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def compute():
+        release.wait(5)
+        raise Exception("NO_RESPONSE_SERVEUR")
+
+    threads, results = _concurrent_calls(flight, compute, 4)
+    while flight.shared < 3:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(str(res) == "NO_RESPONSE_SERVEUR" for res in results)
+
+
+def test_singleflight_sequential_calls():
+    """Test que des appels successifs relancent le calcul."""
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("a", lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do("a", lambda: int("x"))
+    assert flight.do("a", lambda: 3) == 3
+    assert flight.shared == 0
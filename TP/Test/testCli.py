@@ -0,0 +1,44 @@
+"""Module de test pour la ligne de commande.
+
+Ce module gère les tests des fonctions définies dans cli.py
+"""
+import struct
+
+import cli
+from triangulation import decodeTriangles, parsePointSet, triangulation
+
+SQUARE = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 1, 1, 0, 1)
+
+
+def test_cli_triangulates_file(tmp_path, capsys):
+    """Test la triangulation d'un fichier, en écriture simple ou projetée."""
+    source = tmp_path / "points.bin"
+    source.write_bytes(SQUARE)
+    written = tmp_path / "triangles.bin"
+    mapped = tmp_path / "mapped.bin"
+
+    assert cli.main([str(source), str(written)]) == 0
+    assert "2 triangles" in capsys.readouterr().out
+    assert cli.main([str(source), str(mapped), "--mmap-output"]) == 0
+    assert mapped.read_bytes() == written.read_bytes()
+
+    vertices, triangles = decodeTriangles(written.read_bytes())
+    assert vertices == SQUARE
+    assert triangles == triangulation(parsePointSet(SQUARE))
+
+
+def test_cli_errors(tmp_path, capsys):
+    """Test les erreurs : fichier absent, vide, tronqué ou dégénéré."""
+    assert cli.main([str(tmp_path / "absent.bin"), str(tmp_path / "out.bin")]) == 1
+
+    cases = {
+        b"": "INVALID_RESPONSE_FORMAT",
+        SQUARE[:-1]: "DECODE_ERROR",
+        struct.pack('<Iffffff', 3, 0, 0, 1, 1, 2, 2): "INVALID_POINTSET",
+    }
+    for content, code in cases.items():
+        source = tmp_path / "points.bin"
+        source.write_bytes(content)
+        capsys.readouterr()
+        assert cli.main([str(source), str(tmp_path / "out.bin")]) == 1
+        assert code in capsys.readouterr().err
@@ -0,0 +1,83 @@
+"""Module de test pour les erreurs du service.
+
+Ce module gère les tests des classes définies dans errors.py
+"""
+import pickle
+import struct
+
+import pytest
+
+from errors import (
+    DecodeError,
+    InvalidIdError,
+    InvalidInputError,
+    InvalidPointError,
+    InvalidPointSetError,
+    PointSetManagerUnavailableError,
+    PointSetNotFoundError,
+    QueueFullError,
+    TriangulationError,
+    TriangulationTimeoutError,
+    TriangulatorError,
+    errorPayload,
+)
+from triangulation import PointSet, recupPointSet
+
+
+@pytest.mark.parametrize("error, status, payload", [
+    (InvalidIdError(), 400,
+     {"code": "INVALID_ID_FORMAT", "message": "Invalid ID format"}),
+    (PointSetNotFoundError(), 404,
+     {"code": "POINTSET_NOT_FOUND", "message": "PointSet not found"}),
+    (InvalidPointSetError(), 400,
+     {"code": "INVALID_REQUEST", "message": "INVALID_POINTSET"}),
+    (InvalidPointError(), 400,
+     {"code": "INVALID_REQUEST", "message": "INVALID_POINT"}),
+    (PointSetManagerUnavailableError(), 503,
+     {"code": "SERVICE_UNAVAILABLE", "message": "PointSetManager unavailable"}),
+    (QueueFullError(), 503,
+     {"code": "SERVICE_UNAVAILABLE", "message": "Triangulation queue full"}),
+    (TriangulationTimeoutError(), 503,
+     {"code": "SERVICE_UNAVAILABLE", "message": "Triangulation timed out"}),
+    (DecodeError(), 500, {"code": "INTERNAL_ERROR", "message": "DECODE_ERROR"}),
+    (TriangulationError(), 500,
+     {"code": "INTERNAL_ERROR", "message": "ERROR_TRIANGULATION"}),
+    (ValueError("Boom!"), 500, {"code": "INTERNAL_ERROR", "message": "Boom!"}),
+])
+def test_error_payload(error, status, payload):
+    """Test la traduction de chaque erreur en réponse de l'API."""
+    assert errorPayload(error) == (payload, status)
+
+
+def test_error_code():
+    """Test le code porté par les erreurs et leur transport entre processus."""
+    error = InvalidPointSetError()
+    assert str(error) == error.code == "INVALID_POINTSET"
+    assert isinstance(error, InvalidInputError)
+    assert str(InvalidInputError("INVALID_TRIANGLE")) == "INVALID_TRIANGLE"
+
+    # Erreurs remontées par le pool de processus : transmises par pickle
+    copy = pickle.loads(pickle.dumps(QueueFullError()))
+    assert type(copy) is QueueFullError
+    assert copy.code == "QUEUE_FULL"
+    assert errorPayload(copy)[1] == 503
+
+
+def test_validation_errors_not_chained():
+    """Test que les erreurs de validation ne conservent pas l'erreur d'origine."""
+    with pytest.raises(InvalidIdError) as exc:
+        recupPointSet("not-a-uuid")
+    assert exc.value.__cause__ is None
+    assert exc.value.__suppress_context__
+
+    with pytest.raises(DecodeError) as exc:
+        PointSet.fromBytes(struct.pack('<Iff', 2, 0, 0))
+    assert exc.value.__cause__ is None
+
+    # Coordonnée NaN dans un binaire reçu : erreur de décodage
+    nan = struct.pack('<Iffffff', 3, 0, 0, 1, 0, float("nan"), 1)
+    with pytest.raises(DecodeError):
+        PointSet.fromBytes(nan)
+    with pytest.raises(InvalidPointError):
+        PointSet.fromPoints([(0, 0), (1, 0), (float("nan"), 1)])
+    assert issubclass(DecodeError, TriangulatorError)
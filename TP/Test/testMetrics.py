@@ -0,0 +1,73 @@
+"""Module de test pour les métriques.
+
+Ce module gère les tests des classes définies dans metrics.py
+"""
+import threading
+
+import pytest
+
+from metrics import Counter, Gauge, Histogram, Registry, serverTiming
+
+
+def test_counter_and_gauge():
+    """Test les compteurs étiquetés et les jauges."""
+    errors = Counter("errors_total", "Erreurs.", ("stage", "code"))
+    errors.inc(stage="recup", code="NO_POINTSET_FOUND")
+    errors.inc(2, stage="recup", code="NO_POINTSET_FOUND")
+    assert errors.value(stage="recup", code="NO_POINTSET_FOUND") == 3
+    assert errors.value(stage="parse", code="DECODE_ERROR") == 0
+    with pytest.raises(ValueError):
+        errors.inc(stage="recup")
+
+    in_flight = Gauge("in_flight", "En cours.")
+    with in_flight.track():
+        assert in_flight.value() == 1
+    assert in_flight.value() == 0
+    in_flight.set(5)
+    assert in_flight.collect() == ["in_flight 5"]
+
+
+def test_histogram_buckets():
+    """Test la répartition cumulée des mesures."""
+    durations = Histogram("stage_seconds", "Durées.", (0.1, 1.0), ("stage",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        durations.observe(value, stage="parse")
+    assert durations.count(stage="parse") == 4
+    assert durations.collect() == [
+        'stage_seconds_bucket{stage="parse",le="0.1"} 2',
+        'stage_seconds_bucket{stage="parse",le="1"} 3',
+        'stage_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'stage_seconds_sum{stage="parse"} 3.65',
+        'stage_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_thread_safety():
+    """Test que les mesures concurrentes ne sont pas perdues."""
+    counter = Counter("calls_total", "Appels.")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.value() == 8000
+
+
+def test_registry_render():
+    """Test l'exposition texte et l'échappement des étiquettes."""
+    registry = Registry()
+    errors = registry.register(Counter("errors_total", "Erreurs.", ("code",)))
+    errors.inc(code='say "hi"\n')
+    assert registry.render() == (
+        "# HELP errors_total Erreurs.\n"
+        "# TYPE errors_total counter\n"
+        'errors_total{code="say \\"hi\\"\\n"} 1\n'
+    )
+    assert serverTiming([("recup", 0.00125), ("parse", 0.5)]) == (
+        "recup;dur=1.25, parse;dur=500.00"
+    )
@@ -2,14 +2,12 @@
 
 Ce module gère les tests de la fonction ParsePointSet défini dans triangulation.py
 """
-import contextlib
 import struct
-import time
 from unittest.mock import patch
 
 import pytest
 
-from triangulation import parsePointSet
+from triangulation import PointSet, parsePointSet
 
 # Ce binaire déclare 3 points (\x03 au début)
 POINTSET_VALID = (
@@ -75,36 +73,41 @@ def test_parsePointSet_unpack_error(_):
 def test_parsePointSet_success():
     """Test le comportement de la fonction en cas de succès."""
     res = parsePointSet(POINTSET_VALID)
-    assert isinstance(res, list)
+    assert isinstance(res, PointSet)
+    assert res.coords.tolist() == [0.0, 0.0, 1.0, 0.0, 0.0, 1.0]
     assert len(res) == 3
+    assert bytes(res) == POINTSET_VALID
 
-# --- Tests de performance ---
-@pytest.mark.perf
-def test_perf_parse_small():
-    """Test les perfommances en cas de petit dataset."""
-    data = POINTSET_VALID
-    start = time.time()
-    with contextlib.suppress(Exception):
-        parsePointSet(data)
-    end = time.time()
-    assert (end - start) < 0.05
-    
-@pytest.mark.perf
-def test_perf_parse_medium():
-    """Test les perfommances en cas de moyen dataset."""
-    data = POINTSET_VALID*20
-    start = time.time()
-    with contextlib.suppress(Exception):
-        parsePointSet(data)
-    end = time.time()
-    assert (end - start) < 0.10
-
-@pytest.mark.perf
-def test_perf_parse_large():
-    """Test les perfommances en cas de gros dataset."""
-    data = POINTSET_VALID*200
-    start = time.time()
-    with contextlib.suppress(Exception):
-        parsePointSet(data)
-    end = time.time()
-    assert (end - start) < 0.20
\ No newline at end of file
+
+def test_parsePointSet_validation_summary():
+    """Test la boîte englobante, les doublons et le témoin calculés au décodage."""
+    coords = [2, 2, 2, 2, 2, 5, 2, 2, -1, 3, 4, 0]
+    res = parsePointSet(struct.pack('<I', 6) + struct.pack('<12f', *coords))
+    assert res.bbox == (-1.0, 0.0, 4.0, 5.0)
+    assert res.duplicates == 2
+    # Le premier point distinct de p0 est p2, p3 est aligné avec eux
+    assert res.witness == (0, 2, 4)
+
+
+def test_parsePointSet_degenerate():
+    """Test l'apparition d'erreur.
+
+    lorsque que le pointset a moins de trois points ou des points alignés.
+    """
+    for coords in ([0, 0, 1, 1], [0, 0, 1, 1, 2, 2, 3, 3], [5, 0, 5, 1, 5, 2]):
+        data = struct.pack('<I', len(coords) // 2) + struct.pack(
+            f'<{len(coords)}f', *coords)
+        with pytest.raises(Exception) as exc:
+            parsePointSet(data)
+        assert "INVALID_POINTSET" in str(exc.value)
+
+def test_parsePointSet_inf_coordinates():
+    """Test l'apparition d'erreur.
+     
+    lorsque que des coordonnées infinies se compensent dans le lot.
+    """
+    header = struct.pack('<I', 2)
+    point_data = struct.pack('<ffff', float('inf'), 0.0, float('-inf'), 0.0)
+    with pytest.raises(Exception) as exc:
+        parsePointSet(header + point_data)
+    assert "DECODE_ERROR" in str(exc.value)
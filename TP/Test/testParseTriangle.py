@@ -3,12 +3,19 @@
 Ce module gère les tests de la fonction ParseTriangle défini dans triangulation.py
 """
 import struct
-import time
+import zlib
+from array import array
 from unittest.mock import patch
 
 import pytest
 
-from triangulation import parseTriangle
+from triangulation import (
+    compressChunks,
+    decodeTriangles,
+    decodeVarints,
+    parseTriangle,
+    streamTriangle,
+)
 
 POINTSET_VALID = (
     b"\x03\x00\x00\x00"
@@ -24,90 +31,152 @@ def test_parseTriangle_invalid_pointset_format():
     lorsque que le format du pointset est invalide.
     """
     with pytest.raises(Exception) as exc:
-        parseTriangle(b"\x01", [])
+        parseTriangle(b"\x01", array('I'))
     assert "INVALID_POINTSET_BYTE_FORMAT" in str(exc.value)
 
+    with pytest.raises(Exception) as exc:
+        parseTriangle(POINTSET_VALID[:-1], array('I'))
+    assert "INVALID_POINTSET_BYTE_FORMAT" in str(exc.value)
 
-def test_parseTriangle_invalid_triangle_coordinates():
+
+def test_parseTriangle_invalid_triangle_index():
     """Test l'apparition d'erreur.
     
-    lorsque que les coordonnées des points du triangles sont invalides.
+    lorsque qu'un triangle référence un point inexistant.
     """
     with pytest.raises(Exception) as exc:
-        parseTriangle(POINTSET_VALID, [((0, 0), (9999999999999, 1), (1, 1))])
+        parseTriangle(POINTSET_VALID, array('I', [0, 1, 3]))
     assert "INVALID_TRIANGLE" in str(exc.value)
 
 
-def test_parseTriangle_colinear():
+def test_parseTriangle_incomplete_triangle():
     """Test l'apparition d'erreur.
     
-    lorsque que les points d'un triangle sont colinéaires.
+    lorsque que le nombre d'indices n'est pas un multiple de 3.
     """
-    tri = [((0, 0), (1, 1), (2, 2))]
     with pytest.raises(Exception) as exc:
-        parseTriangle(POINTSET_VALID, tri)
+        parseTriangle(POINTSET_VALID, array('I', [0, 1]))
     assert "INVALID_TRIANGLE" in str(exc.value)
 
 
-@patch("struct.pack", side_effect=Exception("encoding failed"))
-def test_parseTriangle_encoding_error(_):
+def test_parseTriangle_not_indices():
     """Test l'apparition d'erreur.
     
-    lorsque qu'une exception normale est renvoyé lors du parsing.
+    lorsque que les triangles ne sont pas donnés sous forme d'indices.
     """
     with pytest.raises(Exception) as exc:
         parseTriangle(POINTSET_VALID, [((0, 0), (1, 0), (0, 1))])
-    assert "ENCODING_ERROR" in str(exc.value)
+    assert "INVALID_TRIANGLE" in str(exc.value)
 
-@patch("struct.pack", side_effect=KeyError("encoding failed"))
-def test_parseTriangle_key_error(_):
+    with pytest.raises(Exception) as exc:
+        parseTriangle(POINTSET_VALID, [0, -1, 2])
+    assert "INVALID_TRIANGLE" in str(exc.value)
+
+
+@patch("struct.pack_into", side_effect=Exception("encoding failed"))
+def test_parseTriangle_encoding_error(_):
     """Test l'apparition d'erreur.
     
-    lorsque qu'une keyerror est renvoyé lors du parsing.
+    lorsque qu'une exception normale est renvoyé lors du parsing.
     """
     with pytest.raises(Exception) as exc:
-        parseTriangle(POINTSET_VALID, [((0, 0), (1, 0), (0, 1))])
-    assert "INVALID_TRIANGLE" in str(exc.value)
+        parseTriangle(POINTSET_VALID, array('I', [0, 1, 2]))
+    assert "ENCODING_ERROR" in str(exc.value)
     
-@patch("struct.pack", side_effect=struct.error("encoding failed"))
+@patch("struct.pack_into", side_effect=struct.error("encoding failed"))
 def test_parseTriangle_struct_error(_):
     """Test l'apparition d'erreur.
     
     lorsque qu'une struct.error est renvoyé lors du parsing.
     """
     with pytest.raises(Exception) as exc:
-        parseTriangle(POINTSET_VALID, [((0, 0), (1, 0), (0, 1))])
+        parseTriangle(POINTSET_VALID, array('I', [0, 1, 2]))
     assert "ENCODING_ERROR" in str(exc.value)
 
 def test_parseTriangle_success():
     """Test le comportement de la fonction en cas de succès."""
-    res = parseTriangle(POINTSET_VALID, [((0, 0), (1, 0), (0, 1))])
+    res = parseTriangle(POINTSET_VALID, array('I', [0, 1, 2]))
     assert isinstance(res, (bytes, bytearray))
+    assert res[:len(POINTSET_VALID)] == POINTSET_VALID
+    assert res[len(POINTSET_VALID):] == struct.pack('<IIII', 1, 0, 1, 2)
 
+def test_parseTriangle_list_indices():
+    """Test le comportement de la fonction avec une liste d'indices."""
+    res = parseTriangle(POINTSET_VALID, [0, 1, 2])
+    assert res[len(POINTSET_VALID):] == struct.pack('<IIII', 1, 0, 1, 2)
 
-# ---- Test de Performance ----
+def test_parseTriangle_duplicate_coordinates():
+    """Test le comportement de la fonction avec des points de mêmes coordonnées.
+    
+    les indices doivent être conservés tels quels.
+    """
+    data = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 0, 1, 0, 0)
+    res = parseTriangle(data, array('I', [3, 1, 2]))
+    assert res[len(data):] == struct.pack('<IIII', 1, 3, 1, 2)
+
+
+def test_streamTriangle_same_output():
+    """Test que le flux produit exactement le même binaire que parseTriangle."""
+    data = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 1, 1, 0, 1)
+    triangles = array('I', [0, 1, 2, 0, 2, 3])
+    size, chunks = streamTriangle(data, triangles, chunk_size=8)
+    chunks = list(chunks)
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    assert b"".join(chunks) == parseTriangle(data, triangles)
+    assert size == len(b"".join(chunks))
+
+
+def test_streamTriangle_eager_validation():
+    """Test l'apparition d'erreur.
+    
+    dès l'appel, avant la production du moindre morceau.
+    """
+    with pytest.raises(Exception) as exc:
+        streamTriangle(POINTSET_VALID, array('I', [0, 1, 5]))
+    assert "INVALID_TRIANGLE" in str(exc.value)
+
+
+def test_streamTriangle_delta_roundtrip():
+    """Test le codage delta des indices et son décodage."""
+    data = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 1, 1, 0, 1)
+    triangles = array('I', [0, 1, 2, 0, 2, 3])
+    size, chunks = streamTriangle(data, triangles, chunk_size=5, vertices=False,
+                                  delta=True)
+    encoded = b"".join(chunks)
+    assert size is None
+    # Écarts 0, 1, 1, -2, 2, 1 : un octet chacun
+    assert encoded == struct.pack('<I', 2) + bytes([0, 2, 2, 3, 4, 2])
+    assert decodeVarints(encoded, 6, 4) == (triangles, len(encoded))
+
+    with pytest.raises(Exception) as exc:
+        decodeVarints(encoded[:-1], 6, 4)
+    assert "DECODE_ERROR" in str(exc.value)
 
-def test_parseTriangle_perf_small():
-    """Test les perfommances en cas de petit dataset."""
-    start = time.time()
-    parseTriangle(POINTSET_VALID, [((0, 0), (1, 0), (0, 1))])
-    end = time.time()
-    assert (end - start) < 0.01
 
+def test_compressChunks():
+    """Test la compression à la volée d'un flux."""
+    chunks = [b"abc" * 100, b"", b"def" * 100]
+    compressed = b"".join(compressChunks(chunks, "gzip"))
+    assert zlib.decompress(compressed, 31) == b"".join(chunks)
+    with pytest.raises(ValueError):
+        list(compressChunks(chunks, "brotli"))
 
-def test_parseTriangle_perf_medium():
-    """Test les perfommances en cas de moyen dataset."""
-    triangles = [((0, 0), (1, 0), (0, 1))] * 100
-    start = time.time()
-    parseTriangle(POINTSET_VALID, triangles)
-    end = time.time()
-    assert (end - start) < 0.2
 
+def test_decodeTriangles_roundtrip():
+    """Test que decodeTriangles est l'inverse de parseTriangle."""
+    triangles = array('I', [0, 1, 2])
+    point_set_bytes, decoded = decodeTriangles(parseTriangle(POINTSET_VALID, triangles))
+    assert point_set_bytes == POINTSET_VALID
+    assert decoded == triangles
 
-def test_parseTriangle_perf_large():
-    """Test les perfommances en cas de gros dataset."""
-    triangles = [((0, 0), (1, 0), (0, 1))] * 2000
-    start = time.time()
-    parseTriangle(POINTSET_VALID, triangles)
-    end = time.time()
-    assert (end - start) < 5
\ No newline at end of file
+
+def test_decodeTriangles_invalid():
+    """Test l'apparition d'erreur.
+    
+    lorsque que le binaire Triangles est tronqué.
+    """
+    data = parseTriangle(POINTSET_VALID, array('I', [0, 1, 2]))
+    for truncated in (data[:2], data[:len(POINTSET_VALID) + 2], data[:-1]):
+        with pytest.raises(Exception) as exc:
+            decodeTriangles(truncated)
+        assert "DECODE_ERROR" in str(exc.value)
@@ -0,0 +1,54 @@
+"""Module de test pour le profilage.
+
+Ce module gère les tests des classes définies dans profiling.py
+"""
+import marshal
+
+from profiling import ProfileStore, Sampler, renderText
+
+
+def _work():
+    """Fonction profilée par les tests."""
+    return sum(range(1000))
+
+
+def test_sampler_bounds():
+    """Test les limites de profilages simultanés et d'intervalle."""
+    store = ProfileStore(4)
+    sampler = Sampler(rate=1.0, min_interval=0.0, max_concurrent=1)
+    session = sampler.start()
+    assert session is not None
+    # Place occupée : ni échantillonnage ni demande explicite
+    assert sampler.start() is None
+    assert sampler.start(forced=True) is None
+    session.finish(store)
+    session.finish(store)
+    assert store.ids() == [session.id]
+    assert sampler.start(forced=True) is not None
+
+    assert Sampler(rate=0.0, min_interval=0.0, max_concurrent=1).start() is None
+    spaced = Sampler(rate=1.0, min_interval=3600.0, max_concurrent=2)
+    assert spaced.start() is not None
+    assert spaced.start() is None
+    assert spaced.start(forced=True) is not None
+
+
+def test_profile_session_and_store():
+    """Test le profil produit et l'éviction des plus anciens."""
+    store = ProfileStore(2)
+    sampler = Sampler(rate=0.0, min_interval=0.0, max_concurrent=1)
+    ids = []
+    for _ in range(3):
+        session = sampler.start(forced=True)
+        with session.active():
+            _work()
+        _work()  # hors du bloc : non profilé
+        session.finish(store)
+        ids.append(session.id)
+
+    assert store.ids() == ids[1:]
+    assert store.get(ids[0]) is None
+    stats = marshal.loads(store.get(ids[2]))
+    calls = [v[0] for (_, _, name), v in stats.items() if name == "_work"]
+    assert calls == [1]
+    assert "_work" in renderText(store.get(ids[2]))
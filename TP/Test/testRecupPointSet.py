@@ -3,11 +3,16 @@
 Ce module gère les tests de la fonction RecupPointSet défini dans triangulation.py
 """
 import contextlib
+import http.server
+import io
+import struct
+import threading
 import time
 from unittest.mock import patch
 
 import pytest
 
+import triangulation
 from triangulation import recupPointSet
 
 # --- Tests de comportement ---
@@ -24,7 +29,7 @@ def test_recupPointSet_invalid_id_format():
     assert "INVALID_ID_FORMAT" in str(exc.value)
 
 
-@patch("triangulation.requests.get")
+@patch("triangulation._session.get")
 def test_recupPointSet_pointset_not_found(mock_get):
     """Test l'apparition d'erreur.
     
@@ -36,7 +41,7 @@ def test_recupPointSet_pointset_not_found(mock_get):
     assert "NO_POINTSET_FOUND" in str(exc.value)
 
 
-@patch("triangulation.requests.get")
+@patch("triangulation._session.get")
 def test_recupPointSet_no_response_server(mock_get):
     """Test l'apparition d'erreur.
     
@@ -48,15 +53,73 @@ def test_recupPointSet_no_response_server(mock_get):
     assert "NO_RESPONSE_SERVEUR" in str(exc.value)
 
 
-@patch("triangulation.requests.get")
+@patch("triangulation._session.get")
 def test_recupPointSet_success(mock_get):
     """Test le comportement de la fonction en cas de succès."""
     mock_get.return_value.status_code = 200
+    mock_get.return_value.headers = {}
     mock_get.return_value.content = b"\x00\x01"
     res = recupPointSet(VALID_UUID)
     assert res == b"\x00\x01"
+
+@patch("triangulation._session.get")
+def test_recupPointSet_streamed_body(mock_get):
+    """Test la lecture en flux du corps lorsque sa taille est annoncée."""
+    body = bytes(range(256)) * 1000
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.headers = {"Content-Length": str(len(body))}
+    mock_get.return_value.raw = io.BytesIO(body)
+    res = recupPointSet(VALID_UUID)
+    assert res == body
+    mock_get.return_value.close.assert_called_once()
+
+@patch("triangulation._session.get")
+def test_recupPointSet_conditional(mock_get):
+    """Test la requête conditionnelle : validateurs envoyés puis mis à jour."""
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.headers = {"ETag": '"v2"'}
+    mock_get.return_value.content = b"\x00\x01"
+    validators = {"etag": '"v1"', "last_modified": "Sat, 17 Oct 2026 10:00:00 GMT"}
+    assert recupPointSet(VALID_UUID, validators=validators) == b"\x00\x01"
+    assert mock_get.call_args.kwargs["headers"] == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Sat, 17 Oct 2026 10:00:00 GMT"
+    }
+    assert validators == {"etag": '"v2"', "last_modified": None}
+
+    mock_get.return_value.status_code = 304
+    assert recupPointSet(VALID_UUID, validators=validators) is None
+    # Sans validateur, un 304 n'est pas attendu
+    with pytest.raises(Exception) as exc:
+        recupPointSet(VALID_UUID)
+    assert "NO_RESPONSE_SERVEUR" in str(exc.value)
+
+@patch("triangulation._session.get")
+def test_recupPointSet_truncated_body(mock_get):
+    """Test l'apparition d'erreur.
+    
+    lorsque que le corps reçu est plus court que la taille annoncée.
+    """
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.headers = {"Content-Length": "10"}
+    mock_get.return_value.raw = io.BytesIO(b"\x00\x01")
+    with pytest.raises(Exception) as exc:
+        recupPointSet(VALID_UUID)
+    assert "NO_RESPONSE_SERVEUR" in str(exc.value)
+
+def test_configureSession():
+    """Test la configuration du pool de connexions partagé."""
+    previous = triangulation._session
+    try:
+        session = triangulation.configureSession(pool_size=3, retries=4, backoff=0.5)
+        assert triangulation._session is session
+        adapter = session.get_adapter("http://pointset_manager:8080")
+        assert adapter._pool_maxsize == 3
+        assert adapter.max_retries.total == 4
+        assert adapter.max_retries.backoff_factor == 0.5
+    finally:
+        triangulation._session = previous
     
-@patch("triangulation.requests.get")
+@patch("triangulation._session.get")
 def test_recupPointSet_generic_http_error(mock_get):
     """Test l'apparition d'erreur.
     
@@ -75,4 +138,42 @@ def test_recupPointSet_perf_small():
     with contextlib.suppress(Exception):
         recupPointSet("1")
     end = time.time()
-    assert (end - start) < 0.20
\ No newline at end of file
+    assert (end - start) < 0.20
+
+
+class _StubPointSetManager(http.server.BaseHTTPRequestHandler):
+    """Faux PointSetManager local renvoyant toujours le même PointSet."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = struct.pack('<I', 1000) + b"\x00" * 8000
+
+    def do_GET(self):  # noqa: N802
+        """Répond au GET /pointset/{id}."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        """Désactive les logs du serveur."""
+
+
+def test_recupPointSet_local_stub():
+    """Test la récupération par le pool keep-alive sur un stub local.
+
+    La comparaison des durées avec une connexion par requête est mesurée
+    par le banc (étapes recup_pooled et recup_fresh de bench/harness.py).
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubPointSetManager)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/pointset"
+    try:
+        with patch("triangulation.POINT_SET_MANAGER_URL", url):
+            for _ in range(3):
+                res = recupPointSet(VALID_UUID)
+                assert res == _StubPointSetManager.body
+    finally:
+        server.shutdown()
+        server.server_close()
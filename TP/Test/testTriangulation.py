@@ -2,13 +2,28 @@
 
 Ce module gère les tests de la fonction Triangulation défini dans triangulation.py
 """
-import contextlib
-import time
+import random
+import struct
+import sys
+import threading
+from array import array
 from unittest.mock import patch
 
 import pytest
 
-from triangulation import triangulation
+from triangulation import (
+    IncrementalTriangulation,
+    PointLocator,
+    PointSet,
+    Triangulation,
+    _in_circle,
+    computeNeighbours,
+    decodeTriangles,
+    hilbertOrder,
+    parsePointSet,
+    parseTriangle,
+    triangulation,
+)
 
 
 def test_triangulation_not_enough_points():
@@ -38,6 +53,18 @@ def test_triangulation_colinear_points():
         triangulation(pts)
     assert "INVALID_POINTSET" in str(exc.value)
 
+    # Les deux premiers points sont confondus : l'alignement est jugé à
+    # partir du premier point distinct
+    assert len(triangulation([(0, 0), (0, 0), (1, 0), (0, 1)])) == 3
+
+
+def test_triangulation_skips_revalidation():
+    """Test qu'un PointSet décodé n'est pas revalidé."""
+    points = parsePointSet(struct.pack('<I', 3) + struct.pack('<6f', 0, 0, 1, 0, 0, 1))
+    with patch("triangulation._validatePoints") as mock_validate:
+        assert len(triangulation(points)) == 3
+    mock_validate.assert_not_called()
+
 
 def test_triangulation_invalid_coordinates():
     """Test l'apparition d'erreur.
@@ -59,7 +86,7 @@ def test_triangulation_bad_points_type():
         triangulation(pts)
     assert "INVALID_POINT" in str(exc.value)
     
-@patch("triangulation._add_triangle", side_effect=Exception("Internal Error"))
+@patch("triangulation._delaunay", side_effect=Exception("Internal Error"))
 def test_triangulation_internal_error(_):
     """Test l'apparition d'erreur.
     
@@ -70,37 +97,302 @@ def test_triangulation_internal_error(_):
         triangulation(pts)
     assert "ERROR_TRIANGULATION" in str(exc.value)
 
+@patch("triangulation._add_triangle", side_effect=Exception("Internal Error"))
+def test_triangulation_fan_internal_error(_):
+    """Test l'apparition d'erreur.
+    
+    lorsque une erreur arrive lors de la triangulation en éventail.
+    """
+    pts = [(0, 0), (1, 0), (0, 1)] 
+    with pytest.raises(Exception) as exc:
+        triangulation(pts, method="fan")
+    assert "ERROR_TRIANGULATION" in str(exc.value)
+
 def test_triangulation_success():
     """Test le comportement de la fonction en cas de succès."""
     res = triangulation([(0, 0), (1, 0), (0, 1)])
-    assert isinstance(res, list)
-    assert len(res) >= 1
-
-# --- Tests de performance ---
-@pytest.mark.perf
-def test_perf_triangulation_small():
-    """Test les perfommances en cas de petit dataset."""
-    points = [(i, i % 10) for i in range(10)]
-    start = time.time()
-    with contextlib.suppress(Exception):
-        triangulation(points)
-    end = time.time()
-    assert (end - start) < 0.10
-@pytest.mark.perf
-def test_perf_triangulation_medium():
-    """Test les perfommances en cas de moyen dataset."""
-    points = [(i, i % 100) for i in range(1000)]
-    start = time.time()
-    with contextlib.suppress(Exception):
-        triangulation(points)
-    end = time.time()
-    assert (end - start) < 0.50
-@pytest.mark.perf
-def test_perf_triangulation_large():
-    """Test les perfommances en cas de gros dataset."""
-    points = [(i, i % 1000) for i in range(10000)]
-    start = time.time()
-    with contextlib.suppress(Exception):
-        triangulation(points)
-    end = time.time()
-    assert (end - start) < 10.0
\ No newline at end of file
+    assert isinstance(res, array)
+    assert res.typecode == 'I'
+    assert sorted(res) == [0, 1, 2]
+
+def test_triangulation_from_parsed_array():
+    """Test le comportement de la fonction sur la sortie de parsePointSet."""
+    res = triangulation(array('f', [0, 0, 1, 0, 0, 1]))
+    assert sorted(res) == [0, 1, 2]
+
+def test_triangulation_from_parsed_array_invalid():
+    """Test l'apparition d'erreur.
+    
+    lorsque le tableau de coordonnées est trop court ou non fini.
+    """
+    with pytest.raises(Exception) as exc:
+        triangulation(array('f', [0, 0, 1, 0]))
+    assert "INVALID_POINTSET" in str(exc.value)
+
+    with pytest.raises(Exception) as exc:
+        triangulation(array('f', [0, 0, 1, 0, float('inf'), 1]))
+    assert "INVALID_POINT" in str(exc.value)
+
+def test_triangulation_unknown_method():
+    """Test l'apparition d'erreur.
+    
+    lorsque l'algorithme demandé n'existe pas.
+    """
+    with pytest.raises(ValueError):
+        triangulation([(0, 0), (1, 0), (0, 1)], method="inconnu")
+
+def test_triangulation_fan():
+    """Test le comportement de l'algorithme en éventail."""
+    pts = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    res = triangulation(pts, method="fan")
+    assert res.tolist() == [0, 1, 2, 0, 2, 3]
+
+def test_triangulation_delaunay_empty_circumcircle():
+    """Test la propriété de Delaunay.
+    
+    aucun point ne doit se trouver dans le cercle circonscrit d'un triangle.
+    """
+    rng = random.Random(42)
+    pts = [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(60)]
+    res = triangulation(pts)
+    for t in range(0, len(res), 3):
+        a, b, c = (pts[i] for i in res[t:t + 3])
+        for p in pts:
+            assert not _in_circle(a[0], a[1], b[0], b[1], c[0], c[1], p[0], p[1])
+
+def test_triangulation_delaunay_triangle_count():
+    """Test le nombre de triangles d'une triangulation complète.
+    
+    pour n points dont h sur l'enveloppe convexe, on attend 2n - 2 - h triangles.
+    """
+    # Carré 10x10 (36 points sur l'enveloppe) et un point central décalé
+    pts = [(float(x), float(y)) for x in range(10) for y in range(10)]
+    pts.append((4.25, 4.75))
+    res = triangulation(pts)
+    assert len(res) // 3 == 2 * len(pts) - 2 - 36
+
+def test_triangulation_delaunay_duplicates():
+    """Test le comportement de la fonction avec des points dupliqués."""
+    pts = [(0, 0), (1, 0), (0, 1), (1, 0), (0, 0)]
+    res = triangulation(pts)
+    assert len(res) == 3
+
+
+def test_triangulation_delaunay_scale_invariant():
+    """Test que tous les points sont utilisés, quelle que soit l'échelle."""
+    rng = random.Random(0)
+    unit = [(rng.random(), rng.random()) for _ in range(500)]
+    for scale in (1e-30, 1.0, 1e30):
+        res = triangulation([(x * scale, y * scale) for x, y in unit])
+        assert len(set(res)) == len(unit)
+
+
+def test_pointset_triangulation_containers():
+    """Test les conteneurs compacts PointSet et Triangulation."""
+    pts = [(0, 0), (1, 0), (0, 1), (1, 1)]
+    point_set = PointSet.fromPoints(pts)
+    assert len(point_set) == 4
+    assert not hasattr(point_set, "__dict__")
+    assert bytes(point_set) == struct.pack('<I8f', 4, *(c for p in pts for c in p))
+    view = point_set.buffer()
+    assert view.readonly
+    assert view == bytes(point_set)
+    assert view.obj is point_set.data
+    if sys.version_info >= (3, 12):
+        assert memoryview(point_set) == bytes(point_set)
+
+    result = Triangulation.compute(point_set)
+    assert not hasattr(result, "__dict__")
+    assert result.points is point_set
+    assert len(result) == 2
+    assert result.triangles.typecode == 'I'
+    assert bytes(result) == parseTriangle(bytes(point_set), result.triangles)
+    indices = result.buffer()
+    assert indices.readonly
+    assert (indices.format, indices.itemsize) == ('I', 4)
+    assert indices.tolist() == result.triangles.tolist()
+    assert PointSet.fromPoints(array('f', [0, 0, 1, 0, 0, 1])).witness == (0, 1, 2)
+
+
+def _triangle_set(triangles):
+    """Ensemble des triangles, indépendamment de l'ordre des sommets."""
+    return {frozenset(triangles[i:i + 3]) for i in range(0, len(triangles), 3)}
+
+
+def test_parallel_matches_serial_triangulation():
+    """Test la triangulation par bandes contre le moteur série."""
+    rng = random.Random(3)
+    pts = [(rng.random(), rng.gauss(0, 1)) for _ in range(3000)]
+    point_set = PointSet.fromPoints(pts)
+    with patch("triangulation.PARALLEL_MIN_POINTS", 100):
+        parallel = Triangulation.compute(point_set, workers=3)
+        assert _triangle_set(parallel.triangles) == _triangle_set(triangulation(pts))
+        assert parallel.halfedges is None
+        assert len(computeNeighbours(parallel.triangles)) == 3 * len(parallel)
+
+        # Doublons : le calcul reste en série, pour garder les mêmes indices
+        pts.append(pts[0])
+        duplicated = Triangulation.compute(PointSet.fromPoints(pts), workers=3)
+        assert duplicated.halfedges is not None
+
+
+def test_hilbert_order():
+    """Test le parcours de la courbe de Hilbert sur une grille 16 x 16."""
+    coords = [float(v) for i in range(256) for v in (i % 16, i // 16)]
+    order = hilbertOrder(coords)
+    assert sorted(order) == list(range(256))
+    # Deux points consécutifs sont voisins sur la grille
+    for a, b in zip(order, order[1:], strict=False):
+        assert abs(coords[2 * a] - coords[2 * b]) + abs(
+            coords[2 * a + 1] - coords[2 * b + 1]) == 1
+    assert hilbertOrder([]) == array('I')
+
+
+def test_triangulation_reorder():
+    """Test que le tri préalable garde les indices de l'ordre d'origine."""
+    rng = random.Random(4)
+    pts = [(rng.gauss(0, 1), rng.gauss(0, 1)) for _ in range(500)]
+    pts.append(pts[7])
+    plain = Triangulation.compute(pts)
+    sorted_first = Triangulation.compute(pts, reorder=True)
+    assert _triangle_set(sorted_first.triangles) == _triangle_set(plain.triangles)
+    assert sorted_first.neighbours() == computeNeighbours(sorted_first.triangles)
+
+
+def test_incremental_matches_full_triangulation():
+    """Test l'insertion incrémentale contre un recalcul complet."""
+    rng = random.Random(1)
+    pts = [(rng.random(), rng.random()) for _ in range(300)]
+    extra = [(rng.uniform(-0.5, 1.5), rng.uniform(-0.5, 1.5)) for _ in range(100)]
+
+    inc = IncrementalTriangulation(Triangulation.compute(pts))
+    inc.extend(extra)
+    expected = triangulation(pts + extra)
+    assert _triangle_set(inc.triangles) == _triangle_set(expected)
+
+    # Demi-arêtes cohérentes après les retournements
+    for e, f in enumerate(inc.halfedges):
+        if f != -1:
+            assert inc.halfedges[f] == e
+            assert inc.triangles[e] == inc.triangles[f - f % 3 + (f + 1) % 3]
+
+    vertices, triangles = decodeTriangles(bytes(inc))
+    assert vertices == bytes(PointSet.fromPoints(pts + extra))
+    assert triangles == inc.triangles
+
+
+def test_incremental_degenerate_insertions():
+    """Test les insertions sur une arête, sur un sommet et hors de l'enveloppe."""
+    grid = [(x, y) for x in range(5) for y in range(5)]
+    # Triangles de départ fournis explicitement, dans les deux orientations
+    seed = array('I')
+    for x in range(4):
+        for y in range(4):
+            i = 5 * x + y
+            seed.extend((i, i + 5, i + 6, i, i + 1, i + 6))
+    inc = IncrementalTriangulation(grid, seed)
+
+    assert inc.insert(0.5, 0) == 25    # arête de l'enveloppe
+    assert inc.insert(1.5, 1.5) == 26  # arête intérieure
+    duplicate = inc.insert(2, 2)       # sommet existant
+    inc.insert(5, 2)                   # hors de l'enveloppe
+    inc.insert(2, -3)
+
+    assert duplicate not in inc.triangles
+    c = inc.coords
+    area = 0.0
+    for t in range(0, len(inc.triangles), 3):
+        a, b, d = inc.triangles[t:t + 3]
+        cross = ((c[2 * b] - c[2 * a]) * (c[2 * d + 1] - c[2 * a + 1])
+                 - (c[2 * d] - c[2 * a]) * (c[2 * b + 1] - c[2 * a + 1]))
+        assert cross != 0
+        area += abs(cross) / 2
+    assert area == 16 + 2 + 6
+
+
+def test_incremental_errors():
+    """Test l'apparition d'erreur.
+
+    lorsque que le point inséré ou les triangles de départ sont invalides.
+    """
+    inc = IncrementalTriangulation([(0, 0), (1, 0), (0, 1)])
+    with pytest.raises(Exception) as exc:
+        inc.insert(float('nan'), 0)
+    assert "INVALID_POINT" in str(exc.value)
+
+    with pytest.raises(Exception) as exc:
+        IncrementalTriangulation([(0, 0), (1, 0), (0, 1)], [0, 1, 3])
+    assert "INVALID_TRIANGLE" in str(exc.value)
+
+
+def test_point_locator():
+    """Test la localisation de points contre un parcours de tous les triangles."""
+    rng = random.Random(3)
+    pts = [(rng.gauss(0, 1), rng.gauss(0, 1)) for _ in range(500)]
+    result = Triangulation.compute(pts, index=True)
+    assert isinstance(result.index, PointLocator)
+
+    coords, tri = result.points.coords, result.triangles
+
+    def contains(t, x, y):
+        a, b, c = tri[3 * t:3 * t + 3]
+        signs = {(coords[2 * v] - coords[2 * u]) * (y - coords[2 * u + 1])
+                 - (coords[2 * v + 1] - coords[2 * u + 1]) * (x - coords[2 * u]) > 0
+                 for u, v in ((a, b), (b, c), (c, a))}
+        return len(signs) == 1
+
+    probes = array('f', [rng.uniform(-4, 4) for _ in range(400)])
+    located = result.locate(probes)
+    assert len(located) == 200
+    for k, t in enumerate(located):
+        x, y = probes[2 * k], probes[2 * k + 1]
+        expected = [u for u in range(len(result)) if contains(u, x, y)]
+        assert (t in expected) if t != -1 else not expected
+
+    with pytest.raises(Exception) as exc:
+        result.index.locate(float('inf'), 0)
+    assert "INVALID_POINT" in str(exc.value)
+
+
+def test_point_locator_shared():
+    """Test que la localisation ne modifie pas la triangulation partagée."""
+    rng = random.Random(4)
+    result = Triangulation.compute(
+        [(rng.random(), rng.random()) for _ in range(300)], index=True
+    )
+    mesh = result.index._mesh
+    last = mesh._last
+    probes = [(rng.random(), rng.random()) for _ in range(200)]
+    expected = list(result.index.locateMany(probes))
+    assert mesh._last == last
+    assert mesh.locate(*probes[0], start=len(result) - 1) == expected[0]
+    assert mesh._last == last
+
+    # Requêtes concurrentes sur le même index : mêmes réponses qu'en série
+    located = [None] * 4
+
+    def worker(k):
+        located[k] = list(result.index.locateMany(probes))
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert located == [expected] * 4
+
+
+def test_triangulation_neighbours():
+    """Test les voisins issus de la triangulation contre ceux reconstruits."""
+    rng = random.Random(5)
+    result = Triangulation.compute([(rng.random(), rng.random()) for _ in range(200)])
+    neighbours = result.neighbours()
+    assert neighbours == computeNeighbours(result.triangles)
+
+    tri = result.triangles
+    for e, u in enumerate(neighbours):
+        if u != -1:
+            # Le voisin u partage l'arête e du triangle e // 3
+            edge = {tri[e], tri[e - e % 3 + (e + 1) % 3]}
+            assert u != e // 3
+            assert edge <= set(tri[3 * u:3 * u + 3])
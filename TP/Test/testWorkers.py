@@ -0,0 +1,129 @@
+"""Module de test pour le pool de processus.
+
+Ce module gère les tests de la classe TriangulationPool défini dans workers.py
+"""
+import random
+import struct
+import time
+from multiprocessing import shared_memory
+from unittest.mock import patch
+
+import pytest
+
+from triangulation import parsePointSet, triangulation
+from workers import TriangulationPool, _runJob
+
+SQUARE = struct.pack('<Iffffffff', 4, 0, 0, 1, 0, 1, 1, 0, 1)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Pool de deux processus partagé par les tests du module."""
+    pool = TriangulationPool(workers=2, queue_depth=2, timeout=30)
+    yield pool
+    pool.shutdown()
+
+
+def _random_pointset(n, seed=0):
+    """Génère le binaire d'un PointSet de n points aléatoires."""
+    rng = random.Random(seed)
+    coords = [rng.uniform(-1000, 1000) for _ in range(2 * n)]
+    return struct.pack(f'<I{2 * n}f', n, *coords)
+
+
+def test_pool_same_result_as_inline(pool):
+    """Test que le pool produit les mêmes triangles que le calcul direct."""
+    data = _random_pointset(500)
+    assert pool.run(data) == triangulation(parsePointSet(data))
+    assert pool.run(SQUARE) == triangulation(parsePointSet(SQUARE))
+
+
+def test_pool_halfedges(pool):
+    """Test que le pool renvoie les demi-arêtes du calcul, si demandées."""
+    data = _random_pointset(500)
+    triangles, halfedges = pool.run(data, halfedges=True)
+    assert (triangles, halfedges) == triangulation(
+        parsePointSet(data), halfedges=True
+    )
+    assert len(halfedges) == len(triangles)
+
+
+def test_run_job_halfedges_on_demand():
+    """Test que le processus ne calcule les demi-arêtes que si demandées."""
+    shm_in = shared_memory.SharedMemory(create=True, size=len(SQUARE))
+    shm_out = shared_memory.SharedMemory(create=True, size=4 * 6)
+    shm_half = shared_memory.SharedMemory(create=True, size=4 * 6)
+    try:
+        shm_in.buf[:len(SQUARE)] = SQUARE
+        with patch("triangulation.triangulation",
+                   wraps=triangulation) as mock_algo:
+            assert _runJob(shm_in.name, len(SQUARE), shm_out.name) == (2, False)
+            assert mock_algo.call_args.kwargs == {}
+            assert _runJob(shm_in.name, len(SQUARE), shm_out.name,
+                           shm_half.name) == (2, True)
+            assert mock_algo.call_args.kwargs == {"halfedges": True}
+    finally:
+        for shm in (shm_in, shm_out, shm_half):
+            shm.close()
+            shm.unlink()
+
+
+def test_pool_error_propagation(pool):
+    """Test que les erreurs levées dans un processus sont transmises."""
+    line = struct.pack('<Iffffff', 3, 0, 0, 1, 1, 2, 2)
+    with pytest.raises(Exception) as exc:
+        pool.run(line)
+    assert "INVALID_POINTSET" in str(exc.value)
+
+    with pytest.raises(Exception) as exc:
+        pool.run(b"\x01")
+    assert "INVALID_RESPONSE_FORMAT" in str(exc.value)
+
+    # En-tête annonçant plus de points que le binaire n'en contient : refusé
+    # avant d'allouer la mémoire de sortie
+    with pytest.raises(Exception) as exc:
+        pool.run(struct.pack('<I', 10**9))
+    assert "DECODE_ERROR" in str(exc.value)
+
+
+def test_pool_queue_full(pool):
+    """Test le refus immédiat d'un calcul quand la file est pleine."""
+    for _ in range(pool.workers + pool.queue_depth):
+        pool._slots.acquire()
+    try:
+        with pytest.raises(Exception) as exc:
+            pool.run(SQUARE)
+        assert "QUEUE_FULL" in str(exc.value)
+    finally:
+        for _ in range(pool.workers + pool.queue_depth):
+            pool._slots.release()
+    # Les emplacements libérés, le pool fonctionne de nouveau
+    assert len(pool.run(SQUARE)) == 6
+
+
+def test_pool_timeout():
+    """Test l'apparition d'erreur.
+    
+    lorsque que le calcul dépasse la durée maximale.
+    """
+    pool = TriangulationPool(workers=1, queue_depth=0, timeout=0.01)
+    try:
+        with pytest.raises(Exception) as exc:
+            pool.run(_random_pointset(50000))
+        assert "TRIANGULATION_TIMEOUT" in str(exc.value)
+
+        # Le calcul abandonné occupe toujours le processus : refus immédiat
+        # plutôt qu'une attente derrière lui
+        with pytest.raises(Exception) as exc:
+            pool.run(SQUARE)
+        assert "QUEUE_FULL" in str(exc.value)
+
+        # Emplacement rendu à la fin réelle du calcul
+        pool.timeout = 30
+        deadline = time.monotonic() + 60
+        while not pool._slots.acquire(timeout=0.05):
+            assert time.monotonic() < deadline
+        pool._slots.release()
+        assert len(pool.run(SQUARE)) == 6
+    finally:
+        pool.shutdown()
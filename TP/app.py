@@ -1,60 +1,776 @@
 """Serveur API Flask pour le service de Triangulation.
 
 Expose un endpoint GET /triangulation/{id} qui orchestre
-la récupération, le calcul et le renvoi des triangles.
+la récupération, le calcul et le renvoi des triangles, ainsi
+qu'un endpoint POST /triangulation/batch pour traiter plusieurs
+ids en un seul appel et un endpoint POST /triangulation/{id}/locate
+pour trouver le triangle contenant chacun d'un lot de points. Les
+métriques du service sont exposées sur GET /metrics, et les profils des
+requêtes profilées sur GET /profiles/{id}.
 """
-from flask import Flask, Response, jsonify
+import contextlib
+import hashlib
+import hmac
+import json
+import struct
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+from flask import Flask, Response, g, has_request_context, jsonify, request
+
+import metrics
+import profiling
 import triangulation
+from cache import ContentCache, DerivedCache, ResultCache, SingleFlight
+from errors import (
+    PointSetManagerUnavailableError,
+    TriangulatorError,
+    errorPayload,
+)
+from workers import TriangulationPool
+
+# Cache des triangulations : les PointSets sont immuables une fois
+# enregistrés, un même id donne donc toujours le même résultat.
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Dossier du niveau disque du cache (désactivé si None)
+CACHE_DISK_DIR = None
+# Cache indexé par le contenu : une même géométrie enregistrée sous
+# plusieurs ids n'est triangulée qu'une fois (désactivé si 0)
+CONTENT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Âge (s) au-delà duquel une triangulation en cache est revalidée auprès
+# du PointSetManager par une requête conditionnelle (jamais si None)
+CACHE_REVALIDATE_AFTER = 60.0
+# Endpoint par lot : nombre maximal d'ids par requête, de traitements
+# menés en parallèle, et d'entrées soumises d'avance par une même requête
+# (calculées ou en cours, en attente d'être envoyées)
+BATCH_MAX_SIZE = 10000
+BATCH_WORKERS = 16
+BATCH_WINDOW = 32
+# Pool de processus pour le parsing et la triangulation (désactivé si 0,
+# le calcul se fait alors dans le thread de la requête) : nombre de
+# processus, nombre de calculs en attente acceptés et durée maximale (s)
+PROCESS_POOL_WORKERS = 0
+PROCESS_POOL_QUEUE_DEPTH = 32
+PROCESS_POOL_TIMEOUT = 30
+# Nombre d'index de localisation conservés (les plus récemment utilisés)
+LOCATOR_CACHE_SIZE = 32
+# Réponse avec bloc des voisins : type de contenu (à demander dans Accept
+# ou par ?adjacency=1) et nombre de blocs conservés
+ADJACENCY_MEDIA_TYPE = "application/vnd.triangulator.adjacency"
+NEIGHBOURS_CACHE_SIZE = 32
+# Taille (en octets) en dessous de laquelle une réponse n'est pas compressée
+COMPRESS_MIN_BYTES = 1024
+# Ajout de l'en-tête Server-Timing (durée des étapes) aux réponses
+SERVER_TIMING = True
+# Bornes des histogrammes : durées (s), tailles (octets), nombres de points
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(4 ** k for k in range(3, 16))
+POINTS_BUCKETS = (10, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+# Profilage de GET /triangulation : jeton attendu dans l'en-tête
+# d'administration (en-tête ignoré et /profiles fermé si None), proportion
+# de requêtes profilées par échantillonnage, durée minimale (s) entre deux
+# profilages échantillonnés, profilages simultanés et profils conservés
+PROFILE_HEADER = "X-Triangulator-Profile"
+PROFILE_ADMIN_TOKEN = None
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_MIN_INTERVAL = 60.0
+PROFILE_MAX_CONCURRENT = 1
+PROFILE_KEEP = 16
+# Étapes mesurées par le profileur
+PROFILED_STAGES = ("parse", "triangulate", "encode")
 
 app = Flask(__name__)
+result_cache = ResultCache(CACHE_MAX_BYTES, CACHE_DISK_DIR)
+content_cache = ContentCache(CONTENT_CACHE_MAX_BYTES)
+# Index de localisation et blocs des voisins, dérivés des entrées du cache
+locator_cache = DerivedCache(LOCATOR_CACHE_SIZE)
+neighbours_cache = DerivedCache(NEIGHBOURS_CACHE_SIZE)
+# Les requêtes simultanées sur un même id partagent un seul calcul
+in_flight = SingleFlight()
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS)
+triangulation_pool = None
+if PROCESS_POOL_WORKERS:
+    triangulation_pool = TriangulationPool(
+        PROCESS_POOL_WORKERS, PROCESS_POOL_QUEUE_DEPTH, PROCESS_POOL_TIMEOUT
+    )
+
+profile_store = profiling.ProfileStore(PROFILE_KEEP)
+profile_sampler = profiling.Sampler(
+    PROFILE_SAMPLE_RATE, PROFILE_MIN_INTERVAL, PROFILE_MAX_CONCURRENT
+)
+
+metrics_registry = metrics.Registry()
+stage_seconds = metrics_registry.register(metrics.Histogram(
+    "triangulator_stage_seconds", "Durée de chaque étape du traitement (s).",
+    STAGE_BUCKETS, ("stage",)
+))
+pointset_bytes = metrics_registry.register(metrics.Histogram(
+    "triangulator_pointset_bytes", "Taille des PointSets récupérés (octets).",
+    BYTES_BUCKETS
+))
+pointset_points = metrics_registry.register(metrics.Histogram(
+    "triangulator_pointset_points", "Nombre de points des PointSets triangulés.",
+    POINTS_BUCKETS
+))
+response_bytes = metrics_registry.register(metrics.Histogram(
+    "triangulator_response_bytes",
+    "Taille des réponses de GET /triangulation envoyées (octets).", BYTES_BUCKETS
+))
+requests_in_flight = metrics_registry.register(metrics.Gauge(
+    "triangulator_requests_in_flight",
+    "Requêtes en cours de traitement (hors envoi du corps).", ("endpoint",)
+))
+computations_in_flight = metrics_registry.register(metrics.Gauge(
+    "triangulator_computations_in_flight",
+    "Récupérations et triangulations en cours."
+))
+requests_total = metrics_registry.register(metrics.Counter(
+    "triangulator_requests_total", "Réponses envoyées, par code HTTP.",
+    ("endpoint", "status")
+))
+errors_total = metrics_registry.register(metrics.Counter(
+    "triangulator_errors_total", "Erreurs, par étape et code d'erreur.",
+    ("stage", "code")
+))
+content_lookups_total = metrics_registry.register(metrics.Counter(
+    "triangulator_content_cache_lookups_total",
+    "Recherches dans le cache indexé par le contenu, par résultat.", ("result",)
+))
+
+@contextlib.contextmanager
+def _stage(name):
+    """Mesure une étape du traitement.
+
+    La durée alimente l'histogramme des étapes et, dans une requête,
+    l'en-tête Server-Timing ; une erreur est comptée avec son étape. Dans
+    une requête profilée, les étapes de PROFILED_STAGES sont profilées.
+
+    Args:
+        name (str): nom de l'étape.
+
+    """
+    session = None
+    if has_request_context() and name in PROFILED_STAGES:
+        session = g.get("profile")
+    start = time.perf_counter()
+    try:
+        with session.active() if session else contextlib.nullcontext():
+            yield
+    except Exception as e:
+        # Erreur hors du service : son type, pour borner le nombre de séries
+        code = e.code if isinstance(e, TriangulatorError) else type(e).__name__
+        errors_total.inc(stage=name, code=code)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_seconds.observe(elapsed, stage=name)
+        if has_request_context() and "timings" in g:
+            g.timings.append((name, elapsed))
+
+
+def _timedChunks(chunks, session=None):
+    """Mesure la production d'une réponse envoyée en flux.
+
+    Le temps passé à produire les morceaux (encodage et compression, hors
+    attente du client) est compté comme étape « stream », et la taille
+    envoyée alimente l'histogramme des réponses.
+
+    Args:
+        chunks (iterable): morceaux de la réponse.
+        session (ProfileSession): profilage de la requête, étendu à la
+            production des morceaux, ou None.
+
+    Yields:
+        bytes: morceau suivant.
+
+    """
+    elapsed = 0.0
+    size = 0
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            with session.active() if session else contextlib.nullcontext():
+                chunk = next(chunks)
+        except StopIteration:
+            break
+        except Exception as e:
+            errors_total.inc(stage="stream", code=type(e).__name__)
+            raise
+        finally:
+            elapsed += time.perf_counter() - start
+        size += len(chunk)
+        yield chunk
+    stage_seconds.observe(elapsed, stage="stream")
+    response_bytes.observe(size)
+
+
+@app.before_request
+def _startRequest():
+    """Prépare le suivi de la requête courante."""
+    g.timings = []
+    requests_in_flight.inc(endpoint=request.endpoint or "unknown")
+
+
+@app.after_request
+def _finishRequest(response):
+    """Compte la réponse et y ajoute l'en-tête Server-Timing.
+
+    Args:
+        response (Response): la réponse produite.
+
+    Returns:
+        Response: la même réponse.
+
+    """
+    requests_total.inc(endpoint=request.endpoint or "unknown",
+                       status=response.status_code)
+    if SERVER_TIMING and g.get("timings"):
+        response.headers["Server-Timing"] = metrics.serverTiming(g.timings)
+    return response
+
+
+@app.teardown_request
+def _endRequest(_):
+    """Termine le suivi de la requête courante."""
+    requests_in_flight.dec(endpoint=request.endpoint or "unknown")
+
+
+def _computeTriangulation(pointSetId, dedupe=True):
+    """Récupère et triangule un PointSet, puis met le résultat en cache.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        dedupe (bool): reprend la triangulation d'un binaire identique
+            déjà calculée pour un autre id, si elle est en cache.
+
+    Returns:
+        tuple: (binaire du pointset, triangles, demi-arêtes).
+
+    """
+    validators = {}
+    with computations_in_flight.track():
+        # 1. Récupération
+        with _stage("recup"):
+            point_set_bytes = triangulation.recupPointSet(
+                pointSetId, validators=validators
+            )
+        return _triangulateBytes(pointSetId, point_set_bytes, validators, dedupe)
+
+
+def _triangulateBytes(pointSetId, point_set_bytes, validators, dedupe=True):
+    """Triangule un binaire PointSet récupéré, puis met le résultat en cache.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        point_set_bytes (bytes): binaire du pointset.
+        validators (dict): validateurs HTTP du binaire (voir recupPointSet).
+        dedupe (bool): reprend la triangulation d'un binaire identique
+            déjà calculée pour un autre id, si elle est en cache.
+
+    Returns:
+        tuple: (binaire du pointset, triangles, demi-arêtes).
+
+    """
+    pointset_bytes.observe(len(point_set_bytes))
+
+    if dedupe and CONTENT_CACHE_MAX_BYTES:
+        with _stage("dedupe"):
+            entry = content_cache.lookup(point_set_bytes)
+        content_lookups_total.inc(result="miss" if entry is None else "hit")
+        if entry is not None:
+            # Entrée partagée : les deux caches référencent les mêmes buffers
+            return _storeResult(pointSetId, *entry, validators)
+
+    if triangulation_pool is not None:
+        # 2 et 3. Parsing et calcul dans un processus du pool
+        with _stage("compute"):
+            triangles, halfedges = triangulation_pool.run(
+                point_set_bytes, halfedges=True
+            )
+    else:
+        # 2. Parsing, sans copie : le binaire lu n'appartient qu'au service
+        # et n'est plus modifié (les caches le conservent tel quel)
+        with _stage("parse"):
+            points = triangulation.parsePointSet(point_set_bytes, copy=False)
+
+        # 3. Calcul
+        with _stage("triangulate"):
+            triangles, halfedges = triangulation.triangulation(
+                points, halfedges=True
+            )
+    pointset_points.observe((len(point_set_bytes) - 4) // 8)
+    if CONTENT_CACHE_MAX_BYTES:
+        content_cache.add(point_set_bytes, triangles, halfedges)
+    return _storeResult(
+        pointSetId, point_set_bytes, triangles, halfedges, validators
+    )
+
+
+def _storeResult(pointSetId, point_set_bytes, triangles, halfedges, validators,
+                 tag=None):
+    """Met une triangulation en cache avec ses validateurs et son ETag.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        point_set_bytes (bytes): binaire du pointset.
+        triangles (array): indices à plat des triangles.
+        halfedges (array|None): demi-arêtes opposées des triangles.
+        validators (dict): validateurs HTTP du binaire (voir recupPointSet).
+        tag (str|None): ETag déjà connu de la triangulation.
+
+    Returns:
+        tuple: l'entrée (binaire du pointset, triangles, demi-arêtes).
+
+    """
+    meta = _resultMeta(point_set_bytes, triangles, validators, tag)
+    return result_cache.put(
+        pointSetId, point_set_bytes, triangles, halfedges, meta=meta
+    )
+
+
+def _resultMeta(point_set_bytes, triangles, validators, tag=None):
+    """Renvoie les métadonnées d'une entrée du cache, vérifiée à l'instant.
+
+    Args:
+        point_set_bytes (bytes): binaire du pointset.
+        triangles (array): indices à plat des triangles.
+        validators (dict): validateurs HTTP du binaire (voir recupPointSet).
+        tag (str|None): ETag déjà connu de la triangulation.
+
+    Returns:
+        dict: validateurs, date de vérification et ETag de l'entrée.
+
+    """
+    return {
+        "etag": validators.get("etag"),
+        "last_modified": validators.get("last_modified"),
+        "checked": time.monotonic(),
+        "tag": tag or _entityTag(point_set_bytes, triangles),
+    }
+
+
+def _isStale(pointSetId, entry):
+    """Indique si une entrée du cache doit être revalidée.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        entry (tuple): entrée lue dans le cache.
+
+    Returns:
+        bool: True si la dernière vérification date de plus de
+        CACHE_REVALIDATE_AFTER secondes (ou est inconnue, par exemple
+        pour une entrée relue sur disque).
+
+    """
+    if CACHE_REVALIDATE_AFTER is None:
+        return False
+    meta = result_cache.meta(pointSetId, entry)
+    return meta is None or time.monotonic() - meta["checked"] >= CACHE_REVALIDATE_AFTER
+
+
+def _revalidate(pointSetId, entry):
+    """Vérifie auprès du PointSetManager qu'une entrée du cache est à jour.
+
+    La requête est conditionnelle : un 304 (ou un binaire identique, sans
+    validateur connu) confirme l'entrée sans nouveau calcul ni écriture sur
+    disque : seules ses métadonnées sont remplacées. Si le PointSetManager
+    est indisponible, l'entrée est servie telle quelle et n'est revérifiée
+    qu'après un nouveau délai CACHE_REVALIDATE_AFTER, sans attendre le
+    PointSetManager à chaque requête.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        entry (tuple): entrée lue dans le cache.
+
+    Returns:
+        tuple: (binaire du pointset, triangles, demi-arêtes), à jour.
+
+    """
+    point_set_bytes, triangles, halfedges = entry
+    meta = result_cache.meta(pointSetId, entry) or {}
+    validators = {"etag": meta.get("etag"), "last_modified": meta.get("last_modified")}
+    try:
+        with _stage("revalidate"):
+            body = triangulation.recupPointSet(pointSetId, validators=validators)
+    except PointSetManagerUnavailableError:
+        body = None
+    if body is None or body == point_set_bytes:
+        # 304 ou PointSetManager indisponible : validateurs inchangés
+        result_cache.touch(pointSetId, entry, _resultMeta(
+            point_set_bytes, triangles,
+            validators if body is not None else meta, meta.get("tag")
+        ))
+        return entry
+
+    # PointSet remplacé : nouvelle entrée (les valeurs dérivées de l'ancienne
+    # ne lui sont plus associées)
+    with computations_in_flight.track():
+        return _triangulateBytes(pointSetId, body, validators)
+
+
+def _resolveTriangulation(pointSetId):
+    """Renvoie la triangulation d'un PointSet, depuis le cache si possible.
+
+    Une entrée plus ancienne que CACHE_REVALIDATE_AFTER est d'abord
+    revalidée auprès du PointSetManager.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+
+    Returns:
+        tuple: (binaire du pointset, triangles, demi-arêtes).
+
+    """
+    with _stage("cache"):
+        entry = result_cache.get(pointSetId)
+    if entry is not None and _isStale(pointSetId, entry):
+        cached = entry
+        entry = in_flight.do(pointSetId, lambda: _revalidate(pointSetId, cached))
+    if entry is None:
+        # 1 à 3. Récupération, parsing et calcul (un seul par id à la fois)
+        entry = in_flight.do(pointSetId, lambda: _computeTriangulation(pointSetId))
+    return entry
+
+
+def _entityTag(point_set_bytes, triangles):
+    """Renvoie l'ETag d'une triangulation (empreinte du pointset et des indices).
+
+    Args:
+        point_set_bytes (bytes): binaire du pointset.
+        triangles (array): indices à plat des triangles.
+
+    Returns:
+        str: empreinte hexadécimale (BLAKE2b, 128 bits).
+
+    """
+    if not isinstance(triangles, array):
+        triangles = array('I', triangles)
+    digest = hashlib.blake2b(point_set_bytes, digest_size=16)
+    digest.update(triangles)
+    return digest.hexdigest()
+
+
+def _resolveLocator(pointSetId, entry):
+    """Renvoie l'index de localisation de la triangulation d'un PointSet.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        entry (tuple): (binaire du pointset, triangles, demi-arêtes).
+
+    Returns:
+        PointLocator: l'index, construit une fois par entrée du cache.
+
+    """
+    def build(entry):
+        point_set_bytes, triangles, halfedges = entry
+        result = triangulation.Triangulation(
+            triangulation.parsePointSet(point_set_bytes, copy=False),
+            triangles, halfedges
+        )
+        return triangulation.PointLocator(result)
+
+    return locator_cache.get(pointSetId, entry, build)
+
+
+def _resolveNeighbours(pointSetId, entry):
+    """Renvoie les voisins des triangles de la triangulation d'un PointSet.
+
+    Le cache conserve les demi-arêtes produites par le calcul : les voisins
+    en sont dérivés une fois par entrée, puis gardés ici.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        entry (tuple): (binaire du pointset, triangles, demi-arêtes).
+
+    Returns:
+        array: voisins des triangles (voir triangulation.computeNeighbours).
+
+    """
+    return neighbours_cache.get(
+        pointSetId, entry, lambda entry: triangulation.computeNeighbours(*entry[1:])
+    )
+
+
+def _isAdmin():
+    """Indique si la requête courante porte le jeton d'administration.
+
+    Returns:
+        bool: True si PROFILE_ADMIN_TOKEN est défini et reçu dans
+        l'en-tête PROFILE_HEADER.
+
+    """
+    token = request.headers.get(PROFILE_HEADER)
+    return (PROFILE_ADMIN_TOKEN is not None and token is not None
+            and hmac.compare_digest(token, PROFILE_ADMIN_TOKEN))
+
+
+def _wantsAdjacency():
+    """Indique si la requête courante demande le bloc des voisins.
+
+    Returns:
+        bool: True si ?adjacency=1 (ou true) ou si Accept le demande.
+
+    """
+    if request.args.get("adjacency", "").lower() in ("1", "true"):
+        return True
+    # Le type doit être cité explicitement (*/* ne suffit pas)
+    return ADJACENCY_MEDIA_TYPE in request.accept_mimetypes.values()
+
+
+def _responseLayout():
+    """Lit la forme de réponse demandée dans la requête courante.
+
+    Returns:
+        tuple: (vertices, delta) ; vertices est False pour ?vertices=0 (ou
+        false), delta est True pour ?indices=delta.
+
+    """
+    vertices = request.args.get("vertices", "").lower() not in ("0", "false")
+    delta = request.args.get("indices", "").lower() == "delta"
+    return vertices, delta
+
 
 @app.route('/triangulation/<pointSetId>', methods=['GET'])
 def get_triangulation(pointSetId):
     """Endpoint principal pour la triangulation.
 
-    Récupère un set de points, calcule la triangulation et retourne le binaire.
+    Récupère un set de points, calcule la triangulation et retourne le binaire,
+    suivi du bloc des voisins des triangles si la requête le demande. Le bloc
+    des sommets peut être omis (?vertices=0), les indices codés en varint
+    des différences (?indices=delta), et la réponse est compressée selon
+    Accept-Encoding ; le type de contenu en porte les paramètres.
+
+    La réponse porte un ETag faible (triangulation et présentation
+    demandée) ; une requête dont If-None-Match le cite reçoit un 304 sans
+    corps.
+
+    Une requête profilée (jeton d'administration ou échantillonnage) refait
+    le calcul sans passer par le cache ; l'identifiant du profil est
+    renvoyé dans l'en-tête PROFILE_HEADER-Id.
     """
+    session = g.profile = profile_sampler.start(forced=_isAdmin())
     try:
-        # 1. Récupération
-        point_set_bytes = triangulation.recupPointSet(pointSetId)
-        
-        # 2. Parsing
-        points = triangulation.parsePointSet(point_set_bytes)
-        
-        # 3. Calcul
-        triangles = triangulation.triangulation(points)
-        
-        # 4. Encodage
-        result_bytes = triangulation.parseTriangle(point_set_bytes, triangles)
-        
-        return Response(result_bytes, mimetype='application/octet-stream', status=200)
+        if session is not None:
+            point_set_bytes, triangles, _ = entry = _computeTriangulation(
+                pointSetId, dedupe=False
+            )
+        else:
+            point_set_bytes, triangles, _ = entry = _resolveTriangulation(
+                pointSetId
+            )
+        adjacency = _wantsAdjacency()
+        vertices, delta = _responseLayout()
+
+        # ETag : empreinte conservée avec l'entrée du cache, si elle y est
+        meta = result_cache.meta(pointSetId, entry)
+        tag = meta["tag"] if meta else _entityTag(point_set_bytes, triangles)
+        etag = f"{tag}-{int(vertices)}{int(delta)}{int(adjacency)}"
+        if session is None and request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag, weak=True)
+            response.vary.add("Accept-Encoding")
+            return response
+
+        neighbours = _resolveNeighbours(pointSetId, entry) if adjacency else None
+
+        # 4. Encodage (envoyé en flux, sans construire la réponse complète)
+        with _stage("encode"):
+            size, chunks = triangulation.streamTriangle(
+                point_set_bytes, triangles, neighbours=neighbours,
+                vertices=vertices, delta=delta
+            )
+
+        encoding = request.accept_encodings.best_match(triangulation.COMPRESSIONS)
+        if size is not None and size < COMPRESS_MIN_BYTES:
+            encoding = None
+        if encoding is not None:
+            chunks = triangulation.compressChunks(chunks, encoding)
+
+        mimetype = ADJACENCY_MEDIA_TYPE if adjacency else 'application/octet-stream'
+        params = {}
+        if not vertices:
+            params["vertices"] = "omitted"
+        if delta:
+            params["indices"] = "delta"
+        response = Response(_timedChunks(chunks, session), status=200)
+        response.mimetype = mimetype
+        response.mimetype_params.update(params)
+        response.vary.add("Accept-Encoding")
+        response.set_etag(etag, weak=True)
+        if encoding is not None:
+            response.content_encoding = encoding
+        elif size is not None:
+            response.content_length = size
+        if session is not None:
+            # Profil rangé une fois la réponse envoyée (ou abandonnée)
+            response.headers[f"{PROFILE_HEADER}-Id"] = session.id
+            response.call_on_close(lambda: session.finish(profile_store))
+        return response
 
     except Exception as e:
-        err_msg = str(e)
-        # Mapping des erreurs Python vers les codes HTTP
-        if err_msg == "INVALID_ID_FORMAT":
-            return jsonify({
-                "code": "INVALID_ID_FORMAT",
-                "message": "Invalid ID format"
-                }), 400
-        elif err_msg == "NO_POINTSET_FOUND":
-            return jsonify({
-                "code": "POINTSET_NOT_FOUND", 
-                "message": "PointSet not found"
-                }), 404
-        elif err_msg in ["INVALID_POINTSET", "INVALID_TRIANGLE", "INVALID_POINT"]:
-            return jsonify({
-                "code": "INVALID_REQUEST", 
-                "message": err_msg
-                }), 400
-        elif err_msg == "NO_RESPONSE_SERVEUR":
-            return jsonify({
-                "code": "SERVICE_UNAVAILABLE", 
-                "message": "PointSetManager unavailable"
-                }), 503
-        else:
-            return jsonify({
-                "code": "INTERNAL_ERROR", 
-                "message": err_msg
-                }), 500
\ No newline at end of file
+        if session is not None:
+            session.finish(profile_store)
+        payload, status = errorPayload(e)
+        return jsonify(payload), status
+
+
+def _batchEntry(pointSetId):
+    """Prépare une entrée de la réponse du lot.
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+
+    Returns:
+        tuple: (code HTTP, taille du contenu, morceaux du contenu) ; le contenu
+        est le binaire Triangles en cas de succès, l'erreur JSON sinon.
+
+    """
+    try:
+        point_set_bytes, triangles, _ = _resolveTriangulation(pointSetId)
+        with _stage("encode"):
+            size, chunks = triangulation.streamTriangle(point_set_bytes, triangles)
+        return 200, size, chunks
+    except Exception as e:
+        payload, status = errorPayload(e)
+        body = json.dumps(payload).encode()
+        return status, len(body), (body,)
+
+
+def _mapBounded(func, items, window):
+    """Applique func aux items dans batch_executor, avec une fenêtre bornée.
+
+    Contrairement à Executor.map, qui soumet tout d'un coup, au plus
+    window appels sont soumis d'avance : un lot ne monopolise pas
+    l'exécuteur partagé et ne garde pas tous ses résultats en mémoire en
+    attendant qu'ils soient envoyés.
+
+    Args:
+        func (callable): fonction appliquée à chaque item.
+        items (list): arguments successifs de func.
+        window (int): nombre maximal d'appels soumis et non encore lus.
+
+    Yields:
+        résultat de func pour chaque item, dans l'ordre des items.
+
+    """
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(batch_executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Flux interrompu (client déconnecté) : rien de plus n'est calculé
+        for future in pending:
+            future.cancel()
+
+
+def _iterBatch(entries, count):
+    """Génère la réponse du lot : nombre d'entrées puis chaque entrée encadrée.
+
+    Args:
+        entries (iterator): résultats de _batchEntry, dans l'ordre de la requête.
+        count (int): nombre d'entrées.
+
+    Yields:
+        bytes: morceau suivant de la réponse.
+
+    """
+    yield struct.pack('<I', count)
+    for status, size, chunks in entries:
+        yield struct.pack('<II', status, size)
+        yield from chunks
+
+
+@app.route('/triangulation/batch', methods=['POST'])
+def post_triangulation_batch():
+    """Endpoint de triangulation par lot.
+
+    Reçoit une liste d'UUID, récupère et triangule les PointSets en parallèle
+    et renvoie un flux binaire contenant, pour chaque id et dans l'ordre, son
+    code HTTP et son résultat (binaire Triangles ou erreur JSON).
+    """
+    body = request.get_json(silent=True)
+    ids = body.get("pointSetIds") if isinstance(body, dict) else None
+    if (not isinstance(ids, list)
+            or not all(isinstance(i, str) for i in ids)
+            or len(ids) > BATCH_MAX_SIZE):
+        return jsonify({
+            "code": "INVALID_REQUEST",
+            "message": f"Expected a JSON body {{\"pointSetIds\": [...]}} "
+                       f"with at most {BATCH_MAX_SIZE} ids"
+            }), 400
+
+    entries = _mapBounded(_batchEntry, ids, BATCH_WINDOW)
+    return Response(_iterBatch(entries, len(ids)),
+                    mimetype='application/octet-stream', status=200)
+
+
+@app.route('/triangulation/<pointSetId>/locate', methods=['POST'])
+def post_triangulation_locate(pointSetId):
+    """Endpoint de localisation de points dans une triangulation.
+
+    Reçoit un lot de points au format binaire PointSet et renvoie, pour
+    chacun, l'indice du triangle de GET /triangulation/{id} qui le
+    contient (-1 hors de l'enveloppe convexe).
+    """
+    try:
+        with _stage("decode"):
+            probes = triangulation.decodeProbes(request.get_data())
+        locator = _resolveLocator(pointSetId, _resolveTriangulation(pointSetId))
+        with _stage("locate"):
+            body = triangulation.encodeLocations(locator.locateMany(probes))
+        return Response(body, mimetype='application/octet-stream', status=200)
+
+    except Exception as e:
+        payload, status = errorPayload(e)
+        return jsonify(payload), status
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Endpoint des métriques du service, au format texte de Prometheus."""
+    return Response(metrics_registry.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route('/profiles', methods=['GET'])
+def get_profiles():
+    """Endpoint listant les profils conservés, du plus ancien au plus récent.
+
+    Réservé au jeton d'administration : sans PROFILE_ADMIN_TOKEN, les
+    profils (échantillonnés) ne sont pas exposés.
+    """
+    if not _isAdmin():
+        return jsonify({"code": "FORBIDDEN", "message": "Admin token required"}), 403
+    return jsonify({"profiles": profile_store.ids()})
+
+
+@app.route('/profiles/<profileId>', methods=['GET'])
+def get_profile(profileId):
+    """Endpoint de téléchargement d'un profil.
+
+    Renvoie le profil au format de pstats (lisible par pstats.Stats ou
+    snakeviz), ou son résumé texte avec ?format=text. Réservé au jeton
+    d'administration, comme /profiles.
+    """
+    if not _isAdmin():
+        return jsonify({"code": "FORBIDDEN", "message": "Admin token required"}), 403
+    data = profile_store.get(profileId)
+    if data is None:
+        return jsonify({
+            "code": "PROFILE_NOT_FOUND",
+            "message": "Profile not found"
+            }), 404
+    if request.args.get("format") == "text":
+        return Response(profiling.renderText(data), mimetype='text/plain')
+    response = Response(data, mimetype='application/octet-stream')
+    response.headers["Content-Disposition"] = (
+        f"attachment; filename=triangulation-{profileId}.prof"
+    )
+    return response
@@ -0,0 +1,383 @@
+"""Serveur ASGI (asyncio) pour le service de Triangulation.
+
+Variante asynchrone de app.py servant le même contrat GET
+/triangulation/{pointSetId} (voir triangulator.yml) : l'attente du
+PointSetManager ne bloque aucun thread, les connexions vers celui-ci
+sont conservées dans un pool keep-alive et le calcul est confié à un
+exécuteur, si bien qu'un seul processus peut garder des milliers de
+requêtes en cours.
+
+N'utilise que la bibliothèque standard ; se lance avec n'importe quel
+serveur ASGI, par exemple ``uvicorn asgi:application``.
+"""
+import asyncio
+import json
+import uuid
+from urllib.parse import urlsplit
+
+import triangulation
+from errors import (
+    InvalidIdError,
+    PointSetManagerUnavailableError,
+    PointSetNotFoundError,
+    errorPayload,
+)
+from workers import TriangulationPool
+
+# Pool de processus pour le parsing et la triangulation (désactivé si 0,
+# le calcul se fait alors dans l'exécuteur de threads par défaut)
+PROCESS_POOL_WORKERS = 0
+PROCESS_POOL_QUEUE_DEPTH = 32
+PROCESS_POOL_TIMEOUT = 30
+
+# Codes de réponse sans corps (RFC 9110) : lus sans attendre la fin du flux
+NO_BODY_STATUSES = (204, 304)
+
+
+class AsyncPointSetClient:
+    """Client HTTP/1.1 asynchrone vers le PointSetManager.
+
+    Les connexions sont réutilisées (keep-alive) et leur nombre est borné.
+
+    Attributes:
+        pool_size (int): nombre maximal de connexions simultanées.
+        timeout (float): durée maximale d'une requête, en secondes.
+
+    """
+
+    def __init__(self, pool_size=triangulation.POOL_SIZE,
+                 timeout=triangulation.FETCH_TIMEOUT):
+        """Initialise un client sans connexion ouverte.
+
+        Args:
+            pool_size (int): nombre maximal de connexions simultanées.
+            timeout (float): durée maximale d'une requête, en secondes.
+
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def get(self, url):
+        """Effectue un GET et renvoie le code HTTP et le corps de la réponse.
+
+        Args:
+            url (str): URL http:// à récupérer.
+
+        Returns:
+            tuple: (code HTTP, corps en bytes).
+
+        """
+        return await self.request("GET", url)
+
+    async def request(self, method, url):
+        """Effectue une requête sans corps et renvoie la réponse.
+
+        Args:
+            method (str): méthode HTTP (GET, HEAD...).
+            url (str): URL http:// demandée.
+
+        Returns:
+            tuple: (code HTTP, corps en bytes, vide pour HEAD, 204 et 304).
+
+        """
+        parts = urlsplit(url)
+        address = (parts.hostname, parts.port or 80)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        async with self._slots:
+            # Une connexion réutilisée peut avoir été fermée par le serveur
+            # entre-temps : on retente alors une fois sur une connexion neuve
+            conn = self._take(address)
+            if conn is not None:
+                try:
+                    return await self._exchange(address, conn, method, target)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    pass
+            conn = await asyncio.wait_for(
+                asyncio.open_connection(*address), self.timeout
+            )
+            self.connections_opened += 1
+            return await self._exchange(address, conn, method, target)
+
+    async def close(self):
+        """Ferme toutes les connexions inactives."""
+        idle, self._idle = self._idle, []
+        for _, (_, writer) in idle:
+            writer.close()
+
+    def _take(self, address):
+        """Retire du pool une connexion inactive vers address, si possible.
+
+        Args:
+            address (tuple): (hôte, port).
+
+        Returns:
+            tuple|None: (reader, writer) ou None.
+
+        """
+        while self._idle:
+            conn_address, conn = self._idle.pop()
+            if conn_address == address and not conn[1].is_closing():
+                return conn
+            conn[1].close()
+        return None
+
+    async def _exchange(self, address, conn, method, target):
+        """Envoie la requête sur conn et lit la réponse, avec délai maximal.
+
+        Args:
+            address (tuple): (hôte, port).
+            conn (tuple): (reader, writer).
+            method (str): méthode HTTP.
+            target (str): chemin de la ressource.
+
+        Returns:
+            tuple: (code HTTP, corps en bytes).
+
+        """
+        reader, writer = conn
+        try:
+            status, body, keep_alive = await asyncio.wait_for(
+                self._request(address, reader, writer, method, target),
+                self.timeout
+            )
+        except BaseException:
+            writer.close()
+            raise
+        if keep_alive:
+            self._idle.append((address, conn))
+        else:
+            writer.close()
+        return status, body
+
+    async def _request(self, address, reader, writer, method, target):
+        """Écrit la requête et lit la réponse complète.
+
+        Args:
+            address (tuple): (hôte, port).
+            reader (asyncio.StreamReader): flux de lecture.
+            writer (asyncio.StreamWriter): flux d'écriture.
+            method (str): méthode HTTP.
+            target (str): chemin de la ressource.
+
+        Returns:
+            tuple: (code HTTP, corps en bytes, connexion réutilisable).
+
+        """
+        host, port = address
+        writer.write(
+            f"{method} {target} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+            f"Connection: keep-alive\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+
+        # Réponses intermédiaires 1xx (sans corps) ignorées
+        status = 100
+        while 100 <= status < 200:
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionError("connection closed")
+            version, status = status_line.split()[:2]
+            status = int(status)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (version == b"HTTP/1.1"
+                      and headers.get("connection", "").lower() != "close")
+        if method == "HEAD" or status in NO_BODY_STATUSES:
+            # Aucun corps par définition, quels que soient les en-têtes
+            body = b""
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await _readChunked(reader)
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return status, body, keep_alive
+
+
+async def _readChunked(reader):
+    """Lit un corps HTTP en transfert « chunked ».
+
+    Args:
+        reader (asyncio.StreamReader): flux de lecture.
+
+    Returns:
+        bytes: le corps complet.
+
+    """
+    body = bytearray()
+    while True:
+        size = int((await reader.readline()).split(b";")[0], 16)
+        if size == 0:
+            # Fin du corps (en-têtes de fin éventuels ignorés)
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            return bytes(body)
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+async def recupPointSetAsync(client, idPointSet):
+    """Récupère le binaire d'un PointSet sans bloquer la boucle d'événements.
+
+    Mêmes erreurs que triangulation.recupPointSet.
+
+    Args:
+        client (AsyncPointSetClient): client HTTP à utiliser.
+        idPointSet (str): L'UUID du PointSet.
+
+    Returns:
+        bytes: Le contenu binaire.
+
+    """
+    try:
+        uuid.UUID(str(idPointSet))
+    except ValueError:
+        raise InvalidIdError() from None
+
+    try:
+        status, body = await client.get(
+            f"{triangulation.POINT_SET_MANAGER_URL}/{idPointSet}"
+        )
+    except Exception as e:
+        # Capture les timeouts et erreurs de connexion
+        raise PointSetManagerUnavailableError() from e
+
+    if status == 404:
+        raise PointSetNotFoundError()
+    elif status != 200:
+        raise PointSetManagerUnavailableError()
+    return body
+
+
+def _parseAndTriangulate(point_set_bytes):
+    """Parse et triangule un PointSet (exécuté hors de la boucle d'événements).
+
+    Args:
+        point_set_bytes (bytes): binaire du pointset.
+
+    Returns:
+        triangles (array): indices à plat des triangles générés.
+
+    """
+    if triangulation_pool is not None:
+        return triangulation_pool.run(point_set_bytes)
+    return triangulation.triangulation(triangulation.parsePointSet(point_set_bytes))
+
+
+client = AsyncPointSetClient()
+triangulation_pool = None
+if PROCESS_POOL_WORKERS:
+    triangulation_pool = TriangulationPool(
+        PROCESS_POOL_WORKERS, PROCESS_POOL_QUEUE_DEPTH, PROCESS_POOL_TIMEOUT
+    )
+
+
+async def get_triangulation(pointSetId, send, head=False):
+    """Endpoint principal pour la triangulation (version asynchrone).
+
+    Args:
+        pointSetId (str): l'UUID du PointSet.
+        send (callable): canal d'envoi ASGI.
+        head (bool): requête HEAD : en-têtes du GET (Content-Length
+            compris), sans le corps.
+
+    """
+    try:
+        point_set_bytes = await recupPointSetAsync(client, pointSetId)
+        loop = asyncio.get_running_loop()
+        triangles = await loop.run_in_executor(
+            None, _parseAndTriangulate, point_set_bytes
+        )
+        size, chunks = triangulation.streamTriangle(point_set_bytes, triangles)
+    except Exception as e:
+        payload, status = errorPayload(e)
+        await _sendJson(send, payload, status, head)
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-type", b"application/octet-stream"),
+            (b"content-length", str(size).encode()),
+        ],
+    })
+    if not head:
+        for chunk in chunks:
+            await send({
+                "type": "http.response.body", "body": chunk, "more_body": True
+            })
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _sendJson(send, payload, status, head=False):
+    """Envoie une réponse JSON complète.
+
+    Args:
+        send (callable): canal d'envoi ASGI.
+        payload (dict): corps de la réponse.
+        status (int): code HTTP.
+        head (bool): n'envoie que les en-têtes (requête HEAD).
+
+    """
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": b"" if head else body})
+
+
+async def application(scope, receive, send):
+    """Point d'entrée ASGI.
+
+    Args:
+        scope (dict): description de la connexion.
+        receive (callable): canal de réception ASGI.
+        send (callable): canal d'envoi ASGI.
+
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await client.close()
+                if triangulation_pool is not None:
+                    triangulation_pool.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    prefix = "/triangulation/"
+    path = scope["path"]
+    pointSetId = path[len(prefix):]
+    if path.startswith(prefix) and pointSetId and "/" not in pointSetId:
+        if scope["method"] in ("GET", "HEAD"):
+            await get_triangulation(
+                pointSetId, send, head=scope["method"] == "HEAD"
+            )
+        else:
+            await _sendJson(send, {
+                "code": "METHOD_NOT_ALLOWED", "message": "Method not allowed"
+                }, 405)
+        return
+
+    await _sendJson(send, {"code": "NOT_FOUND", "message": "Not found"}, 404)
@@ -0,0 +1,4 @@
+"""Banc de mesure des performances du service de Triangulation.
+
+Se lance depuis le dossier TP avec ``make bench`` (ou ``python -m bench``).
+"""
@@ -0,0 +1,6 @@
+"""Point d'entrée ``python -m bench``."""
+import sys
+
+from bench.harness import main
+
+sys.exit(main())
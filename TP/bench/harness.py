@@ -0,0 +1,399 @@
+"""Mesure des étapes du service sur plusieurs tailles et distributions.
+
+Chaque cas (étape, distribution, taille) est exécuté après un échauffement,
+répété plusieurs fois, puis résumé par percentiles. Les résultats sont
+écrits en JSON et comparés à une référence (baseline.json) : une médiane
+plus lente que la référence au-delà du seuil est signalée comme
+régression.
+"""
+import argparse
+import http.server
+import json
+import math
+import os
+import platform
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from unittest.mock import patch
+
+import requests
+
+import triangulation
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "results.json")
+
+# recup_pooled et recup_fresh : récupération du PointSet sur un faux
+# PointSetManager local, par le pool keep-alive ou une connexion par requête
+STAGES = ("parse", "triangulate", "triangulate_hilbert", "encode", "endpoint",
+          "recup_pooled", "recup_fresh")
+DISTRIBUTIONS = ("uniform", "normal", "clustered", "grid", "circle")
+SIZES = (10, 1000, 10000, 100000)
+# Nombres de processus essayés pour l'étape triangulate (mesure du passage à l'échelle)
+WORKERS = (1,)
+
+WARMUP = 1
+REPEAT = 7
+MIN_REPEAT = 3
+# Au-delà de cette durée cumulée (s), un cas s'arrête après MIN_REPEAT mesures
+MAX_CASE_TIME = 10.0
+# Écart relatif toléré sur la médiane avant de signaler une régression
+THRESHOLD = 0.25
+# Écart absolu (s) en dessous duquel une différence est considérée comme du bruit
+NOISE_FLOOR = 1e-4
+SEED = 0
+POINT_SET_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+def generatePoints(distribution, size, seed=SEED):
+    """Génère un PointSet binaire selon une distribution.
+
+    Args:
+        distribution (str): nom de la distribution (voir DISTRIBUTIONS).
+        size (int): nombre de points.
+        seed (int): graine du générateur.
+
+    Returns:
+        bytes: le PointSet au format binaire du PointSetManager.
+
+    """
+    rng = random.Random(seed)
+    if distribution == "uniform":
+        coords = [rng.random() for _ in range(2 * size)]
+    elif distribution == "normal":
+        coords = [rng.gauss(0.0, 1.0) for _ in range(2 * size)]
+    elif distribution == "clustered":
+        centers = [(rng.random(), rng.random()) for _ in range(max(1, size // 1000))]
+        coords = []
+        for _ in range(size):
+            cx, cy = rng.choice(centers)
+            coords.extend((rng.gauss(cx, 0.01), rng.gauss(cy, 0.01)))
+    elif distribution == "grid":
+        side = math.isqrt(size - 1) + 1
+        coords = [v for i in range(size) for v in (i % side, i // side)]
+    elif distribution == "circle":
+        step = 2 * math.pi / size
+        coords = [v for i in range(size)
+                  for v in (math.cos(i * step), math.sin(i * step))]
+    else:
+        raise ValueError(f"unknown distribution: {distribution}")
+    return struct.pack('<I', size) + array('f', coords).tobytes()
+
+
+class _StubPointSetManager(http.server.BaseHTTPRequestHandler):
+    """Faux PointSetManager local renvoyant le PointSet du cas en cours."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    body = b""
+
+    def do_GET(self):  # noqa: N802
+        """Répond au GET /pointset/{id}."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        """Désactive les logs du serveur."""
+
+
+_stub_server = None
+
+
+def _stubUrl(point_set_bytes):
+    """Sert un PointSet depuis le faux PointSetManager, démarré au besoin.
+
+    Args:
+        point_set_bytes (bytes): PointSet binaire à servir.
+
+    Returns:
+        str: URL de base des PointSets du serveur local.
+
+    """
+    global _stub_server
+    if _stub_server is None:
+        _stub_server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), _StubPointSetManager
+        )
+        threading.Thread(target=_stub_server.serve_forever, daemon=True).start()
+    _StubPointSetManager.body = point_set_bytes
+    return f"http://127.0.0.1:{_stub_server.server_address[1]}/pointset"
+
+
+def _prepare(stage, point_set_bytes, workers=1):
+    """Prépare les entrées d'une étape hors du temps mesuré.
+
+    Args:
+        stage (str): nom de l'étape (voir STAGES).
+        point_set_bytes (bytes): PointSet binaire.
+        workers (int): nombre de processus de l'étape triangulate.
+
+    Returns:
+        callable: la fonction à chronométrer, sans argument.
+
+    """
+    if stage == "parse":
+        return lambda: triangulation.parsePointSet(point_set_bytes)
+
+    if stage in ("recup_pooled", "recup_fresh"):
+        url = _stubUrl(point_set_bytes)
+
+        def fetch():
+            if stage == "recup_pooled":
+                with patch("triangulation.POINT_SET_MANAGER_URL", url):
+                    body = triangulation.recupPointSet(POINT_SET_ID)
+            else:
+                # Nouvelle connexion à chaque requête
+                body = requests.get(f"{url}/{POINT_SET_ID}", timeout=5).content
+            if body != point_set_bytes:
+                raise RuntimeError(f"{stage} returned a different PointSet")
+        return fetch
+
+    points = triangulation.parsePointSet(point_set_bytes)
+    if stage == "triangulate":
+        return lambda: triangulation.triangulation(points, workers=workers)
+    if stage == "triangulate_hilbert":
+        # Même calcul, précédé du tri des points le long de la courbe de Hilbert
+        return lambda: triangulation.triangulation(points, reorder=True)
+
+    triangles = triangulation.triangulation(points)
+    if stage == "encode":
+        # Chemin servi par l'endpoint (présentation par défaut), en flux
+        return lambda: b"".join(
+            triangulation.streamTriangle(point_set_bytes, triangles)[1]
+        )
+
+    if stage == "endpoint":
+        from app import app, content_cache, result_cache
+
+        client = app.test_client()
+        url = f"/triangulation/{POINT_SET_ID}"
+
+        def call():
+            # Les caches sont vidés pour mesurer le calcul, pas un accès mémoire
+            # (le cache par contenu servirait sinon chaque mesure après la
+            # première)
+            result_cache.clear()
+            content_cache.clear()
+            with patch("triangulation.recupPointSet", return_value=point_set_bytes):
+                response = client.get(url)
+                response.get_data()
+            if response.status_code != 200:
+                raise RuntimeError(f"endpoint returned {response.status_code}")
+        return call
+
+    raise ValueError(f"unknown stage: {stage}")
+
+
+def percentile(samples, q):
+    """Renvoie un percentile des mesures, par interpolation linéaire.
+
+    Args:
+        samples (list): mesures, dans n'importe quel ordre.
+        q (float): percentile voulu, entre 0 et 100.
+
+    Returns:
+        float: la valeur du percentile.
+
+    """
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * q / 100
+    low = math.floor(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def measure(fn, warmup=WARMUP, repeat=REPEAT, max_time=MAX_CASE_TIME):
+    """Chronomètre fn après échauffement et résume les mesures.
+
+    Args:
+        fn (callable): fonction à mesurer ; toute exception est propagée.
+        warmup (int): nombre d'exécutions non mesurées.
+        repeat (int): nombre maximal d'exécutions mesurées.
+        max_time (float): durée cumulée après laquelle on s'arrête
+            (dès que MIN_REPEAT mesures sont acquises).
+
+    Returns:
+        dict: nombre de mesures, min, p50, p90, p99 et max en secondes.
+
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    total = 0.0
+    while len(samples) < repeat:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        total += samples[-1]
+        if total > max_time and len(samples) >= MIN_REPEAT:
+            break
+    return {
+        "runs": len(samples),
+        "min": min(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+    }
+
+
+def caseKey(stage, distribution, size, workers=1):
+    """Construit l'identifiant d'un cas de mesure.
+
+    Args:
+        stage (str): nom de l'étape.
+        distribution (str): nom de la distribution.
+        size (int): nombre de points.
+        workers (int): nombre de processus (omis de l'identifiant s'il vaut 1).
+
+    Returns:
+        str: identifiant « étape/distribution/taille », ou
+        « étape@processus/distribution/taille ».
+
+    """
+    if workers != 1:
+        stage = f"{stage}@{workers}"
+    return f"{stage}/{distribution}/{size}"
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """Compare les mesures à la référence et liste les régressions.
+
+    Args:
+        results (dict): mesures courantes, par identifiant de cas.
+        baseline (dict): mesures de référence, par identifiant de cas.
+        threshold (float): écart relatif toléré.
+
+    Returns:
+        list: tuples (cas, médiane de référence, médiane courante), pour les
+        cas présents des deux côtés seulement ; les écarts inférieurs à
+        NOISE_FLOOR sont ignorés.
+
+    """
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if not reference:
+            continue
+        if (current["p50"] > reference["p50"] * (1 + threshold)
+                and current["p50"] - reference["p50"] > NOISE_FLOOR):
+            regressions.append((key, reference["p50"], current["p50"]))
+    return regressions
+
+
+def run(stages=STAGES, distributions=DISTRIBUTIONS, sizes=SIZES,
+        warmup=WARMUP, repeat=REPEAT, out=None, workers=WORKERS):
+    """Exécute tous les cas demandés.
+
+    Args:
+        stages (iterable): étapes à mesurer.
+        distributions (iterable): distributions de points.
+        sizes (iterable): tailles de PointSet.
+        warmup (int): nombre d'exécutions d'échauffement par cas.
+        repeat (int): nombre maximal d'exécutions mesurées par cas.
+        out (file): flux où afficher la progression (sortie standard par
+            défaut).
+        workers (iterable): nombres de processus essayés pour l'étape
+            triangulate.
+
+    Returns:
+        dict: résumés des mesures, par identifiant de cas.
+
+    """
+    out = out or sys.stdout
+    results = {}
+    for size in sizes:
+        for distribution in distributions:
+            point_set_bytes = generatePoints(distribution, size)
+            for stage, count in _cases(stages, workers):
+                key = caseKey(stage, distribution, size, count)
+                results[key] = measure(
+                    _prepare(stage, point_set_bytes, count), warmup, repeat
+                )
+                stats = results[key]
+                print(f"{key:<32} p50 {stats['p50'] * 1e3:10.3f} ms"
+                      f"  p90 {stats['p90'] * 1e3:10.3f} ms"
+                      f"  ({stats['runs']} runs)", file=out)
+    return results
+
+
+def _cases(stages, workers):
+    """Énumère les couples (étape, nombre de processus) à mesurer.
+
+    Args:
+        stages (iterable): étapes à mesurer.
+        workers (iterable): nombres de processus de l'étape triangulate.
+
+    Returns:
+        list: couples (étape, processus) ; seule triangulate est déclinée.
+
+    """
+    cases = []
+    for stage in stages:
+        counts = workers if stage == "triangulate" else (1,)
+        cases.extend((stage, count) for count in counts)
+    return cases
+
+
+def main(argv=None):
+    """Lance le banc depuis la ligne de commande.
+
+    Args:
+        argv (list): arguments (sys.argv[1:] par défaut).
+
+    Returns:
+        int: 1 si une régression est détectée, 0 sinon.
+
+    """
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS,
+                        default=DISTRIBUTIONS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES,
+                        help="tailles de PointSet (jusqu'à 10^7 points)")
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS,
+                        help="nombres de processus de l'étape triangulate")
+    parser.add_argument("--warmup", type=int, default=WARMUP)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="écart relatif toléré sur la médiane")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="enregistre les mesures comme nouvelle référence")
+    args = parser.parse_args(argv)
+
+    results = run(args.stages, args.distributions, args.sizes,
+                  args.warmup, args.repeat, workers=args.workers)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path = args.baseline if args.save_baseline else args.output
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+    if args.save_baseline:
+        print(f"baseline written to {path}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except FileNotFoundError:
+        print(f"no baseline at {args.baseline}, nothing to compare")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    for key, reference, current in regressions:
+        print(f"REGRESSION {key}: p50 {reference * 1e3:.3f} ms -> "
+              f"{current * 1e3:.3f} ms")
+    return 1 if regressions else 0
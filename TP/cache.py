@@ -0,0 +1,487 @@
+"""Module de cache des triangulations.
+
+Ce module fournit un cache en mémoire des triangulations calculées, borné
+en octets avec éviction LRU, éventuellement doublé d'un niveau sur disque
+pour ne pas repartir d'un cache vide après un redémarrage, ainsi que le
+regroupement des calculs concurrents d'un même résultat (single-flight).
+Un second cache, indexé par le contenu du binaire plutôt que par l'id,
+évite de trianguler plusieurs fois une même géométrie enregistrée sous
+des ids différents.
+"""
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+import triangulation
+
+
+class ResultCache:
+    """Cache LRU des triangulations, borné par la taille totale des entrées.
+
+    Une entrée est un triplet (binaire du pointset, indices des triangles,
+    demi-arêtes opposées), ce qui permet de renvoyer la réponse en flux
+    sans la reconstruire ; les demi-arêtes (None si inconnues) donnent les
+    voisins des triangles sans reconstruire l'adjacence. Des métadonnées
+    (validateurs HTTP...) peuvent l'accompagner en mémoire ; ni elles ni les
+    demi-arêtes ne sont écrites sur disque.
+
+    Attributes:
+        max_bytes (int): taille maximale des entrées conservées en mémoire.
+        disk_dir (str|None): dossier du niveau disque, désactivé si None.
+        hits (int): nombre de lectures trouvées dans le cache.
+        misses (int): nombre de lectures absentes du cache.
+        evictions (int): nombre d'entrées évincées de la mémoire.
+        disk_hits (int): nombre de lectures servies par le niveau disque.
+
+    """
+
+    def __init__(self, max_bytes, disk_dir=None):
+        """Initialise un cache vide.
+
+        Args:
+            max_bytes (int): taille maximale des entrées conservées en mémoire.
+            disk_dir (str|None): dossier du niveau disque, désactivé si None.
+
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._meta = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Renvoie l'entrée associée à key, ou None si elle est absente.
+
+        Args:
+            key (str): identifiant de l'entrée.
+
+        Returns:
+            tuple|None: (binaire du pointset, indices des triangles,
+            demi-arêtes opposées).
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, entry)
+        return entry
+
+    def put(self, key, point_set_bytes, triangles, halfedges=None, meta=None):
+        """Ajoute (ou remplace) une entrée, en évinçant les moins récentes si besoin.
+
+        Args:
+            key (str): identifiant de l'entrée.
+            point_set_bytes (bytes): binaire du pointset.
+            triangles (array): indices à plat des triangles.
+            halfedges (array|None): demi-arêtes opposées, si connues.
+            meta (dict|None): métadonnées de l'entrée.
+
+        Returns:
+            tuple: l'entrée (binaire du pointset, indices des triangles,
+            demi-arêtes opposées).
+
+        """
+        entry = (point_set_bytes, triangles, halfedges)
+        with self._lock:
+            self._store(key, entry, meta)
+        self._save(key, entry)
+        return entry
+
+    def touch(self, key, entry, meta):
+        """Remplace les métadonnées d'une entrée en mémoire, sans la réécrire.
+
+        Le contenu de l'entrée est inchangé : le niveau disque n'est pas
+        touché.
+
+        Args:
+            key (str): identifiant de l'entrée.
+            entry (tuple): entrée déjà lue ; rien n'est fait si elle n'est
+                plus celle associée à key.
+            meta (dict): nouvelles métadonnées de l'entrée.
+
+        Returns:
+            bool: True si les métadonnées ont été remplacées.
+
+        """
+        with self._lock:
+            if self._entries.get(key) is not entry:
+                return False
+            self._meta[key] = meta
+            return True
+
+    def meta(self, key, entry=None):
+        """Renvoie les métadonnées de l'entrée associée à key.
+
+        Args:
+            key (str): identifiant de l'entrée.
+            entry (tuple|None): entrée déjà lue ; les métadonnées ne sont
+                renvoyées que si elle est toujours celle associée à key.
+
+        Returns:
+            dict|None: les métadonnées, ou None si absentes.
+
+        """
+        with self._lock:
+            if entry is not None and self._entries.get(key) is not entry:
+                return None
+            return self._meta.get(key)
+
+    def clear(self):
+        """Vide le cache en mémoire et remet les compteurs à zéro."""
+        with self._lock:
+            self._entries.clear()
+            self._meta.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def stats(self):
+        """Renvoie les compteurs du cache.
+
+        Returns:
+            dict: entrées, taille occupée et compteurs hits/misses/évictions.
+
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+            }
+
+    def _store(self, key, entry, meta=None):
+        """Insère une entrée en mémoire (verrou déjà pris).
+
+        Args:
+            key (str): identifiant de l'entrée.
+            entry (tuple): (binaire du pointset, indices des triangles,
+                demi-arêtes opposées).
+            meta (dict|None): métadonnées de l'entrée.
+
+        """
+        previous = self._entries.pop(key, None)
+        self._meta.pop(key, None)
+        if previous is not None:
+            self._size -= _sizeOf(previous)
+
+        size = _sizeOf(entry)
+        if size > self.max_bytes:
+            # Plus gros que le cache entier : on ne le garde pas en mémoire
+            return
+        self._entries[key] = entry
+        if meta is not None:
+            self._meta[key] = meta
+        self._size += size
+        while self._size > self.max_bytes:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._meta.pop(evicted_key, None)
+            self._size -= _sizeOf(evicted)
+            self.evictions += 1
+
+    def _path(self, key):
+        """Chemin du fichier du niveau disque pour key (nom sûr, encodé en hexa).
+
+        Args:
+            key (str): identifiant de l'entrée.
+
+        Returns:
+            str: chemin du fichier.
+
+        """
+        return os.path.join(self.disk_dir, key.encode().hex() + ".tri")
+
+    def _save(self, key, entry):
+        """Écrit une entrée sur disque au format Triangles (écriture atomique).
+
+        Args:
+            key (str): identifiant de l'entrée.
+            entry (tuple): (binaire du pointset, indices des triangles,
+                demi-arêtes opposées).
+
+        """
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                # Seuls les triangles sont écrits : les demi-arêtes seront
+                # reconstruites au besoin
+                f.write(triangulation.parseTriangle(*entry[:2]))
+            os.replace(tmp_path, path)
+        except Exception:
+            # Le niveau disque est facultatif : une erreur d'écriture est ignorée
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _load(self, key):
+        """Relit une entrée depuis le disque, ou None si absente ou illisible.
+
+        Args:
+            key (str): identifiant de l'entrée.
+
+        Returns:
+            tuple|None: (binaire du pointset, indices des triangles,
+            demi-arêtes opposées).
+
+        """
+        if self.disk_dir is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                return (*triangulation.decodeTriangles(f.read()), None)
+        except Exception:
+            return None
+
+
+class ContentCache(ResultCache):
+    """Cache des triangulations indexé par le contenu du binaire PointSet.
+
+    La clé est une empreinte rapide (CRC-32 et taille) du binaire ; une
+    entrée trouvée n'est renvoyée que si son binaire est identique octet
+    par octet à celui cherché, si bien qu'une collision d'empreintes ne
+    peut renvoyer la triangulation d'un autre PointSet.
+
+    Attributes:
+        collisions (int): lectures dont l'empreinte correspondait à un
+            binaire différent (comptées comme absentes).
+
+    """
+
+    def __init__(self, max_bytes, disk_dir=None):
+        """Initialise un cache vide.
+
+        Args:
+            max_bytes (int): taille maximale des entrées conservées en mémoire.
+            disk_dir (str|None): dossier du niveau disque, désactivé si None.
+
+        """
+        super().__init__(max_bytes, disk_dir)
+        self.collisions = 0
+
+    def lookup(self, point_set_bytes):
+        """Renvoie l'entrée d'un binaire identique, ou None si elle est absente.
+
+        Args:
+            point_set_bytes (bytes): binaire du pointset.
+
+        Returns:
+            tuple|None: (binaire du pointset en cache, indices des triangles,
+            demi-arêtes opposées).
+
+        """
+        entry = self.get(contentKey(point_set_bytes))
+        if entry is not None and entry[0] != point_set_bytes:
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+                self.collisions += 1
+            return None
+        return entry
+
+    def add(self, point_set_bytes, triangles, halfedges=None):
+        """Ajoute (ou remplace) l'entrée d'un binaire.
+
+        Args:
+            point_set_bytes (bytes): binaire du pointset.
+            triangles (array): indices à plat des triangles.
+            halfedges (array|None): demi-arêtes opposées, si connues.
+
+        """
+        self.put(contentKey(point_set_bytes), point_set_bytes, triangles, halfedges)
+
+    def clear(self):
+        """Vide le cache en mémoire et remet les compteurs à zéro."""
+        super().clear()
+        with self._lock:
+            self.collisions = 0
+
+    def stats(self):
+        """Renvoie les compteurs du cache.
+
+        Returns:
+            dict: ceux de ResultCache, plus les collisions et le taux de
+            lectures trouvées.
+
+        """
+        stats = super().stats()
+        with self._lock:
+            stats["collisions"] = self.collisions
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+class DerivedCache:
+    """Valeurs dérivées d'une entrée de ResultCache (index, voisins...), par id.
+
+    Une valeur n'est réutilisée que pour l'entrée dont elle a été dérivée :
+    si l'entrée d'un id est remplacée (PointSet modifié, entrée évincée puis
+    recalculée), la valeur est reconstruite, sans toucher aux autres ids.
+
+    Attributes:
+        max_entries (int): nombre maximal de valeurs conservées.
+
+    """
+
+    def __init__(self, max_entries):
+        """Initialise un cache vide.
+
+        Args:
+            max_entries (int): nombre maximal de valeurs conservées.
+
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, entry, build):
+        """Renvoie la valeur dérivée de entry, construite au besoin.
+
+        Args:
+            key (str): identifiant de l'entrée.
+            entry (tuple): entrée courante de ResultCache pour key.
+            build (callable): construit la valeur à partir de entry.
+
+        Returns:
+            la valeur dérivée de entry.
+
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] is entry:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        value = build(entry)
+        with self._lock:
+            self._entries[key] = (entry, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+class SingleFlight:
+    """Regroupe les appels concurrents portant sur une même clé.
+
+    Tant qu'un calcul est en cours pour une clé, les autres appelants
+    attendent son résultat (ou son exception) au lieu de le relancer.
+
+    Attributes:
+        shared (int): nombre d'appels servis par le calcul d'un autre.
+
+    """
+
+    def __init__(self):
+        """Initialise un regroupement sans calcul en cours."""
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Exécute fn une seule fois pour tous les appels concurrents sur key.
+
+        Args:
+            key (str): identifiant du calcul.
+            fn (callable): calcul à exécuter, sans argument.
+
+        Returns:
+            le résultat de fn, partagé entre les appelants.
+
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class _Call:
+    """Calcul en cours partagé par SingleFlight."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        """Initialise un calcul non terminé."""
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def contentKey(point_set_bytes):
+    """Renvoie l'empreinte d'un binaire PointSet (non cryptographique).
+
+    Args:
+        point_set_bytes (bytes): binaire du pointset.
+
+    Returns:
+        str: CRC-32 et taille du binaire, par exemple « 1c291ca3-36 ».
+
+    """
+    return f"{zlib.crc32(point_set_bytes):08x}-{len(point_set_bytes)}"
+
+
+def _sizeOf(entry):
+    """Taille en octets d'une entrée du cache.
+
+    Args:
+        entry (tuple): (binaire du pointset, indices des triangles,
+            demi-arêtes opposées).
+
+    Returns:
+        int: taille des buffers.
+
+    """
+    point_set_bytes, triangles, halfedges = entry
+    size = len(point_set_bytes) + 4 * len(triangles)
+    if halfedges is not None:
+        size += 4 * len(halfedges)
+    return size
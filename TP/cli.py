@@ -0,0 +1,126 @@
+"""Triangulation hors ligne de fichiers PointSet.
+
+Lit un fichier au format binaire PointSet, le triangule avec le même
+moteur que le service et écrit le résultat au format Triangles::
+
+    python cli.py points.bin triangles.bin [--workers 4] [--reorder]
+
+Le fichier d'entrée est projeté en mémoire (mmap) : ses octets ne sont
+jamais copiés dans un objet Python, les coordonnées sont lues dans la
+projection et le bloc des sommets est recopié depuis elle vers la sortie.
+Seules les structures de travail du moteur (coordonnées et indices) sont
+des objets Python.
+"""
+import argparse
+import contextlib
+import mmap
+import os
+import sys
+
+import triangulation
+from errors import InvalidResponseFormatError
+
+
+def triangulateFile(input_path, output_path, method="delaunay", workers=1,
+                    reorder=False, use_mmap=False):
+    """Triangule un fichier PointSet et écrit le binaire Triangles.
+
+    Args:
+        input_path (str): chemin du fichier au format PointSet.
+        output_path (str): chemin du fichier Triangles à écrire.
+        method (str): algorithme utilisé (voir triangulation.METHODS).
+        workers (int): nombre de processus pour la triangulation de Delaunay.
+        reorder (bool): trie d'abord les points selon la courbe de Hilbert.
+        use_mmap (bool): écrit la sortie par projection en mémoire plutôt
+            que par écritures successives.
+
+    Returns:
+        int: nombre de triangles écrits.
+
+    """
+    with open(input_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 4:
+            raise InvalidResponseFormatError()
+        source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        points = triangulation.PointSet.fromBytes(source, copy=False)
+        result = triangulation.Triangulation.compute(
+            points, method, workers=workers, reorder=reorder
+        )
+        size, chunks = triangulation.streamTriangle(source, result.triangles)
+        if use_mmap:
+            _writeMapped(output_path, size, chunks)
+        else:
+            with open(output_path, "wb") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+        count = len(result)
+        # Les vues sur la projection doivent disparaître avant sa fermeture
+        del points, result, chunks
+    finally:
+        # Après une erreur, sa trace peut encore retenir des vues : la
+        # projection est alors libérée par le ramasse-miettes
+        with contextlib.suppress(BufferError):
+            source.close()
+    return count
+
+
+def _writeMapped(output_path, size, chunks):
+    """Écrit des morceaux dans un fichier projeté en mémoire.
+
+    Args:
+        output_path (str): chemin du fichier à écrire.
+        size (int): taille totale en octets.
+        chunks (iterable): morceaux à écrire, dans l'ordre.
+
+    """
+    with open(output_path, "w+b") as out:
+        out.truncate(size)
+        with mmap.mmap(out.fileno(), size) as target:
+            offset = 0
+            for chunk in chunks:
+                target[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+            target.flush()
+
+
+def main(argv=None):
+    """Lance la triangulation d'un fichier depuis la ligne de commande.
+
+    Args:
+        argv (list): arguments (sys.argv[1:] par défaut).
+
+    Returns:
+        int: 0 en cas de succès, 1 si la triangulation échoue.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="python cli.py", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("input", help="fichier au format PointSet")
+    parser.add_argument("output", help="fichier Triangles à écrire")
+    parser.add_argument("--method", choices=triangulation.METHODS,
+                        default="delaunay")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="nombre de processus (triangulation de Delaunay)")
+    parser.add_argument("--reorder", action="store_true",
+                        help="trie les points selon une courbe de Hilbert")
+    parser.add_argument("--mmap-output", action="store_true",
+                        help="écrit la sortie par projection en mémoire")
+    args = parser.parse_args(argv)
+
+    try:
+        count = triangulateFile(args.input, args.output, args.method,
+                                args.workers, args.reorder, args.mmap_output)
+    except Exception as e:
+        # Fichier illisible, ou code d'erreur du moteur (DECODE_ERROR...)
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"{count} triangles written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Module des erreurs du service de Triangulation.
+
+Chaque erreur porte son code interne (str(erreur) le renvoie, comme le
+message des anciennes Exception("CODE")), le code HTTP et le corps JSON
+de la réponse de l'API. Les serveurs (app.py, asgi.py) traduisent ainsi
+une erreur par simple lecture de ses attributs (voir errorPayload), sans
+comparer de chaînes.
+
+Hiérarchie::
+
+    TriangulatorError                     500 INTERNAL_ERROR
+    ├── InvalidIdError                    400 INVALID_ID_FORMAT
+    ├── PointSetNotFoundError             404 POINTSET_NOT_FOUND
+    ├── InvalidInputError                 400 INVALID_REQUEST
+    │   ├── InvalidPointSetError
+    │   ├── InvalidPointError
+    │   └── InvalidTriangleError
+    ├── ServiceUnavailableError           503 SERVICE_UNAVAILABLE
+    │   ├── PointSetManagerUnavailableError
+    │   ├── QueueFullError
+    │   └── TriangulationTimeoutError
+    ├── DecodeError
+    │   └── InvalidResponseFormatError
+    ├── EncodeError
+    │   └── InvalidPointSetBytesError
+    └── TriangulationError
+"""
+
+
+class TriangulatorError(Exception):
+    """Erreur du service, traduite en réponse de l'API.
+
+    Attributes:
+        code (str): code interne de l'erreur.
+        status (int): code HTTP de la réponse.
+        api_code (str): code renvoyé dans le corps JSON.
+        message (str|None): message renvoyé dans le corps JSON (le code
+            interne si None).
+
+    """
+
+    code = "INTERNAL_ERROR"
+    status = 500
+    api_code = "INTERNAL_ERROR"
+    message = None
+
+    def __init__(self, code=None):
+        """Initialise l'erreur.
+
+        Args:
+            code (str): code interne, celui de la classe par défaut.
+
+        """
+        if code is not None:
+            self.code = code
+        super().__init__(self.code)
+
+    def __str__(self):
+        """Renvoie le code interne."""
+        return self.code
+
+    def payload(self):
+        """Renvoie le corps JSON de la réponse de l'API.
+
+        Returns:
+            dict: code et message de l'erreur.
+
+        """
+        return {"code": self.api_code, "message": self.message or self.code}
+
+
+class InvalidIdError(TriangulatorError):
+    """Identifiant de PointSet mal formé."""
+
+    code = "INVALID_ID_FORMAT"
+    status = 400
+    api_code = "INVALID_ID_FORMAT"
+    message = "Invalid ID format"
+
+
+class PointSetNotFoundError(TriangulatorError):
+    """PointSet inconnu du PointSetManager."""
+
+    code = "NO_POINTSET_FOUND"
+    status = 404
+    api_code = "POINTSET_NOT_FOUND"
+    message = "PointSet not found"
+
+
+class InvalidInputError(TriangulatorError):
+    """Données fournies invalides (le message est le code interne)."""
+
+    status = 400
+    api_code = "INVALID_REQUEST"
+
+
+class InvalidPointSetError(InvalidInputError):
+    """Ensemble de points impossible à trianguler (trop petit, dégénéré...)."""
+
+    code = "INVALID_POINTSET"
+
+
+class InvalidPointError(InvalidInputError):
+    """Coordonnée invalide (non numérique, NaN ou Inf)."""
+
+    code = "INVALID_POINT"
+
+
+class InvalidTriangleError(InvalidInputError):
+    """Indices de triangles invalides."""
+
+    code = "INVALID_TRIANGLE"
+
+
+class ServiceUnavailableError(TriangulatorError):
+    """Service momentanément indisponible."""
+
+    status = 503
+    api_code = "SERVICE_UNAVAILABLE"
+
+
+class PointSetManagerUnavailableError(ServiceUnavailableError):
+    """PointSetManager injoignable ou en erreur."""
+
+    code = "NO_RESPONSE_SERVEUR"
+    message = "PointSetManager unavailable"
+
+
+class QueueFullError(ServiceUnavailableError):
+    """File d'attente du pool de triangulation pleine."""
+
+    code = "QUEUE_FULL"
+    message = "Triangulation queue full"
+
+
+class TriangulationTimeoutError(ServiceUnavailableError):
+    """Triangulation trop longue, abandonnée."""
+
+    code = "TRIANGULATION_TIMEOUT"
+    message = "Triangulation timed out"
+
+
+class DecodeError(TriangulatorError):
+    """Binaire PointSet reçu illisible."""
+
+    code = "DECODE_ERROR"
+
+
+class InvalidResponseFormatError(DecodeError):
+    """Binaire PointSet trop court pour contenir le nombre de points."""
+
+    code = "INVALID_RESPONSE_FORMAT"
+
+
+class EncodeError(TriangulatorError):
+    """Échec de l'encodage du binaire Triangles."""
+
+    code = "ENCODING_ERROR"
+
+
+class InvalidPointSetBytesError(EncodeError):
+    """Bloc des sommets incohérent au moment de l'encodage."""
+
+    code = "INVALID_POINTSET_BYTE_FORMAT"
+
+
+class TriangulationError(TriangulatorError):
+    """Échec du calcul de la triangulation."""
+
+    code = "ERROR_TRIANGULATION"
+
+
+def errorPayload(e):
+    """Traduit une exception du service en erreur de l'API.
+
+    Args:
+        e (Exception): l'erreur levée lors du traitement.
+
+    Returns:
+        tuple: (corps JSON de l'erreur sous forme de dict, code HTTP).
+
+    """
+    if isinstance(e, TriangulatorError):
+        # Code HTTP et corps portés par la classe de l'erreur
+        return e.payload(), e.status
+    return {
+        "code": "INTERNAL_ERROR",
+        "message": str(e)
+        }, 500
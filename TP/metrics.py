@@ -0,0 +1,317 @@
+"""Module de métriques du service, au format texte de Prometheus.
+
+Ce module fournit des compteurs, des jauges et des histogrammes étiquetés,
+sûrs entre threads et peu coûteux (une prise de verrou et quelques
+opérations par mesure), ainsi qu'un registre qui les rend au format
+d'exposition texte de Prometheus (version 0.0.4) pour l'endpoint /metrics.
+"""
+import bisect
+import contextlib
+import threading
+
+# Type de contenu de l'exposition texte de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Registry:
+    """Ensemble des métriques exposées.
+
+    Attributes:
+        metrics (list): métriques enregistrées, dans l'ordre d'ajout.
+
+    """
+
+    def __init__(self):
+        """Initialise un registre vide."""
+        self.metrics = []
+
+    def register(self, metric):
+        """Ajoute une métrique au registre.
+
+        Args:
+            metric (Counter|Gauge|Histogram): la métrique à exposer.
+
+        Returns:
+            Counter|Gauge|Histogram: la même métrique.
+
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Renvoie toutes les métriques au format texte de Prometheus.
+
+        Returns:
+            str: l'exposition, terminée par un saut de ligne.
+
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+class Counter:
+    """Compteur croissant, éventuellement décliné par étiquettes.
+
+    Attributes:
+        name (str): nom de la métrique.
+        documentation (str): description affichée dans l'exposition.
+        labelnames (tuple): noms des étiquettes.
+
+    """
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Initialise une métrique sans valeur.
+
+        Args:
+            name (str): nom de la métrique.
+            documentation (str): description affichée dans l'exposition.
+            labelnames (tuple): noms des étiquettes.
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, amount=1, **labels):
+        """Augmente la valeur associée aux étiquettes.
+
+        Args:
+            amount (float): valeur ajoutée.
+            **labels: valeur de chaque étiquette.
+
+        """
+        key = _key(self, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Renvoie la valeur associée aux étiquettes (0 si jamais modifiée).
+
+        Args:
+            **labels: valeur de chaque étiquette.
+
+        Returns:
+            float: la valeur courante.
+
+        """
+        with self._lock:
+            return self._values.get(_key(self, labels), 0)
+
+    def collect(self):
+        """Renvoie les lignes d'échantillons de l'exposition.
+
+        Returns:
+            list: une ligne par combinaison d'étiquettes.
+
+        """
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+                for key, value in items]
+
+
+class Gauge(Counter):
+    """Valeur pouvant monter et descendre (par exemple un nombre en cours)."""
+
+    kind = "gauge"
+
+    def dec(self, amount=1, **labels):
+        """Diminue la valeur associée aux étiquettes.
+
+        Args:
+            amount (float): valeur retirée.
+            **labels: valeur de chaque étiquette.
+
+        """
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        """Remplace la valeur associée aux étiquettes.
+
+        Args:
+            value (float): nouvelle valeur.
+            **labels: valeur de chaque étiquette.
+
+        """
+        key = _key(self, labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextlib.contextmanager
+    def track(self, **labels):
+        """Compte un traitement en cours pendant la durée du bloc.
+
+        Args:
+            **labels: valeur de chaque étiquette.
+
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram:
+    """Répartition de mesures dans des intervalles cumulés.
+
+    Attributes:
+        name (str): nom de la métrique.
+        documentation (str): description affichée dans l'exposition.
+        buckets (tuple): bornes supérieures croissantes des intervalles
+            (+Inf est ajouté implicitement).
+        labelnames (tuple): noms des étiquettes.
+
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        """Initialise une métrique sans mesure.
+
+        Args:
+            name (str): nom de la métrique.
+            documentation (str): description affichée dans l'exposition.
+            buckets (iterable): bornes supérieures des intervalles.
+            labelnames (tuple): noms des étiquettes.
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Enregistre une mesure.
+
+        Args:
+            value (float): la mesure.
+            **labels: valeur de chaque étiquette.
+
+        """
+        key = _key(self, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Effectif de chaque intervalle (+Inf compris), somme, nombre
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        """Renvoie le nombre de mesures associées aux étiquettes.
+
+        Args:
+            **labels: valeur de chaque étiquette.
+
+        Returns:
+            int: le nombre de mesures.
+
+        """
+        key = _key(self, labels)
+        with self._lock:
+            series = self._series.get(key)
+            return series[2] if series else 0
+
+    def collect(self):
+        """Renvoie les lignes d'échantillons de l'exposition.
+
+        Returns:
+            list: intervalles cumulés, somme et nombre, par combinaison
+            d'étiquettes.
+
+        """
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2]))
+                           for key, s in self._series.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            bounds = [_number(b) for b in self.buckets] + ["+Inf"]
+            for bound, n in zip(bounds, counts, strict=True):
+                cumulative += n
+                labels = _labels(self.labelnames + ("le",), key + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def serverTiming(timings):
+    """Construit la valeur d'un en-tête Server-Timing.
+
+    Args:
+        timings (list): couples (nom de l'étape, durée en secondes).
+
+    Returns:
+        str: les durées en millisecondes, par exemple
+        « recup;dur=1.25, parse;dur=0.31 ».
+
+    """
+    return ", ".join(f"{name};dur={seconds * 1e3:.2f}" for name, seconds in timings)
+
+
+def _key(metric, labels):
+    """Construit la clé interne d'une combinaison d'étiquettes.
+
+    Args:
+        metric (Counter|Histogram): la métrique concernée.
+        labels (dict): valeur de chaque étiquette.
+
+    Returns:
+        tuple: les valeurs, dans l'ordre de labelnames.
+
+    """
+    if len(labels) != len(metric.labelnames):
+        raise ValueError(f"{metric.name} expects labels {metric.labelnames}")
+    return tuple(str(labels[name]) for name in metric.labelnames)
+
+
+def _labels(names, values):
+    """Met en forme les étiquettes d'un échantillon.
+
+    Args:
+        names (tuple): noms des étiquettes.
+        values (tuple): valeurs des étiquettes.
+
+    Returns:
+        str: « {nom="valeur",...} », ou une chaîne vide sans étiquette.
+
+    """
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values, strict=True):
+        value = value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        pairs.append(f"{name}=\"{value}\"")
+    return "{" + ",".join(pairs) + "}"
+
+
+def _number(value):
+    """Met en forme une valeur numérique de l'exposition.
+
+    Args:
+        value (float): la valeur.
+
+    Returns:
+        str: entier sans décimale, flottant sinon.
+
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
@@ -0,0 +1,209 @@
+"""Module de profilage à la demande des triangulations.
+
+Une requête peut être profilée (cProfile) sur demande d'un administrateur
+ou par échantillonnage aléatoire. Le nombre de profilages simultanés et
+la fréquence des profilages échantillonnés sont bornés, pour qu'activer
+le mode sous charge n'effondre pas le débit. Les profils terminés sont
+conservés en mémoire (les plus récents) au format de pstats.
+"""
+import contextlib
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class ProfileStore:
+    """Profils terminés, bornés en nombre (les plus anciens sont retirés).
+
+    Attributes:
+        max_entries (int): nombre maximal de profils conservés.
+
+    """
+
+    def __init__(self, max_entries):
+        """Initialise un stockage vide.
+
+        Args:
+            max_entries (int): nombre maximal de profils conservés.
+
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, profile_id, data):
+        """Ajoute un profil, en retirant le plus ancien si besoin.
+
+        Args:
+            profile_id (str): identifiant du profil.
+            data (bytes): statistiques au format de pstats (marshal).
+
+        """
+        with self._lock:
+            self._entries[profile_id] = data
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, profile_id):
+        """Renvoie un profil, ou None s'il est inconnu ou déjà retiré.
+
+        Args:
+            profile_id (str): identifiant du profil.
+
+        Returns:
+            bytes|None: statistiques au format de pstats.
+
+        """
+        with self._lock:
+            return self._entries.get(profile_id)
+
+    def ids(self):
+        """Renvoie les identifiants des profils conservés.
+
+        Returns:
+            list: les identifiants, du plus ancien au plus récent.
+
+        """
+        with self._lock:
+            return list(self._entries)
+
+
+class Sampler:
+    """Décide quelles requêtes profiler, dans les limites fixées.
+
+    Attributes:
+        rate (float): proportion des requêtes profilées par échantillonnage.
+        min_interval (float): durée minimale (s) entre deux profilages
+            échantillonnés.
+
+    """
+
+    def __init__(self, rate, min_interval, max_concurrent):
+        """Initialise l'échantillonneur.
+
+        Args:
+            rate (float): proportion des requêtes profilées (0 désactive
+                l'échantillonnage).
+            min_interval (float): durée minimale (s) entre deux profilages
+                échantillonnés.
+            max_concurrent (int): nombre maximal de profilages simultanés,
+                demandés ou échantillonnés.
+
+        """
+        self.rate = rate
+        self.min_interval = min_interval
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._last = -float("inf")
+
+    def start(self, forced=False):
+        """Démarre le profilage d'une requête si elle est retenue.
+
+        Args:
+            forced (bool): profilage demandé par un administrateur ; la
+                requête échappe alors à l'échantillonnage, mais pas à la
+                limite de profilages simultanés.
+
+        Returns:
+            ProfileSession|None: la session ouverte, ou None si la requête
+            n'est pas profilée.
+
+        """
+        if not forced:
+            if self.rate <= 0 or random.random() >= self.rate:
+                return None
+            with self._lock:
+                now = time.monotonic()
+                if now - self._last < self.min_interval:
+                    return None
+                self._last = now
+        if not self._slots.acquire(blocking=False):
+            return None
+        return ProfileSession(self._slots)
+
+
+class ProfileSession:
+    """Profilage d'une requête, activé seulement sur les étapes choisies.
+
+    Attributes:
+        id (str): identifiant du profil produit.
+
+    """
+
+    def __init__(self, slot):
+        """Ouvre une session.
+
+        Args:
+            slot (threading.Semaphore): place réservée, libérée par finish.
+
+        """
+        self.id = uuid.uuid4().hex
+        self._profiler = cProfile.Profile()
+        self._slot = slot
+        self._lock = threading.Lock()
+        self._finished = False
+
+    @contextlib.contextmanager
+    def active(self):
+        """Profile le bloc (les mesures des blocs successifs s'accumulent)."""
+        self._profiler.enable()
+        try:
+            yield
+        finally:
+            self._profiler.disable()
+
+    def finish(self, store):
+        """Termine la session et range le profil (sans effet la seconde fois).
+
+        Args:
+            store (ProfileStore): stockage recevant le profil.
+
+        """
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        try:
+            self._profiler.create_stats()
+            store.put(self.id, marshal.dumps(self._profiler.stats))
+        finally:
+            self._slot.release()
+
+
+class _LoadedStats:
+    """Statistiques déjà calculées, présentées comme un profileur à pstats."""
+
+    def __init__(self, stats):
+        """Conserve les statistiques.
+
+        Args:
+            stats (dict): statistiques au format de pstats.
+
+        """
+        self.stats = stats
+
+    def create_stats(self):
+        """Ne fait rien : les statistiques sont déjà calculées."""
+
+
+def renderText(data, limit=50):
+    """Met en forme un profil pour lecture directe.
+
+    Args:
+        data (bytes): statistiques au format de pstats (marshal).
+        limit (int): nombre de fonctions affichées.
+
+    Returns:
+        str: les fonctions les plus coûteuses, par temps cumulé.
+
+    """
+    out = io.StringIO()
+    stats = pstats.Stats(_LoadedStats(marshal.loads(data)), stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -5,212 +5,2259 @@ le parsing des données binaires et l'algorithme de calcul des triangles.
 """
 import math
 import struct
+import sys
 import uuid
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from multiprocessing import shared_memory
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from errors import (
+    DecodeError,
+    EncodeError,
+    InvalidIdError,
+    InvalidPointError,
+    InvalidPointSetBytesError,
+    InvalidPointSetError,
+    InvalidResponseFormatError,
+    InvalidTriangleError,
+    PointSetManagerUnavailableError,
+    PointSetNotFoundError,
+    TriangulationError,
+)
+
+try:
+    import zstandard
+except ImportError:  # dépendance optionnelle : compression zstd indisponible
+    zstandard = None
 
 #URL du PointSetManager (à configurer selon l'environnement, ici par défaut)
 POINT_SET_MANAGER_URL = "http://pointset_manager:8080/pointset"
 
+# Client HTTP vers le PointSetManager : taille du pool de connexions
+# keep-alive, nombre de nouvelles tentatives et attente exponentielle (s)
+POOL_SIZE = 10
+RETRY_TOTAL = 2
+RETRY_BACKOFF = 0.1
+FETCH_TIMEOUT = 5
+# Taille (en octets) des lectures successives du corps de la réponse
+READ_CHUNK_SIZE = 64 * 1024
+
+_session = None
+
+
+def configureSession(pool_size=POOL_SIZE, retries=RETRY_TOTAL, backoff=RETRY_BACKOFF):
+    """Crée la session HTTP partagée utilisée pour joindre le PointSetManager.
+
+    Les connexions sont conservées (keep-alive) dans un pool et réutilisées
+    d'une requête à l'autre ; les erreurs de connexion et les réponses
+    502/503/504 sont retentées avec une attente exponentielle. L'ancienne
+    session éventuelle est fermée.
+
+    Args:
+        pool_size (int): nombre maximal de connexions conservées.
+        retries (int): nombre de nouvelles tentatives.
+        backoff (float): facteur d'attente exponentielle entre tentatives.
+
+    Returns:
+        session (requests.Session): la nouvelle session partagée.
+
+    """
+    global _session
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    previous, _session = _session, session
+    if previous is not None:
+        previous.close()
+    return session
+
+
+configureSession()
 
-def recupPointSet(idPointSet):
+
+def _readBody(response):
+    """Lit le corps d'une réponse en flux, directement dans un buffer unique.
+
+    Quand la taille est annoncée (Content-Length, sans compression), le
+    buffer est alloué une fois puis rempli morceau par morceau, sans
+    conserver de copie intermédiaire du corps complet.
+
+    Args:
+        response (requests.Response): réponse ouverte avec stream=True.
+
+    Returns:
+        bytes|bytearray: le contenu binaire, propre à l'appelant (il peut
+        être décodé sans copie, voir parsePointSet).
+
+    """
+    length = response.headers.get("Content-Length")
+    if length is None or response.headers.get("Content-Encoding"):
+        return response.content
+
+    body = bytearray(int(length))
+    view = memoryview(body)
+    received = 0
+    while received < len(body):
+        read = response.raw.readinto(view[received:received + READ_CHUNK_SIZE])
+        if not read:
+            # Corps tronqué par rapport à la taille annoncée
+            raise PointSetManagerUnavailableError()
+        received += read
+    return body
+
+
+def recupPointSet(idPointSet, *, validators=None):
     """Récupère le binaire d'un PointSet via l'API PointSetManager.
 
+    Avec validators, la requête est conditionnelle : les valeurs connues
+    sont envoyées (If-None-Match, If-Modified-Since) et le PointSetManager
+    peut répondre 304 sans corps si le PointSet n'a pas changé.
+
     Args:
         idPointSet (str): L'UUID du PointSet.
+        validators (dict|None): validateurs du binaire déjà connu (clés
+            "etag" et "last_modified", None si absents), remplacés par ceux
+            de la réponse.
 
     Returns:
-        bytes: Le contenu binaire.
+        bytes|None: Le contenu binaire, ou None s'il n'a pas changé (304).
         
     """
     # Validation du format UUID
     try:
         uuid.UUID(str(idPointSet))
-    except ValueError as e:
-        raise Exception("INVALID_ID_FORMAT") from e
+    except ValueError:
+        raise InvalidIdError() from None
 
-    # Appel au service externe
+    headers = {}
+    if validators is not None:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    # Appel au service externe (connexion réutilisée depuis le pool)
     try:
-        response = requests.get(f"{POINT_SET_MANAGER_URL}/{idPointSet}", timeout=5)
+        response = _session.get(
+            f"{POINT_SET_MANAGER_URL}/{idPointSet}", headers=headers,
+            timeout=FETCH_TIMEOUT, stream=True
+        )
     except Exception as e:
         # Capture les timeouts et erreurs de connexion
-        raise Exception("NO_RESPONSE_SERVEUR") from e
+        raise PointSetManagerUnavailableError() from e
+
+    try:
+        # Gestion des codes HTTP
+        if response.status_code == 304 and headers:
+            # Binaire inchangé : aucun corps transféré
+            return None
+        elif response.status_code == 404:
+            raise PointSetNotFoundError()
+        elif response.status_code != 200:
+            # Cas générique pour autres erreurs serveur
+            raise PointSetManagerUnavailableError()
+
+        if validators is not None:
+            validators["etag"] = response.headers.get("ETag")
+            validators["last_modified"] = response.headers.get("Last-Modified")
+        try:
+            return _readBody(response)
+        except Exception as e:
+            raise PointSetManagerUnavailableError() from e
+    finally:
+        # Rend la connexion au pool
+        response.close()
+
+class PointSet:
+    """Ensemble de points décodé et validé, stocké sous forme binaire compacte.
+
+    Le binaire au format PointSet (nombre de points puis X, Y en float32)
+    est conservé tel quel : 8 octets par point, et bytes(point_set) ou
+    point_set.buffer() le restituent sans conversion (memoryview(point_set)
+    aussi, à partir de Python 3.12).
+    Les coordonnées sont lues directement dans ce buffer. triangulation()
+    utilise un PointSet tel quel, sans refaire les vérifications.
+
+    Attributes:
+        data (bytes|buffer): binaire au format PointSet (ou buffer en
+            lecture, par exemple un fichier projeté en mémoire).
+        coords (memoryview|array): coordonnées float32 à plat
+            [x0, y0, x1, y1, ...], vue sur data.
+        bbox (tuple): boîte englobante (xmin, ymin, xmax, ymax).
+        duplicates (int): nombre de points identiques à un autre point.
+        witness (tuple): indices de trois points non alignés.
+
+    """
+
+    __slots__ = ("data", "coords", "bbox", "duplicates", "witness")
+
+    def __init__(self, data, point_error=InvalidPointError):
+        """Vérifie un binaire PointSet dont la taille est déjà contrôlée.
+
+        Args:
+            data (bytes): binaire au format PointSet.
+            point_error (type): erreur levée pour une coordonnée NaN ou
+                Inf.
+
+        """
+        self.data = data
+        if sys.byteorder == "little":
+            # Vue sans copie sur le bloc des coordonnées
+            self.coords = memoryview(data)[4:].cast('f')
+        else:
+            self.coords = array('f')
+            self.coords.frombytes(memoryview(data)[4:])
+            self.coords.byteswap()
+        self.bbox, self.duplicates, self.witness = _validatePoints(
+            self.coords, point_error
+        )
+
+    @classmethod
+    def fromBytes(cls, byteResponse, copy=True):
+        """Décode et valide le binaire renvoyé par le PointSetManager.
+
+        Format: 
+            [NbPoints (4 bytes)] + [X (4 bytes) Y (4 bytes)] * NbPoints
+
+        Args:
+            byteResponse (str|bytes): Les bytes représentant une liste de point.
+            copy (bool): copie le binaire dans un objet bytes ; sinon le
+                PointSet lit directement dans le buffer fourni, qui doit
+                rester ouvert et inchangé tant qu'il est utilisé.
+
+        Returns:
+            PointSet: les points de byteResponse.
+
+        """
+        # Vérification minimale de la taille (au moins 4 bytes pour le nombre de points)
+        if len(byteResponse) < 4:
+            raise InvalidResponseFormatError()
+
+        try:
+            # Lecture du nombre de points (Little Endian 'I' = unsigned int)
+            num_points = struct.unpack_from('<I', byteResponse, 0)[0]
+        except struct.error:
+            raise DecodeError() from None
+
+        expected_size = 4 + (num_points * 8)
+        if len(byteResponse) != expected_size:
+            raise DecodeError()
+
+        # Une seule copie (aucune si byteResponse est déjà un objet bytes)
+        data = bytes(byteResponse) if copy else byteResponse
+        return cls(data, point_error=DecodeError)
+
+    @classmethod
+    def fromPoints(cls, points):
+        """Construit un PointSet à partir de points Python.
+
+        Args:
+            points (list|array): liste des points (x, y), ou coordonnées à
+                plat [x0, y0, x1, y1, ...].
+
+        Returns:
+            PointSet: les points, convertis en float32.
+
+        """
+        if not isinstance(points, array):
+            if len(points) < 3:
+                raise InvalidPointSetError()
+            # Vérification des coordonnées invalides dans la liste brute
+            for p in points:
+                if not (isinstance(p[0], (int, float))
+                        and isinstance(p[1], (int, float))):
+                    raise InvalidPointError()
+            points = (c for p in points for c in p)
+        coords = array('f', points)
+        if len(coords) % 2:
+            raise InvalidPointSetError()
+        if sys.byteorder == "big":
+            coords.byteswap()
+        return cls(struct.pack('<I', len(coords) // 2) + coords.tobytes())
+
+    def __len__(self):
+        """Renvoie le nombre de points."""
+        return len(self.coords) // 2
+
+    def __bytes__(self):
+        """Renvoie le binaire au format PointSet."""
+        return bytes(self.data)
+
+    def buffer(self):
+        """Renvoie une vue sans copie sur le binaire au format PointSet.
+
+        Returns:
+            memoryview: vue en lecture seule sur data.
+
+        """
+        return memoryview(self.data).toreadonly()
 
-    # Gestion des codes HTTP
-    if response.status_code == 404:
-        raise Exception("NO_POINTSET_FOUND")
-    elif response.status_code != 200:
-        # Cas générique pour autres erreurs serveur
-        raise Exception("NO_RESPONSE_SERVEUR")
+    def __buffer__(self, flags):
+        """Expose le binaire au format PointSet (protocole buffer, Python 3.12+).
 
-    return response.content
+        Args:
+            flags (int): options de la requête de buffer.
 
-def parsePointSet(byteResponse):
-    """Transforme la réponse binaire en liste de tuples (x, y).
+        Returns:
+            memoryview: vue en lecture seule sur data.
 
-    Format: 
-        [NbPoints (4 bytes)] + [X (4 bytes) Y (4 bytes)] * NbPoints
+        """
+        return self.buffer()
+
+
+def _validatePoints(coords, point_error):
+    """Vérifie des coordonnées à plat en une seule étape.
+
+    Toutes les vérifications sont faites ici, une seule fois : finitude
+    des coordonnées, boîte englobante, comptage des doublons et recherche
+    de trois points non alignés. Chaque statistique est calculée par une
+    fonction native (sum, min, max, set) plutôt que dans une boucle Python.
+
+    Args:
+        coords (memoryview|array): coordonnées float32 à plat.
+        point_error (type): erreur levée pour une coordonnée NaN ou Inf.
+
+    Returns:
+        tuple: (boîte englobante, nombre de doublons, témoin de
+        non-alignement).
+
+    """
+    # La somme (en double, sans dépassement possible) n'est finie que si
+    # toutes les coordonnées le sont
+    if not math.isfinite(sum(coords)):
+        raise point_error()
+
+    n = len(coords) // 2
+    if n < 3:
+        raise InvalidPointSetError()
+
+    xs = coords[0::2]
+    ys = coords[1::2]
+    bbox = (min(xs), min(ys), max(xs), max(ys))
+    if bbox[0] == bbox[2] or bbox[1] == bbox[3]:
+        # Tous les points sur une même verticale ou horizontale
+        raise InvalidPointSetError()
+
+    # Un point float32 tient sur 8 octets : on compare les points comme
+    # entiers 64 bits (motifs binaires : 0.0 et -0.0 restent distincts)
+    with memoryview(coords) as raw, raw.cast('B') as flat, flat.cast('Q') as keys:
+        duplicates = n - len(set(keys))
+
+    # Témoin de non-dégénérescence : le premier point, le premier point
+    # distinct de celui-ci, puis le premier point non aligné avec les deux
+    x0, y0 = xs[0], ys[0]
+    i1 = next(i for i in range(1, n) if xs[i] != x0 or ys[i] != y0)
+    x1, y1 = xs[i1], ys[i1]
+    for i2 in range(i1 + 1, n):
+        if _orient(x0, y0, x1, y1, xs[i2], ys[i2]) != 0:
+            return bbox, duplicates, (0, i1, i2)
+    raise InvalidPointSetError()
+
+
+def parsePointSet(byteResponse, copy=True):
+    """Transforme la réponse binaire en PointSet validé.
+
+    Adaptateur de PointSet.fromBytes.
     
     Args:
         byteResponse (str|bytes): Les bytes représentant une liste de point.
+        copy (bool): copie le binaire (voir PointSet.fromBytes) ; False
+            quand l'appelant possède le buffer et ne le modifie plus.
         
     Returns:
-        points: liste des points de byteResponse.
+        points (PointSet): les points de byteResponse.
         
     """
-    # Vérification minimale de la taille (au moins 4 bytes pour le nombre de points)
-    if len(byteResponse) < 4:
-        raise Exception("INVALID_RESPONSE_FORMAT")
+    return PointSet.fromBytes(byteResponse, copy=copy)
 
-    try:
-        # Lecture du nombre de points (Little Endian 'I' = unsigned int)
-        num_points = struct.unpack_from('<I', byteResponse, 0)[0]
-        
-        expected_size = 4 + (num_points * 8)
-        if len(byteResponse) != expected_size:
-            raise Exception("DECODE_ERROR")
-
-        points = []
-        offset = 4
-        for _ in range(num_points):
-            # Lecture de X et Y (Little Endian 'f' = float)
-            x, y = struct.unpack_from('<ff', byteResponse, offset)
-            
-            # Vérification de la validité des coordonnées (NaN ou Inf)
-            if not math.isfinite(x) or not math.isfinite(y):
-                raise Exception("DECODE_ERROR")
-            
-            points.append((x, y))
-            offset += 8
-            
-        return points
-
-    except struct.error as e:
-        raise Exception("DECODE_ERROR") from e
-
-
-def _add_triangle(liste, p1, p2, p3):
+
+def _add_triangle(liste, i1, i2, i3):
     """Fonction helper isolée pour permettre le mock.
     
     Args:
-        liste (list): liste contenant tous les différents triangles.
-        p1 (tuple): tuple représentant un point.
-        p2 (tuple): tuple représentant un point.
-        p3 (tuple): tuple représentant un point.
+        liste (array): indices à plat de tous les différents triangles.
+        i1 (int): indice du premier sommet.
+        i2 (int): indice du deuxième sommet.
+        i3 (int): indice du troisième sommet.
         
     """
-    liste.append((p1, p2, p3))
+    liste.extend((i1, i2, i3))
     
-def triangulation(points):
+# Bornes d'erreur des prédicats filtrés (Shewchuk), epsilon = 2^-53
+_CCW_ERRBOUND = (3.0 + 16.0 * 2.0 ** -53) * 2.0 ** -53
+_ICC_ERRBOUND = (10.0 + 96.0 * 2.0 ** -53) * 2.0 ** -53
+
+# Algorithmes disponibles pour triangulation()
+METHODS = ("delaunay", "fan")
+
+# Taille maximale (en octets) d'un morceau de réponse envoyé en flux
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Compressions disponibles pour les réponses, par ordre de préférence,
+# et leurs niveaux
+COMPRESSIONS = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Nombre de points en dessous duquel la triangulation reste sur un seul cœur
+PARALLEL_MIN_POINTS = 50_000
+# Marge relative exigée entre un cercle circonscrit et les bords de sa bande
+_STRIP_MARGIN = 1e-9
+
+
+def _orient(ax, ay, bx, by, cx, cy):
+    """Prédicat d'orientation robuste.
+
+    Le calcul flottant est utilisé tant qu'il est certain ; sinon le
+    déterminant est recalculé en arithmétique exacte.
+
+    Args:
+        ax (float): abscisse du point a.
+        ay (float): ordonnée du point a.
+        bx (float): abscisse du point b.
+        by (float): ordonnée du point b.
+        cx (float): abscisse du point c.
+        cy (float): ordonnée du point c.
+
+    Returns:
+        float: positif si a, b, c tournent dans le sens horaire,
+        négatif dans le sens trigonométrique, nul s'ils sont alignés.
+
+    """
+    detleft = (ay - cy) * (bx - cx)
+    detright = (ax - cx) * (by - cy)
+    det = detleft - detright
+    if abs(det) >= _CCW_ERRBOUND * abs(detleft + detright) and det != 0.0:
+        return det
+    ax, ay, bx, by, cx, cy = map(_exact, (ax, ay, bx, by, cx, cy))
+    det = (ay - cy) * (bx - cx) - (ax - cx) * (by - cy)
+    # Seul le signe compte : on évite un sous-dépassement lors du retour en float
+    return float((det > 0) - (det < 0))
+
+
+def _in_circle(ax, ay, bx, by, cx, cy, px, py):
+    """Prédicat robuste : p est-il strictement dans le cercle circonscrit de abc.
+
+    Args:
+        ax (float): abscisse du point a.
+        ay (float): ordonnée du point a.
+        bx (float): abscisse du point b.
+        by (float): ordonnée du point b.
+        cx (float): abscisse du point c.
+        cy (float): ordonnée du point c.
+        px (float): abscisse du point p.
+        py (float): ordonnée du point p.
+
+    Returns:
+        bool: True si p est à l'intérieur du cercle.
+
+    """
+    dx = ax - px
+    dy = ay - py
+    ex = bx - px
+    ey = by - py
+    fx = cx - px
+    fy = cy - py
+    ap = dx * dx + dy * dy
+    bp = ex * ex + ey * ey
+    cp = fx * fx + fy * fy
+    det = (dx * (ey * cp - bp * fy)
+           - dy * (ex * cp - bp * fx)
+           + ap * (ex * fy - ey * fx))
+    permanent = ((abs(ex * fy) + abs(fx * ey)) * ap
+                 + (abs(fx * dy) + abs(dx * fy)) * bp
+                 + (abs(dx * ey) + abs(ex * dy)) * cp)
+    if abs(det) > _ICC_ERRBOUND * permanent:
+        return det < 0
+    ax, ay, bx, by, cx, cy, px, py = map(_exact, (ax, ay, bx, by, cx, cy, px, py))
+    dx, dy, ex, ey, fx, fy = ax - px, ay - py, bx - px, by - py, cx - px, cy - py
+    ap = dx * dx + dy * dy
+    bp = ex * ex + ey * ey
+    cp = fx * fx + fy * fy
+    return (dx * (ey * cp - bp * fy)
+            - dy * (ex * cp - bp * fx)
+            + ap * (ex * fy - ey * fx)) < 0
+
+
+def _exact(value):
+    """Convertit un flottant en valeur exacte (int si possible, sinon Fraction).
+
+    Args:
+        value (float): coordonnée à convertir.
+
+    Returns:
+        int|Fraction: représentation exacte de la coordonnée.
+
+    """
+    if value.is_integer():
+        return int(value)
+    return Fraction(value)
+
+
+def _circumradius(ax, ay, bx, by, cx, cy):
+    """Carré du rayon du cercle circonscrit au triangle abc (inf si dégénéré).
+
+    Args:
+        ax (float): abscisse du sommet a.
+        ay (float): ordonnée du sommet a.
+        bx (float): abscisse du sommet b.
+        by (float): ordonnée du sommet b.
+        cx (float): abscisse du sommet c.
+        cy (float): ordonnée du sommet c.
+
+    Returns:
+        float: carré du rayon.
+
+    """
+    dx = bx - ax
+    dy = by - ay
+    ex = cx - ax
+    ey = cy - ay
+    den = dx * ey - dy * ex
+    if den == 0:
+        return math.inf
+    bl = dx * dx + dy * dy
+    cl = ex * ex + ey * ey
+    d = 0.5 / den
+    x = (ey * bl - dy * cl) * d
+    y = (dx * cl - ex * bl) * d
+    return x * x + y * y
+
+
+def _circumcenter(ax, ay, bx, by, cx, cy):
+    """Centre du cercle circonscrit au triangle abc.
+
+    Args:
+        ax (float): abscisse du sommet a.
+        ay (float): ordonnée du sommet a.
+        bx (float): abscisse du sommet b.
+        by (float): ordonnée du sommet b.
+        cx (float): abscisse du sommet c.
+        cy (float): ordonnée du sommet c.
+
+    Returns:
+        tuple: coordonnées (x, y) du centre.
+
+    """
+    dx = bx - ax
+    dy = by - ay
+    ex = cx - ax
+    ey = cy - ay
+    bl = dx * dx + dy * dy
+    cl = ex * ex + ey * ey
+    d = 0.5 / (dx * ey - dy * ex)
+    return ax + (ey * bl - dy * cl) * d, ay + (dx * cl - ex * bl) * d
+
+
+def _pseudo_angle(dx, dy):
+    """Valeur croissante avec l'angle de (dx, dy), dans [0, 1], sans trigonométrie.
+
+    Args:
+        dx (float): composante x du vecteur.
+        dy (float): composante y du vecteur.
+
+    Returns:
+        float: pseudo-angle.
+
+    """
+    s = abs(dx) + abs(dy)
+    if s == 0:
+        return 0.0
+    p = dx / s
+    return (3 - p if dy > 0 else 1 + p) / 4
+
+
+def hilbertOrder(coords, bbox=None):
+    """Ordonne des points le long d'une courbe de Hilbert.
+
+    Deux points proches dans l'ordre renvoyé sont proches dans le plan :
+    parcourir les points (ou les insérer) dans cet ordre garde le travail
+    local.
+
+    Args:
+        coords (array|list): coordonnées à plat [x0, y0, x1, y1, ...].
+        bbox (tuple): boîte englobante (xmin, ymin, xmax, ymax) si elle est
+            déjà connue, recalculée sinon.
+
+    Returns:
+        array: permutation des indices des points, en array('I') ; le k-ième
+        point de l'ordre de Hilbert est le point order[k].
+
+    """
+    keys = _hilbertKeys(coords, bbox)
+    return array('I', sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def _hilbertKeys(coords, bbox=None):
+    """Détermine la position de chaque point sur une courbe de Hilbert 2^16 x 2^16.
+
+    Les coordonnées sont ramenées sur une grille de 16 bits par axe, puis
+    les clés de tous les points sont calculées en même temps : chaque
+    point occupe un couloir de 32 bits d'un seul grand entier, sur lequel
+    les opérations bit à bit du calcul sans branchement de la clé
+    (préfixe parallèle, puis entrelacement des bits) agissent d'un coup.
+    Les décalages vers la droite débordent sur le couloir voisin, d'où le
+    masque appliqué après chacun.
+
+    Args:
+        coords (array|list): coordonnées à plat [x0, y0, x1, y1, ...].
+        bbox (tuple): boîte englobante (xmin, ymin, xmax, ymax), ou None.
+
+    Returns:
+        array: clé de chaque point, en array('I').
+
+    """
+    xs = coords[0::2]
+    ys = coords[1::2]
+    n = len(xs)
+    if bbox is None:
+        bbox = (min(xs), min(ys), max(xs), max(ys)) if n else (0, 0, 0, 0)
+    min_x, min_y, max_x, max_y = bbox
+    sx = 65535 / (max_x - min_x) if max_x > min_x else 0.0
+    sy = 65535 / (max_y - min_y) if max_y > min_y else 0.0
+
+    def pack(values):
+        lanes = array('I', values)
+        if sys.byteorder == "big":
+            lanes.byteswap()
+        return int.from_bytes(lanes, "little")
+
+    x = pack([int((v - min_x) * sx) for v in xs])
+    y = pack([int((v - min_y) * sy) for v in ys])
+
+    def lanes(pattern):
+        return int.from_bytes(struct.pack('<I', pattern) * n, "little")
+
+    m16 = lanes(0xFFFF)
+
+    a = x ^ y
+    b = m16 ^ a
+    c = m16 ^ (x | y)
+    d = x & (y ^ m16)
+    A = a | (b >> 1 & m16)
+    B = (a >> 1 & m16) ^ a
+    C = (c >> 1 & m16) ^ (b & (d >> 1 & m16)) ^ c
+    D = (a & (c >> 1 & m16)) ^ (d >> 1 & m16) ^ d
+
+    for shift in (2, 4):
+        a, b, c, d = A, B, C, D
+        A = (a & (a >> shift & m16)) ^ (b & (b >> shift & m16))
+        B = (a & (b >> shift & m16)) ^ (b & ((a ^ b) >> shift & m16))
+        C ^= (a & (c >> shift & m16)) ^ (b & (d >> shift & m16))
+        D ^= (b & (c >> shift & m16)) ^ ((a ^ b) & (d >> shift & m16))
+
+    a, b, c, d = A, B, C, D
+    C ^= (a & (c >> 8 & m16)) ^ (b & (d >> 8 & m16))
+    D ^= (b & (c >> 8 & m16)) ^ ((a ^ b) & (d >> 8 & m16))
+
+    a = C ^ (C >> 1 & m16)
+    b = D ^ (D >> 1 & m16)
+    i0 = x ^ y
+    i1 = b | (m16 ^ (i0 | a))
+
+    def interleave(v):
+        v = (v | v << 8) & lanes(0x00FF00FF)
+        v = (v | v << 4) & lanes(0x0F0F0F0F)
+        v = (v | v << 2) & lanes(0x33333333)
+        return (v | v << 1) & lanes(0x55555555)
+
+    keys = array('I')
+    keys.frombytes((interleave(i1) << 1 | interleave(i0)).to_bytes(4 * n, "little"))
+    if sys.byteorder == "big":
+        keys.byteswap()
+    return keys
+
+
+def _delaunay(coords, bbox=None):
+    """Triangulation de Delaunay par balayage radial (sweep-hull), en O(n log n).
+
+    Les points sont insérés par distance croissante au centre d'un triangle
+    graine ; chaque point est relié à la partie visible de l'enveloppe
+    convexe, puis la condition de Delaunay est rétablie par retournement
+    d'arêtes. Seuls les points exactement dupliqués sont ignorés : les
+    prédicats étant exacts, aucune tolérance dépendant de l'échelle n'est
+    appliquée.
+
+    Args:
+        coords (list): coordonnées à plat [x0, y0, x1, y1, ...].
+        bbox (tuple): boîte englobante (xmin, ymin, xmax, ymax) si elle est
+            déjà connue, recalculée sinon.
+
+    Returns:
+        tuple: (triangles, halfedges) ; triangles est la liste à plat des
+        indices des sommets (3 par triangle), halfedges[e] l'indice de la
+        demi-arête opposée à e, ou -1 sur l'enveloppe convexe. Les deux
+        listes sont vides si tous les points sont alignés.
+
+    Raises:
+        TriangulationError: un point distinct des précédents n'a pu être
+            relié à l'enveloppe (il n'est jamais ignoré silencieusement).
+
+    """
+    n = len(coords) >> 1
+    xs = coords[0::2]
+    ys = coords[1::2]
+
+    if bbox is None:
+        bbox = (min(xs), min(ys), max(xs), max(ys))
+    min_x, min_y, max_x, max_y = bbox
+    cx = (min_x + max_x) / 2
+    cy = (min_y + max_y) / 2
+
+    # Graine : le point le plus proche du centre de la boîte englobante
+    i0 = min(range(n), key=lambda i: (xs[i] - cx) ** 2 + (ys[i] - cy) ** 2)
+    i0x, i0y = xs[i0], ys[i0]
+
+    # Le point (distinct) le plus proche de la graine
+    i1, min_dist = -1, math.inf
+    for i in range(n):
+        d = (xs[i] - i0x) ** 2 + (ys[i] - i0y) ** 2
+        if 0 < d < min_dist:
+            i1, min_dist = i, d
+    if i1 == -1:
+        return [], []
+    i1x, i1y = xs[i1], ys[i1]
+
+    # Le troisième point formant le plus petit cercle circonscrit
+    i2, min_radius = -1, math.inf
+    for i in range(n):
+        if i in (i0, i1):
+            continue
+        r = _circumradius(i0x, i0y, i1x, i1y, xs[i], ys[i])
+        if r < min_radius:
+            i2, min_radius = i, r
+    if min_radius == math.inf:
+        # Tous les points sont alignés
+        return [], []
+    i2x, i2y = xs[i2], ys[i2]
+
+    if _orient(i0x, i0y, i1x, i1y, i2x, i2y) < 0:
+        i1, i2 = i2, i1
+        i1x, i1y, i2x, i2y = i2x, i2y, i1x, i1y
+
+    ccx, ccy = _circumcenter(i0x, i0y, i1x, i1y, i2x, i2y)
+    dists = [(xs[i] - ccx) ** 2 + (ys[i] - ccy) ** 2 for i in range(n)]
+    ids = sorted(range(n), key=dists.__getitem__)
+
+    max_triangles = max(2 * n - 5, 1)
+    triangles = [0] * (max_triangles * 3)
+    halfedges = [-1] * (max_triangles * 3)
+    hull_prev = [0] * n
+    hull_next = [0] * n
+    hull_tri = [0] * n
+    hash_size = max(math.ceil(math.sqrt(n)), 1)
+    hull_hash = [-1] * hash_size
+
+    def hash_key(x, y):
+        return int(_pseudo_angle(x - ccx, y - ccy) * hash_size) % hash_size
+
+    tlen = 0
+    hull_start = i0
+    edge_stack = []
+
+    def add_triangle(p0, p1, p2, a, b, c):
+        nonlocal tlen
+        t = tlen
+        triangles[t] = p0
+        triangles[t + 1] = p1
+        triangles[t + 2] = p2
+        halfedges[t] = a
+        if a != -1:
+            halfedges[a] = t
+        halfedges[t + 1] = b
+        if b != -1:
+            halfedges[b] = t + 1
+        halfedges[t + 2] = c
+        if c != -1:
+            halfedges[c] = t + 2
+        tlen = t + 3
+        return t
+
+    def inserted_duplicate(k, x, y):
+        # Un doublon d'un point déjà inséré est à la même distance du centre :
+        # il suffit de chercher parmi la graine et les ex æquo précédents
+        for s in (i0, i1, i2):
+            if xs[s] == x and ys[s] == y:
+                return True
+        d = dists[ids[k]]
+        j = k - 1
+        while j >= 0 and dists[ids[j]] == d:
+            if xs[ids[j]] == x and ys[ids[j]] == y:
+                return True
+            j -= 1
+        return False
+
+    def legalize(a):
+        # Le test du cercle circonscrit est déroulé ici (chemin critique) ;
+        # _in_circle n'est appelé que si le calcul flottant est incertain.
+        ar = 0
+        while True:
+            b = halfedges[a]
+            a0 = a - a % 3
+            ar = a0 + (a + 2) % 3
+            if b == -1:
+                if not edge_stack:
+                    break
+                a = edge_stack.pop()
+                continue
+
+            b0 = b - b % 3
+            al = a0 + (a + 1) % 3
+            bl = b0 + (b + 2) % 3
+            p0 = triangles[ar]
+            pr = triangles[a]
+            pl = triangles[al]
+            p1 = triangles[bl]
+
+            px = xs[p1]
+            py = ys[p1]
+            dx = xs[p0] - px
+            dy = ys[p0] - py
+            ex = xs[pr] - px
+            ey = ys[pr] - py
+            fx = xs[pl] - px
+            fy = ys[pl] - py
+            ap = dx * dx + dy * dy
+            bp = ex * ex + ey * ey
+            cp = fx * fx + fy * fy
+            det = (cp * (dx * ey - dy * ex) + bp * (dy * fx - dx * fy)
+                   + ap * (ex * fy - ey * fx))
+            # Majorant grossier mais sans appel à abs() : permanent <= s * s
+            s = ap + bp + cp
+            bound = _ICC_ERRBOUND * s * s
+            if det > bound:
+                illegal = False
+            elif det < -bound:
+                illegal = True
+            else:
+                illegal = _in_circle(xs[p0], ys[p0], xs[pr], ys[pr],
+                                     xs[pl], ys[pl], px, py)
+
+            if illegal:
+                triangles[a] = p1
+                triangles[b] = p0
+                hbl = halfedges[bl]
+                if hbl == -1:
+                    # Arête retournée de l'autre côté de l'enveloppe (rare)
+                    e = hull_start
+                    while True:
+                        if hull_tri[e] == bl:
+                            hull_tri[e] = a
+                            break
+                        e = hull_prev[e]
+                        if e == hull_start:
+                            break
+                halfedges[a] = hbl
+                if hbl != -1:
+                    halfedges[hbl] = a
+                har = halfedges[ar]
+                halfedges[b] = har
+                if har != -1:
+                    halfedges[har] = b
+                halfedges[ar] = bl
+                halfedges[bl] = ar
+                edge_stack.append(b0 + (b + 1) % 3)
+            else:
+                if not edge_stack:
+                    break
+                a = edge_stack.pop()
+        return ar
+
+    hull_next[i0] = hull_prev[i2] = i1
+    hull_next[i1] = hull_prev[i0] = i2
+    hull_next[i2] = hull_prev[i1] = i0
+    hull_tri[i0], hull_tri[i1], hull_tri[i2] = 0, 1, 2
+    hull_hash[hash_key(i0x, i0y)] = i0
+    hull_hash[hash_key(i1x, i1y)] = i1
+    hull_hash[hash_key(i2x, i2y)] = i2
+    add_triangle(i0, i1, i2, -1, -1, -1)
+
+    xp = yp = None
+    for k, i in enumerate(ids):
+        x = xs[i]
+        y = ys[i]
+        # Doublon exact du point précédent ignoré
+        if x == xp and y == yp:
+            continue
+        xp, yp = x, y
+        if i in (i0, i1, i2):
+            continue
+
+        # Recherche d'une arête visible de l'enveloppe via la table de hachage
+        start = 0
+        key = hash_key(x, y)
+        for j in range(hash_size):
+            start = hull_hash[(key + j) % hash_size]
+            if start != -1 and start != hull_next[start]:
+                break
+
+        start = hull_prev[start]
+        e = start
+        while True:
+            q = hull_next[e]
+            if _orient(x, y, xs[e], ys[e], xs[q], ys[q]) < 0:
+                break
+            e = q
+            if e == start:
+                e = -1
+                break
+        if e == -1:
+            # Aucune arête visible : seul un doublon exact est attendu ici
+            if inserted_duplicate(k, x, y):
+                continue
+            raise TriangulationError()
+
+        # Premier triangle depuis le point, puis retournements
+        t = add_triangle(e, i, hull_next[e], -1, -1, hull_tri[e])
+        hull_tri[i] = legalize(t + 2)
+        hull_tri[e] = t
+
+        # Parcours de l'enveloppe vers l'avant
+        nxt = hull_next[e]
+        while True:
+            q = hull_next[nxt]
+            if _orient(x, y, xs[nxt], ys[nxt], xs[q], ys[q]) >= 0:
+                break
+            t = add_triangle(nxt, i, q, hull_tri[i], -1, hull_tri[nxt])
+            hull_tri[i] = legalize(t + 2)
+            hull_next[nxt] = nxt  # marqué comme retiré
+            nxt = q
+
+        # Parcours de l'enveloppe vers l'arrière
+        if e == start:
+            while True:
+                q = hull_prev[e]
+                if _orient(x, y, xs[q], ys[q], xs[e], ys[e]) >= 0:
+                    break
+                t = add_triangle(q, i, e, -1, hull_tri[e], hull_tri[q])
+                legalize(t + 2)
+                hull_tri[q] = t
+                hull_next[e] = e  # marqué comme retiré
+                e = q
+
+        # Mise à jour de l'enveloppe
+        hull_start = hull_prev[i] = e
+        hull_next[e] = hull_prev[nxt] = i
+        hull_next[i] = nxt
+        hull_hash[hash_key(x, y)] = i
+        hull_hash[hash_key(xs[e], ys[e])] = e
+
+    del triangles[tlen:]
+    del halfedges[tlen:]
+    return triangles, halfedges
+
+
+def _parallelDelaunay(points, workers):
+    """Triangulation de Delaunay répartie sur plusieurs processus.
+
+    Les points sont triés par abscisse puis découpés en bandes verticales
+    de même effectif, triangulées chacune par _delaunay dans un pool de
+    processus ; les coordonnées triées transitent par mémoire partagée.
+    Un triangle dont le cercle circonscrit reste strictement dans sa bande
+    ne contient aucun point des autres bandes : il appartient donc à la
+    triangulation globale et est conservé tel quel. Les sommets des autres
+    triangles et ceux des enveloppes des bandes forment la couture, qui est
+    re-triangulée en série ; on n'en garde que les triangles situés hors de
+    la zone déjà couverte.
+
+    En position générale (triangulation de Delaunay unique), les triangles
+    obtenus sont ceux du moteur série, dans un autre ordre.
+
+    Args:
+        points (PointSet): les points à trianguler, sans doublon.
+        workers (int): nombre de processus (et de bandes).
+
+    Returns:
+        array: indices à plat des sommets des triangles, en array('I'), ou
+        None si une bande est dégénérée (le calcul doit alors être fait en
+        série).
+
+    """
+    coords = points.coords
+    n = len(coords) >> 1
+    xs = coords[0::2]
+    order = sorted(range(n), key=xs.__getitem__)
+
+    shm = shared_memory.SharedMemory(create=True, size=12 * n)
+    try:
+        with shm.buf[:8 * n].cast('f') as sorted_coords:
+            for k, i in enumerate(order):
+                sorted_coords[2 * k] = coords[2 * i]
+                sorted_coords[2 * k + 1] = coords[2 * i + 1]
+        with shm.buf[8 * n:].cast('I') as permutation:
+            permutation[:] = array('I', order)
+
+        # Bornes de chaque bande : abscisses des derniers points voisins
+        bounds = [n * k // workers for k in range(workers + 1)]
+        jobs = []
+        for k in range(workers):
+            start, end = bounds[k], bounds[k + 1]
+            left = xs[order[start - 1]] if k > 0 else -math.inf
+            right = xs[order[end]] if k < workers - 1 else math.inf
+            jobs.append((shm.name, n, start, end, left, right))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_triangulateStrip, *job) for job in jobs]
+            strips = [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if None in strips:
+        return None
+
+    triangles = array('I')
+    seam = set()
+    barrier = set()
+    for final, vertices, edges in strips:
+        triangles.frombytes(final)
+        seam.update(array('I', vertices))
+        edges = array('I', edges)
+        barrier.update(zip(edges[0::2], edges[1::2], strict=True))
+
+    # Re-triangulation de la couture
+    seam = sorted(seam)
+    seam_coords = []
+    for i in seam:
+        seam_coords.append(coords[2 * i])
+        seam_coords.append(coords[2 * i + 1])
+    seam_triangles, seam_halfedges = _delaunay(seam_coords)
+
+    # Un triangle de la couture qui partage une arête orientée avec un
+    # triangle conservé le recouvre ; la zone recouverte se propage ensuite
+    # à travers les arêtes qui ne bordent aucun triangle conservé.
+    covered = bytearray(len(seam_triangles) // 3)
+    stack = []
+    for t in range(len(covered)):
+        for k in range(3):
+            a = seam[seam_triangles[3 * t + k]]
+            b = seam[seam_triangles[3 * t + (k + 1) % 3]]
+            if (a, b) in barrier:
+                covered[t] = 1
+                stack.append(t)
+                break
+    while stack:
+        t = stack.pop()
+        for e in range(3 * t, 3 * t + 3):
+            opposite = seam_halfedges[e]
+            if opposite == -1 or covered[opposite // 3]:
+                continue
+            a = seam[seam_triangles[e]]
+            b = seam[seam_triangles[opposite]]
+            if (a, b) in barrier or (b, a) in barrier:
+                continue
+            covered[opposite // 3] = 1
+            stack.append(opposite // 3)
+
+    for t, skip in enumerate(covered):
+        if not skip:
+            triangles.extend(seam[i] for i in seam_triangles[3 * t:3 * t + 3])
+    return triangles
+
+
+def _triangulateStrip(shm_name, n, start, end, left, right):
+    """Triangule une bande de points dans un processus du pool.
+
+    Args:
+        shm_name (str): nom de la mémoire partagée contenant les coordonnées
+            triées par abscisse (float32) suivies de la permutation (uint32).
+        n (int): nombre total de points.
+        start (int): rang du premier point de la bande.
+        end (int): rang suivant le dernier point de la bande.
+        left (float): abscisse du dernier point de la bande précédente.
+        right (float): abscisse du premier point de la bande suivante.
+
+    Returns:
+        tuple: (triangles, couture, arêtes) en binaires array('I') d'indices
+        globaux : triangles conservés, sommets à re-trianguler et arêtes
+        orientées des triangles conservés reliant deux de ces sommets ;
+        None si les points de la bande sont alignés.
+
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        with shm.buf[:8 * n].cast('f') as sorted_coords:
+            coords = sorted_coords[2 * start:2 * end].tolist()
+        with shm.buf[8 * n:].cast('I') as permutation:
+            ids = permutation[start:end].tolist()
+    finally:
+        shm.close()
+
+    triangles, halfedges = _delaunay(coords)
+    if not triangles:
+        return None
+
+    final = []
+    seam = set()
+    for t in range(0, len(triangles), 3):
+        a, b, c = triangles[t:t + 3]
+        ax, ay = coords[2 * a], coords[2 * a + 1]
+        bx, by = coords[2 * b], coords[2 * b + 1]
+        cx, cy = coords[2 * c], coords[2 * c + 1]
+        try:
+            ccx, ccy = _circumcenter(ax, ay, bx, by, cx, cy)
+        except ZeroDivisionError:
+            seam.update((a, b, c))
+            continue
+        r = math.sqrt((ax - ccx) ** 2 + (ay - ccy) ** 2)
+        margin = _STRIP_MARGIN * (abs(ccx) + r)
+        if left < ccx - r - margin and ccx + r + margin < right:
+            final.append(t)
+        else:
+            seam.update((a, b, c))
+    for e, opposite in enumerate(halfedges):
+        if opposite == -1:
+            seam.add(triangles[e])
+
+    kept = array('I')
+    edges = array('I')
+    for t in final:
+        kept.extend(ids[i] for i in triangles[t:t + 3])
+        for k in range(3):
+            a = triangles[t + k]
+            b = triangles[t + (k + 1) % 3]
+            if a in seam and b in seam:
+                edges.extend((ids[a], ids[b]))
+    vertices = array('I', (ids[i] for i in seam))
+    return kept.tobytes(), vertices.tobytes(), edges.tobytes()
+
+
+class Triangulation:
+    """Résultat d'une triangulation : les points et les indices des triangles.
+
+    Les indices sont stockés à plat dans un array('I') (4 octets par
+    indice, 3 par triangle). bytes(triangulation) produit le binaire
+    Triangles de triangulator.yml par simple copie du buffer des points
+    puis de celui des indices.
+
+    Attributes:
+        points (PointSet): les points triangulés.
+        triangles (array): indices à plat des sommets des triangles.
+        halfedges (array): demi-arête opposée à chaque demi-arête (-1 sur
+            l'enveloppe convexe), conservées depuis _delaunay (None sinon).
+        index (PointLocator): index de localisation, construit à la demande
+            (None sinon).
+
+    """
+
+    __slots__ = ("points", "triangles", "halfedges", "index")
+
+    def __init__(self, points, triangles, halfedges=None):
+        """Initialise une triangulation à partir de résultats existants.
+
+        Args:
+            points (PointSet): les points triangulés.
+            triangles (array): indices à plat des sommets, en array('I').
+            halfedges (array): demi-arêtes opposées, en array('i'), si
+                elles sont connues.
+
+        """
+        self.points = points
+        self.triangles = triangles
+        self.halfedges = halfedges
+        self.index = None
+
+    @classmethod
+    def compute(cls, points, method="delaunay", index=False, workers=1,
+                reorder=False):
+        """Triangule un ensemble de points.
+
+        Args:
+            points (PointSet|list|array): PointSet renvoyé par parsePointSet
+                (utilisé sans nouvelle vérification), liste des points
+                (x, y) ou coordonnées à plat.
+            method (str): algorithme utilisé, "delaunay" (par défaut) ou
+                "fan" (éventail depuis le premier point).
+            index (bool): construit aussi l'index de localisation.
+            workers (int): nombre de processus pour la triangulation de
+                Delaunay ; au-delà de 1, les grands ensembles sans doublon
+                sont découpés en bandes triangulées en parallèle.
+            reorder (bool): trie les points le long d'une courbe de Hilbert
+                avant la triangulation de Delaunay (en série) ; les indices
+                renvoyés désignent toujours les points dans leur ordre
+                d'origine.
+
+        Returns:
+            Triangulation: les points et les triangles générés.
+
+        """
+        result = cls._compute(points, method, workers, reorder)
+        if index:
+            result.index = PointLocator(result)
+        return result
+
+    @classmethod
+    def _compute(cls, points, method, workers=1, reorder=False):
+        """Effectue le calcul de la triangulation (voir compute).
+
+        Args:
+            points (PointSet|list|array): points à trianguler.
+            method (str): algorithme utilisé.
+            workers (int): nombre de processus.
+            reorder (bool): trie d'abord les points selon la courbe de Hilbert.
+
+        Returns:
+            Triangulation: les points et les triangles générés.
+
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown triangulation method: {method}")
+
+        if not isinstance(points, PointSet):
+            points = PointSet.fromPoints(points)
+        coords = points.coords.tolist()
+
+        if method == "fan":
+            # Ici, on connecte le point 0 à tous les autres (0, i, i+1).
+            triangles = array('I')
+            try:
+                for i in range(1, len(coords) // 2 - 1):
+                    _add_triangle(triangles, 0, i, i + 1)
+            except Exception as e:
+                raise TriangulationError() from e
+            return cls(points, triangles)
+
+        if (workers > 1 and len(points) >= PARALLEL_MIN_POINTS
+                and not points.duplicates):
+            try:
+                triangles = _parallelDelaunay(points, workers)
+            except Exception as e:
+                raise TriangulationError() from e
+            if triangles is not None:
+                return cls(points, triangles)
+
+        # Triangulation de Delaunay
+        try:
+            if reorder:
+                order = hilbertOrder(points.coords, points.bbox)
+                xs, ys = points.coords[0::2], points.coords[1::2]
+                permuted = array('f', bytes(4 * len(coords)))
+                permuted[0::2] = array('f', [xs[i] for i in order])
+                permuted[1::2] = array('f', [ys[i] for i in order])
+                # Nouveaux flottants, alloués dans l'ordre de la courbe
+                coords = permuted.tolist()
+            indices, halfedges = _delaunay(coords, points.bbox)
+            if reorder:
+                # Retour aux indices d'origine (les demi-arêtes sont inchangées)
+                indices = [order[i] for i in indices]
+            triangles = array('I', indices)
+        except Exception as e:
+            raise TriangulationError() from e
+
+        if not triangles:
+            # Points alignés à la tolérance près
+            raise InvalidPointSetError()
+        return cls(points, triangles, array('i', halfedges))
+
+    def __len__(self):
+        """Renvoie le nombre de triangles."""
+        return len(self.triangles) // 3
+
+    def neighbours(self):
+        """Renvoie les triangles voisins de chaque triangle.
+
+        Returns:
+            array: voir computeNeighbours.
+
+        """
+        if self.halfedges is None:
+            self.halfedges = _buildHalfedges(self.triangles)
+        return computeNeighbours(self.triangles, self.halfedges)
+
+    def locate(self, probes):
+        """Renvoie le triangle contenant chacun des points sondés.
+
+        L'index de localisation est construit au premier appel s'il ne
+        l'a pas été par compute.
+
+        Args:
+            probes (list|array): points (x, y), ou coordonnées à plat.
+
+        Returns:
+            array: indice du triangle de chaque point (-1 hors de
+            l'enveloppe convexe), en array('i').
+
+        """
+        if self.index is None:
+            self.index = PointLocator(self)
+        return self.index.locateMany(probes)
+
+    def __bytes__(self):
+        """Renvoie le binaire au format Triangles."""
+        triangles = self.triangles
+        if sys.byteorder == "big":
+            triangles = array('I', triangles)
+            triangles.byteswap()
+        return b"".join((
+            self.points.data,
+            struct.pack('<I', len(self)),
+            memoryview(triangles).cast('B'),
+        ))
+
+    def buffer(self):
+        """Renvoie une vue sans copie sur les indices des triangles.
+
+        Le binaire Triangles complet (points puis indices) n'est pas
+        contigu en mémoire : bytes(triangulation) l'assemble.
+
+        Returns:
+            memoryview: vue en lecture seule sur triangles, au format 'I'
+            (uint32 dans l'ordre natif de la machine).
+
+        """
+        return memoryview(self.triangles).toreadonly()
+
+
+def triangulation(points, method="delaunay", workers=1, reorder=False,
+                  halfedges=False):
     """Calcule des triangles à partir d'une liste de points.
+
+    Adaptateur de Triangulation.compute.
     
     Args:
-        points (list): liste des points dont on veut déterminer les triangles.
+        points (PointSet|list|array): PointSet renvoyé par parsePointSet
+            (utilisé sans nouvelle vérification), liste des points (x, y)
+            ou coordonnées à plat.
+        method (str): algorithme utilisé, "delaunay" (par défaut) ou "fan"
+            (éventail depuis le premier point).
+        workers (int): nombre de processus pour la triangulation de Delaunay.
+        reorder (bool): trie d'abord les points selon la courbe de Hilbert
+            (les indices renvoyés restent ceux de l'ordre d'origine).
+        halfedges (bool): renvoie aussi les demi-arêtes opposées calculées
+            par _delaunay, qui évitent de reconstruire l'adjacence.
     
     Returns:
-        triangles (list): liste des triangles générer.
+        triangles (array): indices des sommets des triangles générés, à plat
+        (3 entiers non signés 32 bits par triangle) ; avec halfedges, le
+        couple (triangles, demi-arêtes en array('i') ou None si la méthode
+        ne les fournit pas).
         
     """
-    # Vérifications préliminaires
-    if len(points) < 3:
-        raise Exception("INVALID_POINTSET")
-
-    # Vérification des coordonnées invalides dans la liste brute
-    for p in points:
-        if not (isinstance(p[0], (int, float)) and isinstance(p[1], (int, float))):
-             raise Exception("INVALID_POINT")
-        if not math.isfinite(p[0]) or not math.isfinite(p[1]):
-            raise Exception("INVALID_POINT")
-
-    # Vérification de la colinéarité
-    is_colinear = True
-    (x0, y0) = points[0]
-    (x1, y1) = points[1]
-    
-    # Vecteur directeur (dx, dy)
-    dx = x1 - x0
-    dy = y1 - y0
-
-    for i in range(2, len(points)):
-        xi, yi = points[i]
-        # Produit scalaire : (yi - y0) * dx - (xi - x0) * dy == 0
-        cross_product = (yi - y0) * dx - (xi - x0) * dy
-        # On utilise une petite tolérance pour les float (epsilon)
-        if abs(cross_product) > 1e-9:
-            is_colinear = False
-            break
-    
-    if is_colinear:
-        raise Exception("INVALID_POINTSET")
+    result = Triangulation.compute(points, method, workers=workers,
+                                   reorder=reorder)
+    if halfedges:
+        return result.triangles, result.halfedges
+    return result.triangles
 
-    # Algorithme de triangulation
-    # Ici, on connecte le point 0 à tous les autres (0, i, i+1).
-    triangles = []
-    try:
-        for i in range(1, len(points) - 1):
-            _add_triangle(triangles,points[0], points[i], points[i+1])
-    except Exception as e:
-        raise Exception("ERROR_TRIANGULATION") from e
 
+class IncrementalTriangulation:
+    """Triangulation de Delaunay modifiable par ajout de points.
+
+    Chaque point inséré est localisé par une marche à travers les
+    triangles depuis le dernier triangle modifié, puis relié à son
+    voisinage (découpe du triangle ou de l'arête qui le contient, ou
+    raccordement aux arêtes visibles de l'enveloppe convexe) ; la
+    condition de Delaunay est ensuite rétablie par retournement d'arêtes.
+    Le travail est local : des insertions proches les unes des autres ne
+    coûtent que quelques triangles chacune, sans recalcul complet.
+
+    Tous les triangles sont orientés comme ceux de _delaunay (_orient > 0).
+    Le résultat n'est de Delaunay que si la triangulation de départ l'est.
+
+    Attributes:
+        coords (array): coordonnées float32 à plat de tous les points.
+        triangles (array): indices à plat des sommets, en array('I').
+        halfedges (array): demi-arête opposée à chaque demi-arête (-1 sur
+            l'enveloppe convexe), en array('i').
+
+    """
+
+    __slots__ = ("coords", "triangles", "halfedges", "_last")
+
+    def __init__(self, points, triangles=None):
+        """Initialise la triangulation à partir d'un résultat existant.
+
+        Args:
+            points (Triangulation|PointSet|list|array): triangulation de
+                départ, ou points à trianguler.
+            triangles (array|list): indices à plat des triangles existants
+                des points ; calculés par _delaunay si absents.
+
+        """
+        halfedges = None
+        if isinstance(points, Triangulation):
+            points, triangles, halfedges = (
+                points.points, points.triangles, points.halfedges
+            )
+        if not isinstance(points, PointSet):
+            points = PointSet.fromPoints(points)
+        self.coords = array('f', points.coords)
+        self._last = 0
+
+        if triangles is None:
+            indices, halfedges = _delaunay(self.coords.tolist(), points.bbox)
+            self.triangles = array('I', indices)
+            self.halfedges = array('i', halfedges)
+            return
+
+        self.triangles = array('I', triangles)
+        if halfedges is not None:
+            # Résultat de _delaunay : déjà orienté, demi-arêtes connues
+            self.halfedges = array('i', halfedges)
+            return
+        if len(self.triangles) % 3 != 0 or not self.triangles:
+            raise InvalidTriangleError()
+        if max(self.triangles) >= len(points):
+            raise InvalidTriangleError()
+        # Orientation commune à tous les triangles
+        coords, tri = self.coords, self.triangles
+        for t in range(0, len(tri), 3):
+            a, b, c = tri[t], tri[t + 1], tri[t + 2]
+            if _orient(coords[2 * a], coords[2 * a + 1], coords[2 * b],
+                       coords[2 * b + 1], coords[2 * c], coords[2 * c + 1]) < 0:
+                tri[t + 1], tri[t + 2] = c, b
+        self.halfedges = _buildHalfedges(tri)
+
+    def __len__(self):
+        """Renvoie le nombre de triangles."""
+        return len(self.triangles) // 3
+
+    def __bytes__(self):
+        """Renvoie le binaire au format Triangles."""
+        coords = self.coords
+        triangles = self.triangles
+        if sys.byteorder == "big":
+            coords = array('f', coords)
+            coords.byteswap()
+            triangles = array('I', triangles)
+            triangles.byteswap()
+        return b"".join((
+            struct.pack('<I', len(coords) // 2),
+            memoryview(coords).cast('B'),
+            struct.pack('<I', len(self)),
+            memoryview(triangles).cast('B'),
+        ))
+
+    def extend(self, points):
+        """Insère plusieurs points.
+
+        Les points reçoivent leurs indices dans l'ordre donné, mais sont
+        insérés le long d'une courbe de Hilbert : chaque marche part ainsi
+        d'un triangle voisin du point suivant.
+
+        Args:
+            points (iterable): points (x, y) à insérer.
+
+        """
+        first = len(self.coords) // 2
+        added = array('f')
+        for x, y in points:
+            self._checkPoint(x, y)
+            added.extend((x, y))
+        self.coords.extend(added)
+        for k in hilbertOrder(added):
+            self._insertIndex(first + k)
+
+    def insert(self, x, y):
+        """Insère un point et met à jour localement la triangulation.
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        Returns:
+            int: indice du nouveau point ; un point confondu avec un sommet
+            existant est conservé mais relié à aucun triangle.
+
+        """
+        self._checkPoint(x, y)
+        i = len(self.coords) // 2
+        self.coords.extend((x, y))
+        self._insertIndex(i)
+        return i
+
+    @staticmethod
+    def _checkPoint(x, y):
+        """Vérifie les coordonnées d'un point à insérer.
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        """
+        if not (isinstance(x, (int, float)) and isinstance(y, (int, float))):
+            raise InvalidPointError()
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise InvalidPointError()
+
+    def _insertIndex(self, i):
+        """Relie à la triangulation un point déjà ajouté aux coordonnées.
+
+        Args:
+            i (int): indice du point.
+
+        """
+        # Coordonnées arrondies en float32, comme celles déjà stockées
+        x, y = self.coords[2 * i], self.coords[2 * i + 1]
+
+        kind, e, self._last = self._locate(x, y)
+        if kind == "face":
+            self._splitTriangle(e, i)
+        elif kind == "edge":
+            self._splitEdge(e, i)
+        elif kind == "outside":
+            self._extendHull(e, i, x, y)
+
+    def locate(self, x, y, start=None):
+        """Renvoie le triangle contenant un point, par marche.
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+            start (int): triangle de départ de la marche (par défaut, le
+                dernier triangle modifié).
+
+        Returns:
+            int: indice du triangle contenant le point (bord compris), ou
+            -1 si le point est hors de l'enveloppe convexe.
+
+        """
+        # Lecture seule : plusieurs requêtes peuvent partager la triangulation
+        kind, _, t = self._locate(x, y, start)
+        return -1 if kind == "outside" else t
+
+    def _orientEdge(self, e, x, y):
+        """Orientation du point (x, y) par rapport à la demi-arête e.
+
+        Args:
+            e (int): indice de la demi-arête.
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        Returns:
+            float: positif du côté du triangle de e, négatif de l'autre
+            côté, nul sur la droite portant e.
+
+        """
+        coords, tri = self.coords, self.triangles
+        a = tri[e]
+        b = tri[e - e % 3 + (e + 1) % 3]
+        return _orient(coords[2 * a], coords[2 * a + 1],
+                       coords[2 * b], coords[2 * b + 1], x, y)
+
+    def _locate(self, x, y, start=None):
+        """Localise un point par marche à travers les triangles.
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+            start (int): triangle de départ de la marche (par défaut, le
+                dernier triangle modifié).
+
+        Returns:
+            tuple: (type, valeur, triangle où la marche s'est arrêtée), le
+            couple (type, valeur) valant ("face", triangle), ("edge",
+            demi-arête), ("vertex", sommet) ou ("outside", arête visible
+            de l'enveloppe).
+
+        """
+        n_triangles = len(self)
+        t = self._last if start is None else start
+        if not 0 <= t < n_triangles:
+            t = 0
+        # La marche termine toujours sur une triangulation de Delaunay ;
+        # la borne ne sert que si la triangulation de départ ne l'est pas
+        for _ in range(n_triangles + 1):
+            kind, value = self._classify(t, x, y)
+            if kind != "walk":
+                return kind, value, t
+            t = value
+        for t in range(n_triangles):
+            kind, value = self._classify(t, x, y)
+            if kind != "walk":
+                return kind, value, t
+        raise TriangulationError()
+
+    def _classify(self, t, x, y):
+        """Situe le point (x, y) par rapport au triangle t.
+
+        Args:
+            t (int): indice du triangle.
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        Returns:
+            tuple: comme _locate, ou ("walk", triangle voisin à visiter).
+
+        """
+        halfedges = self.halfedges
+        zeros = []
+        for e in range(3 * t, 3 * t + 3):
+            o = self._orientEdge(e, x, y)
+            if o < 0:
+                if halfedges[e] == -1:
+                    return "outside", e
+                return "walk", halfedges[e] // 3
+            if o == 0:
+                zeros.append(e)
+        if not zeros:
+            return "face", t
+        if len(zeros) == 1:
+            return "edge", zeros[0]
+        # Sur deux arêtes : le point est leur sommet commun
+        e = zeros[1] if zeros[0] + 1 == zeros[1] else zeros[0]
+        return "vertex", self.triangles[e]
+
+    def _addTriangle(self, a, b, c):
+        """Ajoute un triangle (a, b, c) sans voisin et renvoie son indice.
+
+        Args:
+            a (int): premier sommet.
+            b (int): deuxième sommet.
+            c (int): troisième sommet.
+
+        Returns:
+            int: indice du triangle.
+
+        """
+        self.triangles.extend((a, b, c))
+        self.halfedges.extend((-1, -1, -1))
+        return len(self.triangles) // 3 - 1
+
+    def _link(self, a, b):
+        """Relie deux demi-arêtes opposées (b peut valoir -1).
+
+        Args:
+            a (int): première demi-arête.
+            b (int): seconde demi-arête, ou -1.
+
+        """
+        self.halfedges[a] = b
+        if b != -1:
+            self.halfedges[b] = a
+
+    def _splitTriangle(self, t, i):
+        """Découpe le triangle t en trois autour du point i.
+
+        Args:
+            t (int): indice du triangle contenant le point.
+            i (int): indice du point.
+
+        """
+        tri, halfedges = self.triangles, self.halfedges
+        a, b, c = tri[3 * t], tri[3 * t + 1], tri[3 * t + 2]
+        h1, h2 = halfedges[3 * t + 1], halfedges[3 * t + 2]
+
+        # (a, b, c) devient (a, b, i), (b, c, i) et (c, a, i)
+        tri[3 * t + 2] = i
+        t1 = self._addTriangle(b, c, i)
+        t2 = self._addTriangle(c, a, i)
+        self._link(3 * t1, h1)
+        self._link(3 * t2, h2)
+        self._link(3 * t + 1, 3 * t1 + 2)
+        self._link(3 * t1 + 1, 3 * t2 + 2)
+        self._link(3 * t2 + 1, 3 * t + 2)
+        self._legalize((3 * t, 3 * t1, 3 * t2))
+
+    def _splitEdge(self, e, i):
+        """Découpe l'arête e (et ses un ou deux triangles) au point i.
+
+        Args:
+            e (int): demi-arête contenant le point.
+            i (int): indice du point.
+
+        """
+        tri, halfedges = self.triangles, self.halfedges
+        t = e // 3
+        e_next = 3 * t + (e + 1) % 3
+        e_prev = 3 * t + (e + 2) % 3
+        a, b, c = tri[e], tri[e_next], tri[e_prev]
+        f = halfedges[e]
+        h_next, h_prev = halfedges[e_next], halfedges[e_prev]
+
+        # (a, b, c) devient (b, c, i) et (c, a, i)
+        tri[3 * t], tri[3 * t + 1], tri[3 * t + 2] = b, c, i
+        t1 = self._addTriangle(c, a, i)
+        self._link(3 * t, h_next)
+        self._link(3 * t1, h_prev)
+        self._link(3 * t + 1, 3 * t1 + 2)
+        edges = [3 * t, 3 * t1]
+        if f == -1:
+            halfedges[3 * t1 + 1] = -1
+            halfedges[3 * t + 2] = -1
+            self._legalize(edges)
+            return
+
+        # Triangle voisin (b, a, d) : devient (a, d, i) et (d, b, i)
+        u = f // 3
+        f_next = 3 * u + (f + 1) % 3
+        f_prev = 3 * u + (f + 2) % 3
+        d = tri[f_prev]
+        g_next, g_prev = halfedges[f_next], halfedges[f_prev]
+        tri[3 * u], tri[3 * u + 1], tri[3 * u + 2] = a, d, i
+        u1 = self._addTriangle(d, b, i)
+        self._link(3 * u, g_next)
+        self._link(3 * u1, g_prev)
+        self._link(3 * u + 1, 3 * u1 + 2)
+        self._link(3 * t1 + 1, 3 * u + 2)
+        self._link(3 * u1 + 1, 3 * t + 2)
+        self._legalize([*edges, 3 * u, 3 * u1])
+
+    def _extendHull(self, e, i, x, y):
+        """Relie un point extérieur à toutes les arêtes de l'enveloppe qu'il voit.
+
+        Args:
+            e (int): arête de l'enveloppe visible depuis le point.
+            i (int): indice du point.
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        """
+        # Arêtes visibles contiguës, dans le sens de parcours de l'enveloppe
+        visible = [e]
+        q = self._prevHull(e)
+        while q != e and self._orientEdge(q, x, y) < 0:
+            visible.insert(0, q)
+            q = self._prevHull(q)
+        q = self._nextHull(e)
+        while q != visible[0] and self._orientEdge(q, x, y) < 0:
+            visible.append(q)
+            q = self._nextHull(q)
+
+        tri = self.triangles
+        edges = []
+        previous = -1
+        for h in visible:
+            a = tri[h]
+            b = tri[h - h % 3 + (h + 1) % 3]
+            t = self._addTriangle(b, a, i)
+            self._link(3 * t, h)
+            if previous != -1:
+                self._link(3 * previous + 2, 3 * t + 1)
+            previous = t
+            edges.append(3 * t)
+        self._legalize(edges)
+
+    def _nextHull(self, e):
+        """Renvoie l'arête de l'enveloppe qui suit l'arête e.
+
+        Args:
+            e (int): demi-arête de l'enveloppe.
+
+        Returns:
+            int: demi-arête de l'enveloppe partant de l'extrémité de e.
+
+        """
+        halfedges = self.halfedges
+        n = e - e % 3 + (e + 1) % 3
+        while halfedges[n] != -1:
+            h = halfedges[n]
+            n = h - h % 3 + (h + 1) % 3
+        return n
+
+    def _prevHull(self, e):
+        """Renvoie l'arête de l'enveloppe qui précède l'arête e.
+
+        Args:
+            e (int): demi-arête de l'enveloppe.
+
+        Returns:
+            int: demi-arête de l'enveloppe arrivant à l'origine de e.
+
+        """
+        halfedges = self.halfedges
+        p = e - e % 3 + (e + 2) % 3
+        while halfedges[p] != -1:
+            h = halfedges[p]
+            p = h - h % 3 + (h + 2) % 3
+        return p
+
+    def _legalize(self, edges):
+        """Rétablit la condition de Delaunay par retournement d'arêtes.
+
+        Args:
+            edges (list): demi-arêtes à vérifier, chacune opposée au point
+                inséré dans son triangle.
+
+        """
+        coords, tri, halfedges = self.coords, self.triangles, self.halfedges
+        stack = list(edges)
+        while stack:
+            a = stack.pop()
+            b = halfedges[a]
+            if b == -1:
+                continue
+            a0 = a - a % 3
+            ar = a0 + (a + 2) % 3
+            al = a0 + (a + 1) % 3
+            b0 = b - b % 3
+            bl = b0 + (b + 2) % 3
+            p0, pr, pl, p1 = tri[ar], tri[a], tri[al], tri[bl]
+            if not _in_circle(coords[2 * p0], coords[2 * p0 + 1],
+                              coords[2 * pr], coords[2 * pr + 1],
+                              coords[2 * pl], coords[2 * pl + 1],
+                              coords[2 * p1], coords[2 * p1 + 1]):
+                continue
+            tri[a] = p1
+            tri[b] = p0
+            self._link(a, halfedges[bl])
+            self._link(b, halfedges[ar])
+            self._link(ar, bl)
+            stack.append(a)
+            stack.append(b0 + (b + 1) % 3)
+        self._last = len(tri) // 3 - 1
+
+
+class PointLocator:
+    """Index de localisation : quel triangle contient un point donné.
+
+    Une grille uniforme couvre la boîte englobante des points ; chaque
+    case retient un triangle proche. Une requête saute au triangle de sa
+    case puis marche jusqu'au triangle cherché (jump-and-walk) : avec
+    environ deux triangles par case, la marche ne traverse en moyenne
+    qu'un nombre constant de triangles.
+
+    Attributes:
+        side (int): nombre de cases par côté de la grille.
+
+    """
+
+    __slots__ = ("side", "_mesh", "_grid", "_x0", "_y0", "_sx", "_sy")
+
+    def __init__(self, result):
+        """Construit l'index d'une triangulation.
+
+        Args:
+            result (Triangulation): la triangulation à indexer.
+
+        """
+        # Les indices des triangles restent ceux de result
+        self._mesh = IncrementalTriangulation(result)
+        xmin, ymin, xmax, ymax = result.points.bbox
+        self.side = side = max(1, math.isqrt(len(result) // 2))
+        self._x0, self._y0 = xmin, ymin
+        self._sx = side / (xmax - xmin)
+        self._sy = side / (ymax - ymin)
+
+        # Chaque case retient un triangle dont le centre de gravité y tombe
+        grid = array('i', [-1]) * (side * side)
+        coords, tri = self._mesh.coords, self._mesh.triangles
+        for t in range(len(tri) // 3):
+            a, b, c = tri[3 * t], tri[3 * t + 1], tri[3 * t + 2]
+            grid[self._cell((coords[2 * a] + coords[2 * b] + coords[2 * c]) / 3,
+                            (coords[2 * a + 1] + coords[2 * b + 1]
+                             + coords[2 * c + 1]) / 3)] = t
+        # Cases vides : triangle de la case non vide la plus proche dans
+        # l'ordre de parcours
+        last = next(t for t in grid if t != -1)
+        for cell in range(len(grid)):
+            if grid[cell] == -1:
+                grid[cell] = last
+            else:
+                last = grid[cell]
+        self._grid = grid
+
+    def _cell(self, x, y):
+        """Renvoie la case de la grille contenant le point (bornée à la grille).
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        Returns:
+            int: indice de la case.
+
+        """
+        side = self.side
+        cx = min(max(int((x - self._x0) * self._sx), 0), side - 1)
+        cy = min(max(int((y - self._y0) * self._sy), 0), side - 1)
+        return cy * side + cx
+
+    def locate(self, x, y):
+        """Renvoie le triangle contenant un point.
+
+        Args:
+            x (float): abscisse du point.
+            y (float): ordonnée du point.
+
+        Returns:
+            int: indice du triangle (bord compris), ou -1 hors de
+            l'enveloppe convexe.
+
+        """
+        if not (math.isfinite(x) and math.isfinite(y)):
+            raise InvalidPointError()
+        return self._mesh.locate(x, y, self._grid[self._cell(x, y)])
+
+    def locateMany(self, probes):
+        """Renvoie le triangle contenant chacun des points sondés.
+
+        Args:
+            probes (list|array): points (x, y), ou coordonnées à plat.
+
+        Returns:
+            array: indice du triangle de chaque point (-1 hors de
+            l'enveloppe convexe), en array('i').
+
+        """
+        if isinstance(probes, (array, memoryview)):
+            probes = zip(probes[0::2], probes[1::2], strict=True)
+        locate = self.locate
+        return array('i', [locate(x, y) for x, y in probes])
+
+
+def decodeProbes(data):
+    """Décode un lot de points à localiser (format binaire PointSet).
+
+    Contrairement à parsePointSet, aucun nombre minimal de points ni
+    condition d'alignement n'est exigé.
+
+    Args:
+        data (bytes): [N (4 bytes)] + [X (4 bytes) Y (4 bytes)] * N.
+
+    Returns:
+        array: coordonnées à plat des points, en array('f').
+
+    """
+    if len(data) < 4:
+        raise InvalidPointError()
+    num_points = struct.unpack_from('<I', data, 0)[0]
+    if len(data) != 4 + num_points * 8:
+        raise InvalidPointError()
+    probes = array('f')
+    probes.frombytes(memoryview(data)[4:])
+    if sys.byteorder == "big":
+        probes.byteswap()
+    if not math.isfinite(sum(probes)):
+        raise InvalidPointError()
+    return probes
+
+
+def encodeLocations(indices):
+    """Encode les triangles trouvés pour un lot de points.
+
+    Args:
+        indices (array): indice du triangle de chaque point, en array('i').
+
+    Returns:
+        bytes: [N (4 bytes)] + [indice (4 bytes, signé, -1 hors
+        enveloppe)] * N.
+
+    """
+    if sys.byteorder == "big":
+        indices = array('i', indices)
+        indices.byteswap()
+    return struct.pack('<I', len(indices)) + indices.tobytes()
+
+
+def computeNeighbours(triangles, halfedges=None):
+    """Détermine les triangles voisins de chaque triangle.
+
+    Args:
+        triangles (array): indices à plat des sommets des triangles.
+        halfedges (array): demi-arêtes opposées, si elles sont connues
+            (reconstruites à partir des triangles sinon).
+
+    Returns:
+        array: 3 indices par triangle, en array('i') : le voisin k du
+        triangle t partage l'arête (sommet k, sommet k+1 modulo 3) de t,
+        -1 sur l'enveloppe convexe.
+
+    """
+    if halfedges is None:
+        halfedges = _buildHalfedges(triangles)
+    # La demi-arête h appartient au triangle h // 3 ; -1 // 3 vaut -1
+    return array('i', [h // 3 for h in halfedges])
+
+
+def _buildHalfedges(triangles):
+    """Construit la table des demi-arêtes opposées d'une liste de triangles.
+
+    Args:
+        triangles (array): indices à plat des sommets des triangles.
+
+    Returns:
+        array: demi-arête opposée à chaque demi-arête (-1 sur l'enveloppe),
+        en array('i').
+
+    """
+    halfedges = array('i', [-1]) * len(triangles)
+    edges = {}
+    for e in range(len(triangles)):
+        a = triangles[e]
+        b = triangles[e - e % 3 + (e + 1) % 3]
+        f = edges.pop((b, a), None)
+        if f is None:
+            edges[(a, b)] = e
+        else:
+            halfedges[e] = f
+            halfedges[f] = e
+    return halfedges
+
+
+def _checkTriangles(byteResponse, triangles):
+    """Vérifie le bloc des sommets et les indices des triangles avant encodage.
+
+    Args:
+        byteResponse (str|bytes): liste des points sous forme de byte.
+        triangles (array|list): indices à plat des triangles générés.
+
+    Returns:
+        triangles (array): les indices sous forme d'array('I').
+
+    """
+    # Vérification du format du pointset (taille annoncée vs taille réelle)
+    if len(byteResponse) < 4:
+        raise InvalidPointSetBytesError()
+    num_points = struct.unpack_from('<I', byteResponse, 0)[0]
+    if len(byteResponse) != 4 + num_points * 8:
+        raise InvalidPointSetBytesError()
+
+    # Les indices doivent former des triplets référençant des points existants
+    if not (isinstance(triangles, array) and triangles.typecode == 'I'):
+        try:
+            triangles = array('I', triangles)
+        except (TypeError, OverflowError):
+            raise InvalidTriangleError() from None
+    if len(triangles) % 3 != 0:
+        raise InvalidTriangleError()
+    if triangles and max(triangles) >= num_points:
+        raise InvalidTriangleError()
     return triangles
 
+
 def parseTriangle(byteResponse, triangles):
     """Génère le binaire contenant la liste des triangles et des points.
+
+    Les points ne sont pas re-décodés : le bloc des sommets est recopié tel
+    quel et les indices des triangles sont ajoutés en une seule copie.
     
     Args:
         byteResponse (str|bytes): liste des points sous forme de byte.
-        triangles : liste des triangles généré.
+        triangles (array): indices à plat des triangles générés.
 
     Returns:
-        output (bytes): liste des points et triangles parsé sous forme de byte.
+        output (bytearray): liste des points et triangles parsé sous forme de byte.
         
     """
-    # Re-parser les points pour obtenir leurs indices
-    # On a besoin de savoir que le point (x,y) est à l'index i
-    try:
-        original_points = parsePointSet(byteResponse)
-    except Exception as e :
-        raise Exception("INVALID_POINTSET_BYTE_FORMAT")from e
+    triangles = _checkTriangles(byteResponse, triangles)
 
-    # Création d'un dictionnaire pour map inversée : (x, y) -> index
-    point_to_index = {pt: i for i, pt in enumerate(original_points)}
-
-    # Préparation du binaire de sortie 
-    output = bytearray(byteResponse)
+    # Préparation du binaire de sortie, alloué une seule fois
+    offset = len(byteResponse)
+    output = bytearray(offset + 4 + triangles.itemsize * len(triangles))
+    output[:offset] = byteResponse
 
     # Encodage des triangles
     try:
-        num_triangles = len(triangles)
         # Ajout du nombre de triangles (unsigned int)
-        output.extend(struct.pack('<I', num_triangles))
-
-        for tri in triangles:
-            # tri est un tuple ((x1,y1), (x2,y2), (x3,y3))
-            
-            # Vérification colinéarité locale du triangle
-            p1, p2, p3 = tri
-            if abs((p2[1] - p1[1]) * (p3[0] - p2[0]) - \
-                (p3[1] - p2[1]) * (p2[0] - p1[0])) < 1e-9:
-                 raise Exception("INVALID_TRIANGLE")
-
-            # Récupération des indices
-            indices = []
-            for p in tri:
-                if p not in point_to_index:
-                    # Le point du triangle n'existe pas dans le set original
-                    raise Exception("INVALID_TRIANGLE")
-                indices.append(point_to_index[p])
-            
-            # Ajout des 3 indices (3 * unsigned int)
-            output.extend(struct.pack('<III', indices[0], indices[1], indices[2]))
-
-    except KeyError as e:
-        raise Exception("INVALID_TRIANGLE") from e
-    except struct.error as e:
-        raise Exception("ENCODING_ERROR") from e
+        struct.pack_into('<I', output, offset, len(triangles) // 3)
+        if sys.byteorder == "big":
+            triangles = array('I', triangles)
+            triangles.byteswap()
+        # Ajout de tous les indices (unsigned int) en une copie
+        output[offset + 4:] = memoryview(triangles).cast('B')
     except Exception as e:
-        if str(e) in ["INVALID_TRIANGLE", "INVALID_POINTSET_BYTE_FORMAT"]:
-            raise e
-        raise Exception("ENCODING_ERROR") from e
+        raise EncodeError() from e
+
+    return output
+
+
+def streamTriangle(byteResponse, triangles, chunk_size=STREAM_CHUNK_SIZE,
+                   neighbours=None, vertices=True, delta=False):
+    """Prépare l'envoi en flux du binaire des points et des triangles.
+
+    La validation est faite immédiatement (les erreurs sont levées avant le
+    premier octet envoyé) ; le binaire est ensuite produit par morceaux
+    d'au plus chunk_size octets, lus directement dans les buffers d'origine
+    via memoryview, sans jamais construire la réponse complète.
+
+    Args:
+        byteResponse (bytes): liste des points sous forme de byte.
+        triangles (array): indices à plat des triangles générés.
+        chunk_size (int): taille maximale d'un morceau, en octets.
+        neighbours (array): voisins des triangles (voir computeNeighbours),
+            ajoutés après les triangles s'ils sont fournis.
+        vertices (bool): inclut le bloc des sommets ; sinon le binaire
+            commence directement par le nombre de triangles.
+        delta (bool): code les indices (et les voisins) par différence avec
+            la valeur précédente, en varint zigzag (voir decodeVarints).
+
+    Returns:
+        tuple: (taille totale en octets, ou None si elle n'est connue qu'une
+        fois le codage delta effectué, générateur des morceaux).
+
+    """
+    triangles = _checkTriangles(byteResponse, triangles)
+    size = 4 + triangles.itemsize * len(triangles)
+    if vertices:
+        size += len(byteResponse)
+    if neighbours is not None:
+        if len(neighbours) != len(triangles):
+            raise InvalidTriangleError()
+        size += neighbours.itemsize * len(neighbours)
+    if delta:
+        size = None
+    return size, _iterTriangleChunks(byteResponse, triangles, chunk_size,
+                                     neighbours, vertices, delta)
+
+
+def _iterTriangleChunks(byteResponse, triangles, chunk_size, neighbours=None,
+                        vertices=True, delta=False):
+    """Génère les morceaux du binaire des points et des triangles.
+
+    Args:
+        byteResponse (bytes): liste des points sous forme de byte.
+        triangles (array): indices à plat des triangles (déjà validés).
+        chunk_size (int): taille maximale d'un morceau, en octets.
+        neighbours (array): voisins des triangles à ajouter, ou None.
+        vertices (bool): inclut le bloc des sommets.
+        delta (bool): code les indices en varint zigzag des différences.
+
+    Yields:
+        bytes: morceau suivant du binaire.
+
+    """
+    # Bloc des sommets : renvoyé tel quel depuis le buffer récupéré
+    if vertices:
+        view = memoryview(byteResponse)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+
+    # Bloc des triangles : nombre puis indices, par morceaux
+    yield struct.pack('<I', len(triangles) // 3)
+    blocks = (triangles,) if neighbours is None else (triangles, neighbours)
+    for block in blocks:
+        if delta:
+            # Au plus 5 octets par valeur codée
+            yield from _iterVarints(block, max(chunk_size // 5, 1))
+            continue
+        step = max(chunk_size // block.itemsize, 1)
+        for start in range(0, len(block), step):
+            chunk = block[start:start + step]
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            yield chunk.tobytes()
+
+
+def _iterVarints(values, step):
+    """Code une suite d'entiers en varint zigzag de leurs différences.
+
+    Chaque valeur est remplacée par son écart à la précédente (la première
+    par elle-même), ramené à un entier positif par zigzag (0, -1, 1, -2...
+    deviennent 0, 1, 2, 3...), puis écrit par groupes de 7 bits, bit de
+    poids fort à 1 sauf sur le dernier octet (LEB128).
+
+    Args:
+        values (array): entiers à coder.
+        step (int): nombre de valeurs codées par morceau.
+
+    Yields:
+        bytes: morceau suivant du codage.
+
+    """
+    previous = 0
+    for start in range(0, len(values), step):
+        out = bytearray()
+        for value in values[start:start + step]:
+            d = value - previous
+            previous = value
+            z = d << 1 if d >= 0 else (-d << 1) - 1
+            while z >= 0x80:
+                out.append(z & 0x7F | 0x80)
+                z >>= 7
+            out.append(z)
+        yield bytes(out)
+
+
+def decodeVarints(data, count, offset=0, typecode='I'):
+    """Décode une suite d'entiers codée en varint zigzag des différences.
+
+    Opération inverse du codage delta de streamTriangle.
+
+    Args:
+        data (bytes): binaire contenant la suite.
+        count (int): nombre de valeurs à lire.
+        offset (int): position du premier octet de la suite.
+        typecode (str): type de l'array renvoyé ('I' pour les indices, 'i'
+            pour les voisins).
+
+    Returns:
+        tuple: (valeurs décodées en array, position suivant la suite).
+
+    """
+    values = array(typecode)
+    previous = 0
+    try:
+        for _ in range(count):
+            z = shift = 0
+            while True:
+                byte = data[offset]
+                offset += 1
+                z |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+            previous += z >> 1 if not z & 1 else -((z + 1) >> 1)
+            values.append(previous)
+    except (IndexError, OverflowError):
+        raise DecodeError() from None
+    return values, offset
+
+
+def compressChunks(chunks, encoding):
+    """Compresse à la volée une suite de morceaux.
+
+    Args:
+        chunks (iterable): morceaux à compresser.
+        encoding (str): compression utilisée, parmi COMPRESSIONS.
+
+    Yields:
+        bytes: morceau compressé suivant (les morceaux vides sont omis).
+
+    """
+    if encoding == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    elif encoding == "zstd" and zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    else:
+        raise ValueError(f"Unknown compression: {encoding}")
+
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def decodeTriangles(data):
+    """Découpe un binaire Triangles en ses deux parties.
+
+    Opération inverse de parseTriangle.
+
+    Args:
+        data (bytes): binaire au format Triangles.
+
+    Returns:
+        tuple: (binaire du pointset, indices à plat des triangles en array('I')).
+
+    """
+    if len(data) < 4:
+        raise DecodeError()
+    num_points = struct.unpack_from('<I', data, 0)[0]
+    offset = 4 + num_points * 8
+    if len(data) < offset + 4:
+        raise DecodeError()
+    num_triangles = struct.unpack_from('<I', data, offset)[0]
+    if len(data) != offset + 4 + num_triangles * 12:
+        raise DecodeError()
 
-    return output
\ No newline at end of file
+    triangles = array('I')
+    triangles.frombytes(memoryview(data)[offset + 4:])
+    if sys.byteorder == "big":
+        triangles.byteswap()
+    return bytes(memoryview(data)[:offset]), triangles
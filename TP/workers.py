@@ -0,0 +1,211 @@
+"""Module d'exécution des triangulations dans un pool de processus.
+
+Le calcul (parsing et triangulation) est déporté hors du thread qui traite
+la requête, dans des processus séparés, pour ne pas bloquer les autres
+requêtes derrière le GIL. Les binaires transitent par mémoire partagée
+plutôt que par sérialisation (pickle).
+"""
+import struct
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import triangulation
+from errors import (
+    DecodeError,
+    InvalidResponseFormatError,
+    QueueFullError,
+    TriangulationError,
+    TriangulationTimeoutError,
+)
+
+
+class TriangulationPool:
+    """Pool de processus borné exécutant parsing et triangulation.
+
+    Attributes:
+        workers (int): nombre de processus du pool.
+        queue_depth (int): nombre de calculs pouvant attendre un processus libre.
+        timeout (float): durée maximale d'un calcul, en secondes.
+
+    """
+
+    def __init__(self, workers, queue_depth, timeout):
+        """Démarre le pool.
+
+        Args:
+            workers (int): nombre de processus du pool.
+            queue_depth (int): nombre de calculs pouvant attendre un processus libre.
+            timeout (float): durée maximale d'un calcul, en secondes.
+
+        """
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def run(self, point_set_bytes, halfedges=False):
+        """Parse et triangule un PointSet dans un processus du pool.
+
+        Un calcul abandonné après le délai garde son emplacement (et ses
+        mémoires partagées) jusqu'à sa fin réelle : la borne de la file
+        compte ainsi les calculs qui occupent encore un processus.
+
+        Args:
+            point_set_bytes (bytes): binaire du pointset.
+            halfedges (bool): renvoie aussi les demi-arêtes opposées (voir
+                triangulation.triangulation).
+
+        Returns:
+            triangles (array): indices à plat des triangles générés ; avec
+            halfedges, le couple (triangles, demi-arêtes ou None).
+
+        """
+        # Taille vérifiée avant d'allouer la sortie d'après l'en-tête
+        size = len(point_set_bytes)
+        if size < 4:
+            raise InvalidResponseFormatError()
+        num_points = struct.unpack_from('<I', point_set_bytes, 0)[0]
+        if size != 4 + 8 * num_points:
+            raise DecodeError()
+
+        # File pleine : on refuse immédiatement plutôt que d'empiler
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError()
+
+        shms = []
+        abandoned = False
+        try:
+            shm_in = shared_memory.SharedMemory(create=True, size=size)
+            shms.append(shm_in)
+            shm_in.buf[:size] = point_set_bytes
+
+            # Au plus 2n - 5 triangles pour n points (et au moins 1 emplacement)
+            capacity = 12 * max(2 * num_points - 5, 1)
+            shm_out = shared_memory.SharedMemory(create=True, size=capacity)
+            shms.append(shm_out)
+            half_name = None
+            if halfedges:
+                # Une demi-arête opposée (int32) par indice de sommet
+                shm_half = shared_memory.SharedMemory(create=True, size=capacity)
+                shms.append(shm_half)
+                half_name = shm_half.name
+
+            future = self._submit(shm_in.name, size, shm_out.name, half_name)
+            try:
+                num_triangles, has_halfedges = future.result(timeout=self.timeout)
+            except FutureTimeoutError as e:
+                if not future.cancel():
+                    # Déjà en cours : libéré par le processus à sa fin
+                    abandoned = True
+                    future.add_done_callback(lambda _: self._release(shms))
+                raise TriangulationTimeoutError() from e
+            except BrokenProcessPool as e:
+                self._restart()
+                raise TriangulationError() from e
+
+            triangles = array('I')
+            triangles.frombytes(shm_out.buf[:num_triangles * 12])
+            if not halfedges:
+                return triangles
+            opposite = None
+            if has_halfedges:
+                opposite = array('i')
+                opposite.frombytes(shm_half.buf[:num_triangles * 12])
+            return triangles, opposite
+        finally:
+            if not abandoned:
+                self._release(shms)
+
+    def shutdown(self):
+        """Arrête les processus du pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, in_name, size, out_name, half_name=None):
+        """Soumet un calcul au pool courant.
+
+        Args:
+            in_name (str): nom de la mémoire partagée contenant le pointset.
+            size (int): taille du pointset en octets.
+            out_name (str): nom de la mémoire partagée recevant les indices.
+            half_name (str|None): nom de la mémoire partagée recevant les
+                demi-arêtes opposées, ou None.
+
+        Returns:
+            Future: le calcul en cours.
+
+        """
+        with self._lock:
+            return self._executor.submit(_runJob, in_name, size, out_name, half_name)
+
+    def _release(self, shms):
+        """Libère les mémoires partagées et l'emplacement d'un calcul.
+
+        Args:
+            shms (list): mémoires partagées du calcul.
+
+        """
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+        self._slots.release()
+
+    def _restart(self):
+        """Remplace le pool après la mort brutale d'un de ses processus."""
+        with self._lock:
+            broken, self._executor = (
+                self._executor, ProcessPoolExecutor(max_workers=self.workers)
+            )
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _runJob(in_name, size, out_name, half_name=None):
+    """Exécute parsing et triangulation dans un processus du pool.
+
+    Args:
+        in_name (str): nom de la mémoire partagée contenant le pointset.
+        size (int): taille du pointset en octets.
+        out_name (str): nom de la mémoire partagée recevant les indices.
+        half_name (str|None): nom de la mémoire partagée recevant les
+            demi-arêtes opposées, ou None.
+
+    Returns:
+        tuple: (nombre de triangles écrits dans la mémoire de sortie,
+        True si les demi-arêtes y ont aussi été écrites).
+
+    """
+    shm_in = shared_memory.SharedMemory(name=in_name)
+    try:
+        with shm_in.buf[:size] as point_set_bytes:
+            points = triangulation.parsePointSet(point_set_bytes)
+    finally:
+        shm_in.close()
+
+    # Demi-arêtes calculées seulement si l'appelant les demande
+    halfedges = None
+    if half_name is None:
+        triangles = triangulation.triangulation(points)
+    else:
+        triangles, halfedges = triangulation.triangulation(points, halfedges=True)
+
+    shm_out = shared_memory.SharedMemory(name=out_name)
+    try:
+        with memoryview(triangles).cast('B') as indices:
+            shm_out.buf[:len(indices)] = indices
+    finally:
+        shm_out.close()
+
+    written = halfedges is not None
+    if written:
+        shm_half = shared_memory.SharedMemory(name=half_name)
+        try:
+            with memoryview(halfedges).cast('B') as opposite:
+                shm_half.buf[:len(opposite)] = opposite
+        finally:
+            shm_half.close()
+    return len(triangles) // 3, written